@@ -0,0 +1,44 @@
+"""Compare bulk Discordian conversion against building a DDate per date.
+
+Usage:
+    python benchmarks/bench_bulk.py [number of dates]
+"""
+
+
+from __future__ import print_function
+
+import sys
+import timeit
+
+import numpy
+from ddate.base import DDate
+
+from dateandtime.bulk import to_discordian
+
+
+def main():
+    """Command line entry point."""
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    days = numpy.datetime64("1970-01-01") + numpy.random.randint(
+        0, 365 * 200, size=count,
+    ).astype("timedelta64[D]")
+    sample = days[:min(count, 100000)].tolist()
+
+    per_object = min(timeit.repeat(
+        lambda: [DDate(day) for day in sample], number=1, repeat=3,
+    )) * count / len(sample)
+    vectorized = min(timeit.repeat(
+        lambda: to_discordian(days), number=1, repeat=3,
+    ))
+
+    print("{0} dates".format(count))
+    print("  DDate per date: {0:.3f}s (extrapolated from {1})".format(
+        per_object, len(sample),
+    ))
+    print("  to_discordian:  {0:.3f}s".format(vectorized))
+    print("  speed up:       {0:.0f}x".format(per_object / vectorized))
+
+
+if __name__ == "__main__":
+    main()
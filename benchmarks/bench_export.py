@@ -0,0 +1,47 @@
+"""Measure how bulk export throughput scales with worker processes.
+
+Usage:
+    python benchmarks/bench_export.py [years] [format] [system]
+"""
+
+
+from __future__ import print_function
+
+import os
+import sys
+import time
+
+from dateandtime.export import iter_export
+
+
+def main():
+    """Command line entry point."""
+
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    fmt = sys.argv[2] if len(sys.argv) > 2 else "ics"
+    system = sys.argv[3] if len(sys.argv) > 3 else "discordian"
+
+    cpus = os.cpu_count() or 1
+    jobs = [1]
+    while jobs[-1] * 2 <= cpus:
+        jobs.append(jobs[-1] * 2)
+    if jobs[-1] != cpus:
+        jobs.append(cpus)
+
+    print("{0} years of {1} {2}".format(years, system, fmt))
+    serial = None
+    for count in jobs:
+        started = time.time()
+        written = 0
+        for part in iter_export(1900, 1900 + years - 1, system, fmt,
+                                jobs=count, chunk=max(years // 64, 1)):
+            written += len(part)
+        elapsed = time.time() - started
+        serial = serial or elapsed
+        print("  {0:>2} jobs: {1:.2f}s, {2:.0f} years/s, {3:.1f}x".format(
+            count, elapsed, years / elapsed, serial / elapsed,
+        ))
+
+
+if __name__ == "__main__":
+    main()
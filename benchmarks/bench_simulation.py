@@ -0,0 +1,50 @@
+"""Measure the clock loop over long stretches of virtual time.
+
+Every frame goes through the real render path; the per frame cost and the
+output written are reported for each calendar.
+
+Usage:
+    python benchmarks/bench_simulation.py [days] [zone]
+"""
+
+
+from __future__ import print_function
+
+import sys
+import time
+import datetime
+
+from dateandtime.simulation import simulate
+
+
+def main():
+    """Command line entry point."""
+
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 31
+    zone = sys.argv[2] if len(sys.argv) > 2 else None
+
+    start = datetime.datetime(2016, 1, 1)
+    end = start + datetime.timedelta(days=days)
+    print("{0} days from {1:%Y-%m-%d}, {2}".format(days, start, zone or "UTC"))
+    for name in ("gregorian", "discordian", "eve_real", "eve_game"):
+        totals = [0, 0]
+
+        def on_frame(frame):
+            totals[0] += 1
+            totals[1] += len(frame.output)
+
+        started = time.time()
+        simulate(start, end, zone=zone, on_frame=on_frame, system=name)
+        elapsed = time.time() - started
+        print("  {0:>10}: {1} frames in {2:.2f}s, {3:.1f}us/frame, "
+              "{4:.1f} bytes/frame".format(
+                  name,
+                  totals[0],
+                  elapsed,
+                  elapsed / totals[0] * 1e6,
+                  totals[1] / float(totals[0]),
+              ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Compare `dateandtime --once` startup latency, cold against cached.
+
+Usage:
+    python benchmarks/bench_startup.py [runs] [calendar flags...]
+"""
+
+
+from __future__ import print_function
+
+import os
+import sys
+import time
+import tempfile
+import subprocess
+
+
+SCRIPT = (
+    "import sys\n"
+    "from dateandtime.base import main\n"
+    "sys.argv = ['dateandtime', '--once'] + sys.argv[1:]\n"
+    "main()\n"
+)
+
+
+def run(env, flags):
+    """Returns the wall clock seconds taken by one --once invocation."""
+
+    started = time.time()
+    subprocess.check_call(
+        [sys.executable, "-c", SCRIPT] + flags,
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    return time.time() - started
+
+
+def median(values):
+    """Returns the median of values."""
+
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main():
+    """Command line entry point."""
+
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    flags = sys.argv[2:]
+    cache = os.path.join(tempfile.mkdtemp(), "once")
+    env = dict(os.environ, DATEANDTIME_ONCE_CACHE=cache)
+
+    cold = []
+    for _ in range(runs):
+        if os.path.exists(cache):
+            os.unlink(cache)
+        cold.append(run(env, flags))
+
+    cached = [run(env, flags) for _ in range(runs)]
+
+    print("--once {0}, median of {1} runs".format(" ".join(flags), runs))
+    print("  cold:   {0:.1f}ms".format(median(cold) * 1000))
+    print("  cached: {0:.1f}ms".format(median(cached) * 1000))
+
+
+if __name__ == "__main__":
+    main()
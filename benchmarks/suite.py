@@ -0,0 +1,244 @@
+"""Benchmarks for dateandtime's rendering and conversion hot paths.
+
+Every case runs for each calendar mode on a set of edge dates. Results are
+saved as JSON baselines, and compared to flag regressions.
+
+Usage:
+    python benchmarks/suite.py run [-o results.json] [-k filter]
+    python benchmarks/suite.py compare baseline.json results.json [-t 0.1]
+"""
+
+
+from __future__ import print_function
+
+import sys
+import json
+import timeit
+import argparse
+import datetime
+import platform
+
+from ddate.base import DDate
+
+from dateandtime import multicalendar
+from dateandtime.base import parse_args
+
+
+MODES = {
+    "gregorian": {},
+    "discordian": {"discordian": True},
+    "eve_real": {"eve_real": True},
+    "eve_game": {"eve_game": True},
+}
+
+DATES = {
+    "ordinary": datetime.datetime(2014, 3, 12, 9, 41),
+    "st_tibs": datetime.datetime(2016, 2, 29, 12, 0),
+    "leap_february": datetime.datetime(2016, 2, 28, 23, 59),
+    "february": datetime.datetime(2015, 2, 14, 0, 0),
+    "new_years_eve": datetime.datetime(2014, 12, 31, 23, 59),
+    "new_years_day": datetime.datetime(2015, 1, 1, 0, 0),
+}
+
+
+class _Discard(object):
+    """A stdout which throws everything away."""
+
+    def write(self, data):
+        pass
+
+    def flush(self):
+        pass
+
+
+def _clear_caches():
+    multicalendar.BLOCK_CACHE.clear()
+
+
+def _calendar(mode, day):
+    """Returns a MultiCalendar for mode on day, highlighting day."""
+
+    kwargs = MODES[mode]
+    if kwargs.get("discordian"):
+        day = DDate(day)
+    return multicalendar.MultiCalendar(date=day, now=day, **kwargs)
+
+
+def _cases(mode, day):
+    """Yields (name, callable) for each hot path in mode on day."""
+
+    kwargs = MODES[mode]
+    cal = _calendar(mode, day)
+
+    def init_cold():
+        _clear_caches()
+        _calendar(mode, day)
+
+    def calendar_lines_cold():
+        _clear_caches()
+        cal.calendar_lines()
+
+    def print_calendar():
+        cal.print_calendar()
+
+    yield "init_cold", init_cold
+    yield "init_warm", lambda: _calendar(mode, day)
+    yield "calendar_lines_cold", calendar_lines_cold
+    yield "calendar_lines_warm", cal.calendar_lines
+    yield "print_calendar", print_calendar
+    yield "print_time", lambda: cal.print_time(day)
+    yield "parse_args", lambda: parse_args(
+        ["dateandtime"] + ["--{0}".format(flag.replace("_", "-"))
+                           for flag in kwargs]
+    )
+    if mode == "discordian":
+        yield "discordian_calendar", (
+            lambda: multicalendar.discordian_calendar(cal.date)
+        )
+
+
+def measure(func, repeat=5, min_time=0.05):
+    """Returns the best seconds per call of func."""
+
+    timer = timeit.Timer(func)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run(name_filter=None, repeat=5):
+    """Runs every case, returns a dict of results.
+
+    Args:
+        name_filter: only run cases whose name contains this string
+        repeat: number of timing repeats per case
+
+    Returns:
+        dict with "meta" and "results", results mapping case names of
+        mode/date/path to seconds per call, or to an error string
+    """
+
+    results = {}
+    stdout = sys.stdout
+    for mode in sorted(MODES):
+        for date_name, day in sorted(DATES.items()):
+            prefix = "{0}/{1}".format(mode, date_name)
+            try:
+                cases = list(_cases(mode, day))
+            except Exception as error:
+                if not name_filter or name_filter in prefix:
+                    results[prefix] = "error: {0!r}".format(error)
+                    print("{0:60} {1}".format(prefix, results[prefix]))
+                continue
+
+            for path, func in cases:
+                name = "{0}/{1}".format(prefix, path)
+                if name_filter and name_filter not in name:
+                    continue
+                sys.stdout = _Discard()
+                try:
+                    results[name] = measure(func, repeat=repeat)
+                except Exception as error:
+                    results[name] = "error: {0!r}".format(error)
+                finally:
+                    sys.stdout = stdout
+                print("{0:60} {1}".format(name, _format(results[name])))
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "date": datetime.datetime.now().isoformat(),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=0.1):
+    """Compares two result sets.
+
+    Args:
+        baseline: dict of results, from run()
+        current: dict of results, from run()
+        threshold: fraction slower than baseline counted as a regression
+
+    Returns:
+        list of (name, baseline seconds, current seconds, ratio, regressed)
+        for every case timed in both
+    """
+
+    compared = []
+    for name in sorted(set(baseline["results"]) & set(current["results"])):
+        before = baseline["results"][name]
+        after = current["results"][name]
+        if not isinstance(before, float) or not isinstance(after, float):
+            continue
+        ratio = after / before
+        compared.append((name, before, after, ratio, ratio > 1 + threshold))
+    return compared
+
+
+def _format(seconds):
+    """Returns seconds per call in a readable unit."""
+
+    if not isinstance(seconds, float):
+        return seconds
+    for unit, scale in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds * scale >= 1:
+            return "{0:.2f}{1}".format(seconds * scale, unit)
+    return "{0:.0f}ns".format(seconds * 1e9)
+
+
+def main():
+    """Command line entry point."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command")
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("-o", "--output", help="save results as JSON")
+    run_parser.add_argument("-k", "--filter", help="only run matching cases")
+    run_parser.add_argument("-r", "--repeat", type=int, default=5)
+
+    compare_parser = commands.add_parser("compare", help="compare results")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("-t", "--threshold", type=float, default=0.1,
+                                help="fraction slower to flag (0.1)")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        results = run(args.filter, args.repeat)
+        if args.output:
+            with open(args.output, "w") as output:
+                json.dump(results, output, indent=2, sort_keys=True)
+    elif args.command == "compare":
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        with open(args.current) as current_file:
+            current = json.load(current_file)
+
+        compared = compare(baseline, current, args.threshold)
+        for name, before, after, ratio, regressed in compared:
+            print("{0:60} {1:>10} {2:>10} {3:6.2f}x{4}".format(
+                name,
+                _format(before),
+                _format(after),
+                ratio,
+                "  REGRESSION" if regressed else "",
+            ))
+        regressions = sum(1 for row in compared if row[-1])
+        print("{0} regressions in {1} cases over {2:.0%}".format(
+            regressions,
+            len(compared),
+            args.threshold,
+        ))
+        raise SystemExit(int(regressions > 0))
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+"""ANSI escape sequences used by dateandtime."""
+
+
+class ANSI(object):
+    """ANSI terminal colour settings."""
+
+    TODAY = "\033[94m"
+    PAST = "\033[31m"
+    OTHERMONTH = "\033[36m"
+    EVENT = "\033[35m"
+    END = "\033[0m"
@@ -3,32 +3,278 @@
 
 import os
 import sys
-import time
 import datetime
 
-from dateandtime.multicalendar import MultiCalendar
+from dateandtime.renderer import FrameRenderer
+from dateandtime.stats import NULL_STATS, Stats
+from dateandtime.stats import default_path as default_stats_path
+from dateandtime.systems import BUILTIN
+from dateandtime.scheduler import TickScheduler, monotonic
+from dateandtime.terminal import HiddenCursor
 
 
-def be_a_clock(discordian=False, eve_real=False, eve_game=False, test=False):
+def __getattr__(name):
+    """Keeps multicalendar's objects importable from here, lazily."""
+
+    if name in ("MultiCalendar", "calendar_for_day"):
+        from dateandtime import multicalendar
+        return getattr(multicalendar, name)
+    raise AttributeError(name)
+
+
+def be_a_clock(discordian=False, eve_real=False, eve_game=False, test=False,
+               scheduler=None, stats=None, zones=None, system=None,
+               events=None, months=None, layout=None, time_format=None,
+               header_format=None, renderer=None, systems=None):
     """Displays a calendar with the day highlighted, a blank line and the time
-    of day. Will loop forever. Sends many blank lines during a day change to
-    badly update the highlighted day.
+    of day. Will loop forever. Only the cells which changed are rewritten on
+    each minute or day change.
+
+    Sleeps until each minute boundary rather than polling the time. Tomorrow's
+    calendar is built during an idle minute ahead of time, so the day change
+    only has to swap it in. Timings are recorded in stats, if given.
+
+    A time line for each of the IANA timezones in zones is shown under our
+    own, all redrawn in the same frame.
+
+    The calendar system is picked by the boolean flags, or by name through
+    system, see dateandtime.systems. Several systems named in systems are
+    shown side by side, over a single time line.
+
+    Days with events in the .ics files listed in events are highlighted.
+    The files are checked for changes on every minute tick.
+
+    As many months as fit the terminal are shown, up to months (1, 3 or
+    12) if given, and laid out again when the terminal is resized.
+
+    The time line and tag lines follow time_format and header_format, see
+    dateandtime.formats. With seconds shown, the clock ticks every second.
+
+    The wall clock and sleeps come from scheduler, frames go to renderer
+    and a layout given is used as is, without following SIGWINCH, so the
+    loop can be driven through virtual time, see dateandtime.simulation.
     """
 
+    from dateandtime.formats import time_format as compile_time_format
+    from dateandtime.layout import MonthLayout, Resized
+
+    scheduler = scheduler or TickScheduler()
+    stats = stats or NULL_STATS
+    renderer = renderer or FrameRenderer()
+    if layout is None:
+        layout = MonthLayout(months)
+        if not test:
+            layout.install()
+    time_line = compile_time_format(time_format)
+    next_tick = scheduler.next_second if time_line.seconds \
+        else scheduler.next_minute
+    world_clock = None
+    if zones:
+        from dateandtime.worldclock import WorldClock
+
+        # resized to fit under each calendar as it's drawn
+        world_clock = WorldClock(zones, time_format=time_format)
+
+    overlay = None
+    if events:
+        from dateandtime.events import EventOverlay
+
+        overlay = EventOverlay(events)
+
+    def compose(day):
+        """Returns (calendar, lines, width) of the layout for day."""
+
+        if systems:
+            return layout.compose_systems(
+                day,
+                systems,
+                overlay,
+                reserved=1 + len(zones or []),
+                header_format=header_format,
+            )
+        return layout.compose(
+            day,
+            discordian,
+            eve_real,
+            eve_game,
+            system,
+            overlay,
+            reserved=1 + len(zones or []),
+            header_format=header_format,
+        )
+
+    prepared = None
+    rolling_over = False
     while True:
-        starting_time = datetime.datetime.now()
+        rollover_started = monotonic()
+        starting_time = scheduler.now()
         running_time = starting_time
-        calendar = MultiCalendar(discordian, eve_real, eve_game)
-        calendar.print_spaces()
-        calendar.print_calendar()
+        if prepared and prepared[0] == starting_time.date():
+            calendar, calendar_lines, width = prepared[1]
+        else:
+            calendar, calendar_lines, width = compose(starting_time)
+            stats.observe("calendar_seconds", monotonic() - rollover_started)
+
+        prepared = None
+        prepare_at = starting_time.replace(
+            hour=0,
+            minute=0,
+            second=0,
+            microsecond=0,
+        ) + prepare_offset()
+
         while starting_time.day == running_time.day:
-            calendar.print_time(running_time)
-            printed_time = running_time
-            while printed_time.minute == running_time.minute:
-                running_time = datetime.datetime.now()
-                time.sleep(1)
-                if test:
-                    return  # short circut to make this function testable
+            frame_started = monotonic()
+            frame = calendar_lines + [time_line.line(running_time, width)]
+            if world_clock:
+                if world_clock.width != width:
+                    world_clock.resize(width)
+                frame += world_clock.lines(int(scheduler.utc()))
+            written = renderer.render(frame)
+            frame_finished = monotonic()
+            stats.incr("frames")
+            stats.observe("frame_seconds", frame_finished - frame_started)
+            stats.observe("frame_bytes", written)
+            if rolling_over:
+                rolling_over = False
+                stats.incr("rollovers")
+                stats.observe(
+                    "rollover_seconds",
+                    frame_finished - rollover_started,
+                )
+            stats.flush()
+
+            if test:
+                return  # short circut to make this function testable
+            if prepared is None and running_time >= prepare_at:
+                prepare_started = monotonic()
+                tomorrow = TickScheduler.next_day(running_time)
+                prepared = (tomorrow.date(), compose(tomorrow))
+                stats.observe(
+                    "calendar_seconds",
+                    monotonic() - prepare_started,
+                )
+
+            wakeups, jumps = scheduler.wakeups, scheduler.jumps
+            deadline = next_tick(running_time)
+            try:
+                with layout.sleeping():
+                    running_time = scheduler.sleep_until(deadline)
+            except Resized:
+                layout.resized = False
+                stats.incr("resizes")
+                running_time = scheduler.now()
+                prepared = None
+                renderer.reset()
+                calendar, calendar_lines, width = compose(starting_time)
+                continue
+
+            stats.incr("wakeups", scheduler.wakeups - wakeups)
+            stats.incr("clock_jumps", scheduler.jumps - jumps)
+            stats.observe("wakeups_per_minute", scheduler.wakeups - wakeups)
+            stats.observe(
+                "oversleep_seconds",
+                (running_time - deadline).total_seconds(),
+            )
+            # how far past the start of its second or minute the tick woke
+            stats.observe(
+                "drift_seconds",
+                running_time.microsecond / 1e6 +
+                (0 if time_line.seconds else running_time.second),
+            )
+
+            if overlay is not None and overlay.poll():
+                prepared = None
+                calendar, calendar_lines, width = compose(starting_time)
+
+        rolling_over = True
+
+
+def prepare_offset(pid=None):
+    """Returns how long after midnight to prepare the next day's calendar.
+
+    Spread across the day by process id, so many clocks on the same box don't
+    all do their preparation in the same minute.
+
+    Args:
+        pid: integer process id, defaults to our own
+
+    Returns:
+        a datetime.timedelta between one and twenty three hours
+    """
+
+    return datetime.timedelta(minutes=60 + (pid or os.getpid()) % (22 * 60))
+
+
+# (name, flags, value placeholder, description) of non calendar options
+OPTIONS = [
+    ("serve", ["--serve"], "PATH", "serve frames to many panes over a socket"),
+    ("connect", ["--connect"], "PATH", "show frames from a --serve process"),
+    ("once", ["--once"], "calendar|time", "print once and exit"),
+    ("stats", ["--stats"], "PATH", "record timings, to PATH or on SIGUSR1"),
+    ("zones", ["-z", "--zones"], "ZONE,...", "also show the time in zones"),
+    ("calendar", ["-c", "--calendar"], "NAME,...", "use registered calendars"),
+    ("bar", ["--bar"], "i3bar|waybar", "write JSON for a status bar"),
+    ("events", ["--events"], "ICS,...", "highlight days with events"),
+    ("months", ["-m", "--months"], "1|3|12", "show at most this many months"),
+    ("time_format", ["--time-format"], "FORMAT", "strftime style time line"),
+    ("header_format", ["--header-format"], "FORMAT", "strftime style tag"),
+]
+
+
+def parse_options(args=None, known=None):
+    """Pulls the non calendar options out of args.
+
+    Options taking a value use the next argument if it isn't another flag,
+    or True if they were given without one.
+
+    Arguments:
+        args: a list of strings to search through
+        known: list of options like OPTIONS, defaults to OPTIONS
+
+    Returns:
+        tuple of (dict of option name to None, True or string value,
+                  list of the remaining arguments)
+    """
+
+    known = known or OPTIONS
+    options = dict((name, None) for name, _, _, _ in known)
+    remaining = []
+
+    args = list(args or [])
+    while args:
+        arg = args.pop(0)
+        for name, flags, value, _ in known:
+            if arg in flags:
+                if value and args and not args[0].startswith("-"):
+                    options[name] = args.pop(0)
+                else:
+                    options[name] = True
+                break
+        else:
+            remaining.append(arg)
+
+    return options, remaining
+
+
+def format_options(options):
+    """Returns the usage lines for options.
+
+    Arguments:
+        options: list of options like OPTIONS
+
+    Returns:
+        string, one indented line per option after the first
+    """
+
+    return "\n  ".join(
+        "{0}{1}: {2}".format(
+            ", ".join(flags),
+            " [{0}]".format(value) if value else "",
+            description,
+        )
+        for _, flags, value, description in options
+    )
 
 
 def parse_args(args=None):
@@ -41,15 +287,12 @@ def parse_args(args=None):
         dict of kwargs suitable for be_a_clock
 
     Raises:
-        SystemExit when supplying too many matching arguments
+        SystemExit with the usage, when asked for help
     """
 
     possible_args = [
-        ("discordian", ["-d", "--discord", "--discordian", "--discordianism"]),
-        ("eve_game", ["-e", "--eve", "--eve-game"]),
-        ("eve_real", ["-r", "--eve-real", "--eve-is-real"]),
-        ("help", ["-h", "--help"]),
-    ]
+        (name, flags) for name, _, flags in BUILTIN if flags
+    ] + [("help", ["-h", "--help"])]
 
     requested = dict((cal, False) for cal, _ in possible_args)
 
@@ -61,7 +304,8 @@ def parse_args(args=None):
     if requested["help"]:
         raise SystemExit((
             "Dateandtime usage:\n  dateandtime [calendar] [-h/--help]\n"
-            "Alternate calendars (usage flags):\n  {0}".format(
+            "Alternate calendars (usage flags):\n  {0}\n"
+            "Options:\n  {1}".format(
                 "\n  ".join(
                     "{0}{1}{2}{3}: [{4}]".format(
                         name.split("_")[0].title(),
@@ -71,14 +315,48 @@ def parse_args(args=None):
                         ", ".join(flags),
                     )
                     for name, flags in possible_args[:-1]
-                )
+                ),
+                format_options(OPTIONS),
             )
         ))
 
-    if sum(requested.values()) > 1:
-        requested_cals = [
-            cal.replace("_", " ") for cal, _ in possible_args if requested[cal]
-        ]
+    requested.pop("help")
+    return requested
+
+
+def calendar_kwargs(options, args, multiple=False):
+    """Returns the calendar kwargs for be_a_clock.
+
+    Every calendar flagged is shown, unless --calendar names calendars,
+    comma separated, which override the flags. With more than one, they're
+    listed as systems instead.
+
+    Arguments:
+        options: dict of options, from parse_options
+        args: list of the remaining arguments, from parse_options
+        multiple: boolean, True if several calendars can be shown
+
+    Returns:
+        dict of kwargs, from parse_args, plus the system named by --calendar
+        or all of the systems
+
+    Raises:
+        SystemExit for several calendars where only one can be shown
+    """
+
+    calendar = parse_args(args)
+    names = [name for name, _, flags in BUILTIN if flags and calendar[name]]
+    if options["calendar"] and options["calendar"] is not True:
+        named = []
+        for name in options["calendar"].split(","):
+            if name and name not in named:
+                named.append(name)
+        names = named or names
+        if len(names) == 1:
+            calendar["system"] = names[0]
+
+    if len(names) > 1 and not multiple:
+        requested_cals = [name.replace("_", " ") for name in names]
         raise SystemExit((
             "Please limit yourself to a single calendar.\n"
             "I cannot display {0} and {1} at the same time {2}"
@@ -87,22 +365,109 @@ def parse_args(args=None):
             requested_cals[-1],
             ":/" if len(requested_cals) < 3 else ":(",
         ))
-
-    requested.pop("help")
-    return requested
+    elif len(names) > 1:
+        calendar = dict((name, False) for name in calendar)
+        calendar["systems"] = names
+    return calendar
 
 
 def main():
     """Command line entry point."""
 
-    term_avail = os.system("which setterm") == 0
-    if term_avail:
-        os.system("setterm -cursor off")
+    if sys.argv[1:2] == ["export"]:
+        from dateandtime.export import main as export
+
+        return export(sys.argv[2:])
+
+    if sys.argv[1:2] == ["soak"]:
+        from dateandtime.soak import main as soak
+
+        return soak(sys.argv[2:])
+
+    options, args = parse_options(sys.argv)
+    calendar = calendar_kwargs(options, args, multiple=not any(
+        options[name] for name in ("once", "bar", "serve", "connect")
+    ))
+    formats = dict(
+        (name, options[name]) for name in ("time_format", "header_format")
+        if options[name] and options[name] is not True
+    )
+    if formats and (options["serve"] or options["connect"]):
+        raise SystemExit("--time-format and --header-format can't be used "
+                         "with --serve or --connect")
+    if "header_format" in formats and options["bar"]:
+        raise SystemExit("--header-format can't be used with --bar, which "
+                         "has no tag line")
+
+    if options["once"]:
+        from dateandtime.once import once
+
+        return once(
+            calendar,
+            "calendar" if options["once"] is True else options["once"],
+            **formats
+        )
+
+    if options["bar"]:
+        from dateandtime.statusbar import status_bar
+
+        try:
+            return status_bar(
+                "i3bar" if options["bar"] is True else options["bar"],
+                time_format=formats.get("time_format"),
+                **calendar
+            )
+        except KeyboardInterrupt:
+            raise SystemExit("\n")
+
+    if options["serve"]:
+        from dateandtime.server import serve
+
+        try:
+            return serve(
+                None if options["serve"] is True else options["serve"]
+            )
+        except KeyboardInterrupt:
+            raise SystemExit("\n")
 
     try:
-        be_a_clock(**parse_args(sys.argv))
+        with HiddenCursor():
+            if options["connect"]:
+                from dateandtime.client import connect, default_socket
+
+                flags = args[1:]
+                if "system" in calendar:
+                    flags += ["--calendar", calendar["system"]]
+                connect(
+                    default_socket() if options["connect"] is True
+                    else options["connect"],
+                    flags=flags,
+                )
+            else:
+                stats = None
+                if options["stats"]:
+                    stats = Stats(
+                        default_stats_path() if options["stats"] is True
+                        else options["stats"],
+                        periodic=options["stats"] is not True,
+                    )
+                    stats.install()
+                zones = None
+                if options["zones"] and options["zones"] is not True:
+                    zones = options["zones"].split(",")
+                events = None
+                if options["events"] and options["events"] is not True:
+                    events = options["events"].split(",")
+                months = None
+                if options["months"] in ("1", "3", "12"):
+                    months = int(options["months"])
+                elif options["months"]:
+                    raise SystemExit("--months takes 1, 3 or 12")
+                if options["months"] and "systems" in calendar:
+                    raise SystemExit("--months can't be used with several "
+                                     "calendars, they show a month each")
+                calendar.update(formats)
+                be_a_clock(stats=stats, zones=zones, events=events,
+                           months=months, **calendar)
     except KeyboardInterrupt:
         raise SystemExit("\n")
-    finally:
-        if term_avail:
-            os.system("setterm -cursor on")
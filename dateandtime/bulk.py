@@ -0,0 +1,116 @@
+"""Vectorized bulk date conversions, for when one DDate per date is too many.
+
+Requires numpy, which isn't needed by the rest of dateandtime.
+
+Usage Examples::
+
+    >>> import numpy
+    >>> from dateandtime.bulk import to_discordian
+    >>> days = numpy.array(["2014-04-20", "2016-02-29"], dtype="datetime64[D]")
+    >>> to_discordian(days)["day_of_season"]
+    array([37, -1], dtype=int8)
+"""
+
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+# season, day_of_season and weekday are -1 on St. Tib's Day, where DDate
+# uses None
+DISCORDIAN_DTYPE = [
+    ("year", "i4"),
+    ("season", "i1"),
+    ("day_of_season", "i1"),
+    ("weekday", "i1"),
+    ("st_tibs", "?"),
+]
+
+EVE_DTYPE = [
+    ("real", "i4"),
+    ("game", "i4"),
+]
+
+
+def _as_days(dates):
+    """Returns dates as a numpy datetime64[D] array.
+
+    Raises:
+        ImportError if numpy is not installed
+        TypeError if dates is not an array of datetime64 values
+    """
+
+    if numpy is None:
+        raise ImportError("dateandtime.bulk requires numpy")
+
+    dates = numpy.asarray(dates)
+    if not numpy.issubdtype(dates.dtype, numpy.datetime64):
+        raise TypeError("expected datetime64 values, got {0}".format(
+            dates.dtype,
+        ))
+    return dates.astype("datetime64[D]")
+
+
+def _split_years(days):
+    """Returns (gregorian year, zero based day of year) integer arrays."""
+
+    years = days.astype("datetime64[Y]")
+    day_of_year = (days - years.astype("datetime64[D]")).astype("i8")
+    return years.astype("i8") + 1970, day_of_year
+
+
+def is_leap_year(years):
+    """Returns a boolean array, True where the Gregorian year is a leap."""
+
+    return ((years % 4 == 0) & (years % 100 != 0)) | (years % 400 == 0)
+
+
+def to_discordian(dates):
+    """Converts an array of dates to Discordian dates, matching DDate.
+
+    Args:
+        dates: array like of numpy datetime64 values, of any unit
+
+    Returns:
+        numpy structured array of DISCORDIAN_DTYPE, in the shape of dates
+    """
+
+    days = _as_days(dates)
+    years, day_of_year = _split_years(days)
+
+    leap = is_leap_year(years)
+    st_tibs = leap & (day_of_year == 59)
+    day_of_year -= leap & (day_of_year > 59)  # St. Tib's doesn't count
+
+    converted = numpy.empty(days.shape, dtype=DISCORDIAN_DTYPE)
+    converted["year"] = years + 1166
+    converted["season"] = numpy.where(st_tibs, -1, day_of_year // 73)
+    converted["day_of_season"] = numpy.where(
+        st_tibs,
+        -1,
+        day_of_year % 73 + 1,
+    )
+    converted["weekday"] = numpy.where(st_tibs, -1, day_of_year % 5)
+    converted["st_tibs"] = st_tibs
+    return converted
+
+
+def to_eve(dates):
+    """Converts an array of dates to EVE years.
+
+    Args:
+        dates: array like of numpy datetime64 values, of any unit
+
+    Returns:
+        numpy structured array of EVE_DTYPE, the real (23236 based) and in
+        game (YC) years, in the shape of dates
+    """
+
+    years, _ = _split_years(_as_days(dates))
+
+    converted = numpy.empty(years.shape, dtype=EVE_DTYPE)
+    converted["real"] = 23236 + (years - 1898)
+    converted["game"] = years - 1898
+    return converted
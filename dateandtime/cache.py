@@ -0,0 +1,122 @@
+"""Bounded least recently used caching for rendered calendars, and the
+private directories our cache files and sockets are kept in.
+"""
+
+
+import os
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """A small LRU mapping which counts its hits and misses."""
+
+    def __init__(self, maxsize=32):
+        """Cache setup.
+
+        Args:
+            maxsize: the maximum number of entries to hold, at least 1
+        """
+
+        self.maxsize = max(1, int(maxsize))
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, factory):
+        """Returns the cached value for key, or caches factory()'s.
+
+        Args:
+            key: a hashable key
+            factory: callable taking no arguments to build a missing value
+
+        Returns:
+            the cached or newly built value
+        """
+
+        try:
+            value = self._entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            value = factory()
+        else:
+            self.hits += 1
+
+        self._entries[key] = value
+        self._trim()
+        return value
+
+    def resize(self, maxsize):
+        """Change the maximum size, dropping the oldest entries to fit."""
+
+        self.maxsize = max(1, int(maxsize))
+        self._trim()
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        """Returns a dict of the cache's hits, misses, size and maxsize."""
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+    def _trim(self):
+        """Drop the least recently used entries over maxsize."""
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+def private_dir(path):
+    """Returns path, a directory created private to this user.
+
+    Another user could fill a directory they own, or one open to them,
+    with poisoned files or a socket of their own, so none is returned then.
+
+    Returns:
+        string path of the directory, or None if it can't be ours alone
+    """
+
+    try:
+        if not os.path.isdir(path):
+            os.makedirs(path, 0o700)
+        stat = os.lstat(path)
+        if os.path.islink(path) or stat.st_uid != os.getuid():
+            return None
+        if stat.st_mode & 0o077:
+            os.chmod(path, 0o700)
+    except (IOError, OSError):
+        return None
+    return path
+
+
+def user_cache_dir():
+    """Returns our cache directory, see private_dir.
+
+    That's dateandtime in $XDG_CACHE_HOME, or in ~/.cache.
+
+    Returns:
+        string path of the directory, or None if it can't be ours alone
+    """
+
+    return private_dir(os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.join(
+            os.path.expanduser("~"),
+            ".cache",
+        ),
+        "dateandtime",
+    ))
@@ -0,0 +1,61 @@
+"""Thin subscriber for a dateandtime calendar server."""
+
+
+import os
+import socket
+import tempfile
+
+from dateandtime.cache import private_dir
+
+
+def default_socket():
+    """Returns the default calendar server socket path for this user.
+
+    It's in a dateandtime directory private to us, see private_dir, in
+    $XDG_RUNTIME_DIR or else in tmp, so nobody else can bind it first.
+
+    Raises:
+        SystemExit if there's no such directory to be had
+    """
+
+    directory = private_dir(
+        os.path.join(os.environ["XDG_RUNTIME_DIR"], "dateandtime")
+        if os.environ.get("XDG_RUNTIME_DIR") else
+        os.path.join(tempfile.gettempdir(), "dateandtime-{0}".format(
+            os.getuid(),
+        ))
+    )
+    if directory is None:
+        raise SystemExit("No private directory for the calendar server's "
+                         "socket, please give its PATH")
+    return os.path.join(directory, "sock")
+
+
+def connect(path, flags=None, output=1):
+    """Subscribes to a calendar server and copies its frames to output.
+
+    Args:
+        path: string path of the server's unix socket
+        flags: list of calendar flags and an optional TZ=Area/Location
+        output: integer file descriptor to write frames to
+
+    Raises:
+        SystemExit if the server can't be reached
+    """
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except (IOError, OSError) as error:
+        raise SystemExit("Cannot connect to {0}: {1}".format(path, error))
+
+    try:
+        sock.sendall("{0}\n".format(" ".join(flags or [])).encode("utf-8"))
+        while True:
+            data = sock.recv(65536)
+            if not data:
+                break
+            while data:
+                data = data[os.write(output, data):]
+    finally:
+        sock.close()
@@ -0,0 +1,121 @@
+"""The Discordian calendar system, as provided by ddate.
+
+Dates in the years of the Discordian table are DDate objects filled in
+from it, without DDate doing its own conversion.
+"""
+
+
+import datetime
+
+from ddate.base import DDate
+
+from dateandtime.ordinals import (
+    SEASON_LENGTH, discordian_season, discordian_table, is_leap, to_ordinal,
+)
+from dateandtime.systems import CalendarSystem
+
+
+def to_ddate(date):
+    """Returns the DDate of a date or datetime, looked up if possible."""
+
+    table = discordian_table()
+    ordinal = date.toordinal()
+    if ordinal not in table:
+        return DDate(date)
+
+    ddate = DDate.__new__(DDate)
+    ddate.date = date
+    ddate.year = date.year + 1166
+    ddate.season, ddate.day_of_season, ddate.day_of_week = table.lookup(
+        ordinal,
+    )
+    if ddate.season is None:
+        ddate.holiday = "St. Tib's Day"
+    elif ddate.day_of_season == 5:
+        ddate.holiday = DDate.HOLIDAYS["apostle"][ddate.season]
+    elif ddate.day_of_season == 50:
+        ddate.holiday = DDate.HOLIDAYS["seasonal"][ddate.season]
+    else:
+        ddate.holiday = None
+    return ddate
+
+
+class Discordian(CalendarSystem):
+    """Five seasons of 73 days, in weeks of five days.
+
+    St. Tib's Day, every fourth year, is in no season and no week. It's
+    shown as the season of Chaos it falls in, without a highlighted day.
+    """
+
+    name = "discordian"
+    family = "discordian"
+    week_length = 5
+    weekday_abbrs = [day[:2].title() for day in DDate.WEEKDAYS]
+    ending_days = ["70", "71", "72", "73"]
+
+    def coerce(self, date):
+        if isinstance(date, DDate):
+            return date
+        return to_ddate(date)
+
+    def today(self, now=None):
+        return self.coerce(now or datetime.date.today())
+
+    def month_key(self, date):
+        return (date.year, date.season or 0)
+
+    def month_name(self, date):
+        return date.SEASONS[date.season or 0]
+
+    def year_label(self, date):
+        return date.year
+
+    def day_of_month(self, date):
+        return date.day_of_season
+
+    def day_label(self, date):
+        if date.season is None:
+            return "St. Tib's Day, {0}".format(date.year)
+        return super(Discordian, self).day_label(date)
+
+    def months(self, year):
+        return [
+            to_ddate(datetime.date.fromordinal(
+                self._season_start(year, season),
+            ))
+            for season in range(5)
+        ]
+
+    @staticmethod
+    def _season_start(year, season):
+        """Returns the ordinal of the first day of a season of year."""
+
+        table = discordian_table()
+        if table.first_year <= year <= table.last_year:
+            return table.season_start(year, season)
+        # the discordian year starts with the gregorian one
+        return to_ordinal(year, 1, 1) + season * SEASON_LENGTH + (
+            season and is_leap(year))
+
+    def layout(self, date):
+        return discordian_season(date.season or 0)
+
+    def month_length(self, date):
+        return SEASON_LENGTH
+
+    def month_ordinals(self, date):
+        year = date.date.year
+        season = date.season or 0
+        first = self._season_start(year, season)
+        return first, first + SEASON_LENGTH - 1 + (
+            season == 0 and is_leap(year))
+
+    def day_numbers(self, date, ordinals):
+        first = self.month_ordinals(date)[0]
+        st_tibs = None
+        if not date.season and is_leap(date.date.year):
+            st_tibs = to_ordinal(date.date.year, 2, 29)
+        return [
+            ordinal - first + 1 - (st_tibs is not None and ordinal > st_tibs)
+            for ordinal in ordinals if ordinal != st_tibs
+        ]
@@ -0,0 +1,493 @@
+"""Days with events, from local iCalendar (.ics) files.
+
+Each file is parsed once into an EventIndex: every event, or series of
+recurring events, as an interval of Gregorian day ordinals in arrays
+sorted by their first day. An implicit segment tree over those arrays
+holds the latest last day below each node. Finding the events overlapping
+a month is a bisect plus a walk down the tree, O(log n + k) however many
+events the file has. Recurring series are then expanded arithmetically,
+but only inside the month being looked at.
+
+Indexes are kept on disk as raw arrays, keyed by the file's mtime and size,
+so a restart only reads them back. EventOverlay.poll() stats each file and
+reloads those which changed. It's meant to be called on each minute tick.
+
+Supported recurrence rules are FREQ (anything under a day counts as
+daily), INTERVAL, COUNT, UNTIL and BYDAY for weekly rules. Other BY* parts,
+RDATE and EXDATE are ignored. Times are taken in the zone they're written
+in, only their dates are used.
+"""
+
+
+import os
+import re
+import bisect
+import hashlib
+import tempfile
+from array import array
+
+from dateandtime.cache import user_cache_dir
+from dateandtime.ordinals import from_ordinal, month_length, to_ordinal
+
+
+# bump when the cached index's layout changes
+CACHE_VERSION = 1
+
+# last day of series without an end
+FOREVER = to_ordinal(9999, 12, 31)
+
+DAILY, WEEKLY, MONTHLY, YEARLY = range(4)
+FREQUENCIES = {
+    "SECONDLY": DAILY,
+    "MINUTELY": DAILY,
+    "HOURLY": DAILY,
+    "DAILY": DAILY,
+    "WEEKLY": WEEKLY,
+    "MONTHLY": MONTHLY,
+    "YEARLY": YEARLY,
+}
+
+# BYDAY days, counted from Monday
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+DURATION = re.compile(r"P(?:(\d+)W)?(?:(\d+)D)?")
+
+# typecode of every array in an index, wide enough for any ordinal
+TYPECODE = "q"
+
+
+def default_cache():
+    """Returns the cache directory, from $DATEANDTIME_EVENTS_CACHE or in
+    user_cache_dir, None if there's nowhere private to keep it.
+    """
+
+    path = os.environ.get("DATEANDTIME_EVENTS_CACHE")
+    if path:
+        return path
+    directory = user_cache_dir()
+    return directory and os.path.join(directory, "events")
+
+
+def _ordinal(value):
+    """Returns the day ordinal of an iCalendar DATE or DATE-TIME value.
+
+    Raises:
+        ValueError if value doesn't start with a valid date
+    """
+
+    year, month, day = int(value[:4]), int(value[4:6]), int(value[6:8])
+    if not 1 <= month <= 12 or not 1 <= day <= month_length(year, month):
+        raise ValueError("Invalid date: {0}".format(value))
+    return to_ordinal(year, month, day)
+
+
+def _unfold(text):
+    """Yields (name, parameters, value) for each content line of text."""
+
+    for line in re.sub(r"\r?\n[ \t]", "", text).splitlines():
+        if ":" not in line:
+            continue
+        head, value = line.split(":", 1)
+        name, _, parameters = head.partition(";")
+        yield name.upper(), parameters.upper(), value.strip()
+
+
+def parse_rule(value, start, duration):
+    """Returns an RRULE value as a rule tuple, see EventIndex.
+
+    Args:
+        value: string value of the RRULE property
+        start: integer ordinal of the series' first day
+        duration: integer number of days each occurrence lasts
+    """
+
+    parts = dict(
+        part.split("=", 1) for part in value.upper().split(";") if "=" in part
+    )
+    frequency = FREQUENCIES.get(parts.get("FREQ"), DAILY)
+    interval = max(int(parts.get("INTERVAL") or 1), 1)
+    until = _ordinal(parts["UNTIL"]) if "UNTIL" in parts else FOREVER
+
+    weekdays = 0
+    if frequency == WEEKLY:
+        for day in parts.get("BYDAY", "").split(","):
+            if day[-2:] in WEEKDAYS:
+                weekdays |= 1 << WEEKDAYS.index(day[-2:])
+
+    rule = (frequency, interval, until, weekdays, duration)
+    if "COUNT" in parts:
+        # found once while parsing, so lookups only ever deal with UNTIL
+        last = start
+        for number, last in enumerate(occurrences(start, rule, start, until)):
+            if number + 1 >= int(parts["COUNT"]):
+                break
+        rule = (frequency, interval, last, weekdays, duration)
+    return rule
+
+
+def parse(text):
+    """Parses the VEVENTs of an iCalendar file.
+
+    Malformed VEVENTs, with dates or durations we can't read, are skipped.
+
+    Returns:
+        tuple of (list of (first day, last day, rule number) intervals,
+                  list of rule tuples), rule number being -1 for events
+                  which don't recur
+    """
+
+    intervals = []
+    rules = []
+    event = None
+    depth = 0
+    for name, parameters, value in _unfold(text):
+        if name == "BEGIN":
+            if value.upper() == "VEVENT":
+                event = {}
+            elif event is not None:
+                depth += 1
+        elif name == "END" and event is not None:
+            if depth:
+                depth -= 1
+            elif value.upper() == "VEVENT":
+                try:
+                    _add_event(event, intervals, rules)
+                except ValueError:
+                    pass
+                event = None
+        elif event is not None and not depth:
+            event[name] = (parameters, value)
+
+    return intervals, rules
+
+
+def _add_event(event, intervals, rules):
+    """Adds a parsed VEVENT's interval, and its rule if it recurs.
+
+    Raises:
+        ValueError on a malformed date, duration or rule, before adding
+    """
+
+    if "DTSTART" not in event or \
+       event.get("STATUS", ("", ""))[1].upper() == "CANCELLED":
+        return
+
+    start = _ordinal(event["DTSTART"][1])
+    last = start
+    if "DTEND" in event:
+        parameters, value = event["DTEND"]
+        last = _ordinal(value)
+        # the end is exclusive for dates, and for times at midnight
+        if "VALUE=DATE" in parameters or len(value) == 8 or \
+           value[9:15] == "000000":
+            last -= 1
+    elif "DURATION" in event:
+        duration = DURATION.match(event["DURATION"][1])
+        if duration is None:
+            raise ValueError("Invalid duration: {0}".format(
+                event["DURATION"][1],
+            ))
+        weeks, days = duration.groups()
+        last = start + int(weeks or 0) * 7 + int(days or 0)
+        if "VALUE=DATE" in event["DTSTART"][0] or \
+           len(event["DTSTART"][1]) == 8:
+            last -= 1
+    last = max(last, start)
+
+    if "RRULE" in event:
+        rule = parse_rule(event["RRULE"][1], start, last - start + 1)
+        rules.append(rule)
+        intervals.append((start, rule[2] + rule[4] - 1, len(rules) - 1))
+    else:
+        intervals.append((start, last, -1))
+
+
+def occurrences(start, rule, first, last):
+    """Yields the first days of a series' occurrences between first and last.
+
+    Args:
+        start: integer ordinal of the series' first day
+        rule: rule tuple, see EventIndex
+        first: integer ordinal to start looking from
+        last: integer ordinal to stop looking at
+    """
+
+    frequency, interval, until, weekdays, _ = rule
+    first = max(first, start)
+    last = min(last, until)
+    if first > last:
+        return
+
+    if frequency == DAILY:
+        day = start + -(-(first - start) // interval) * interval
+        while day <= last:
+            yield day
+            day += interval
+
+    elif frequency == WEEKLY:
+        if not weekdays:
+            weekdays = 1 << ((start - 1) % 7)
+        # weeks start on Monday, the first week is start's
+        week = (first - 1) // 7
+        week += -(week - (start - 1) // 7) % interval
+        while week * 7 + 1 <= last:
+            for weekday in range(7):
+                day = week * 7 + 1 + weekday
+                if weekdays & (1 << weekday) and first <= day <= last:
+                    yield day
+            week += interval
+
+    else:
+        year, month, day_of_month = from_ordinal(start)
+        first_year, first_month, _ = from_ordinal(first)
+        if frequency == MONTHLY:
+            step = interval
+            index = (first_year - year) * 12 + first_month - month
+        else:
+            step = interval * 12
+            index = (first_year - year) * 12
+        index += -index % step
+        while True:
+            this_year = year + (month - 1 + index) // 12
+            this_month = (month - 1 + index) % 12 + 1
+            if to_ordinal(this_year, this_month, 1) > last:
+                break
+            # months without the day, like the 31st or February 29th, skip
+            if day_of_month <= month_length(this_year, this_month):
+                day = to_ordinal(this_year, this_month, day_of_month)
+                if first <= day <= last:
+                    yield day
+            index += step
+
+
+class EventIndex(object):
+    """Event intervals of one file, in arrays of day ordinals.
+
+    Rules are (frequency, interval, until, weekdays, duration) tuples:
+    frequency one of DAILY, WEEKLY, MONTHLY or YEARLY, until the ordinal of
+    the last possible occurrence, weekdays a bit mask from Monday and
+    duration the number of days each occurrence lasts.
+    """
+
+    __slots__ = ("starts", "ends", "rule_numbers", "tree", "rules")
+
+    def __init__(self, intervals=(), rules=()):
+        """Index setup.
+
+        Args:
+            intervals: list of (first day, last day, rule number) tuples
+            rules: list of rule tuples
+        """
+
+        intervals = sorted(intervals)
+        self.starts = array(TYPECODE, [start for start, _, _ in intervals])
+        self.ends = array(TYPECODE, [end for _, end, _ in intervals])
+        self.rule_numbers = array(TYPECODE, [rule for _, _, rule in intervals])
+        self.rules = [tuple(rule) for rule in rules]
+        self.tree = self._build()
+
+    def __len__(self):
+        return len(self.starts)
+
+    @staticmethod
+    def tree_length(count):
+        """Returns the length of the segment tree over count intervals."""
+
+        size = 1
+        while size < count:
+            size *= 2
+        return 2 * size
+
+    def _build(self):
+        """Returns the segment tree of the latest end below each node."""
+
+        tree = array(TYPECODE, [-1]) * self.tree_length(len(self.ends))
+        size = len(tree) // 2
+        tree[size:size + len(self.ends)] = self.ends
+        for node in range(size - 1, 0, -1):
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+        return tree
+
+    def overlapping(self, first, last):
+        """Yields the positions of intervals overlapping first to last."""
+
+        limit = bisect.bisect_right(self.starts, last)
+        if not limit:
+            return
+
+        size = len(self.tree) // 2
+        nodes = [(1, 0, size)]
+        while nodes:
+            node, low, high = nodes.pop()
+            if low >= limit or self.tree[node] < first:
+                continue
+            if node >= size:
+                yield low
+            else:
+                middle = (low + high) // 2
+                nodes.append((2 * node + 1, middle, high))
+                nodes.append((2 * node, low, middle))
+
+    def days(self, first, last):
+        """Returns the set of ordinals from first to last with an event."""
+
+        found = set()
+        for position in self.overlapping(first, last):
+            start = self.starts[position]
+            rule_number = self.rule_numbers[position]
+            if rule_number < 0:
+                spans = [(start, self.ends[position])]
+            else:
+                rule = self.rules[rule_number]
+                spans = [
+                    (day, day + rule[4] - 1) for day in occurrences(
+                        start, rule, first - rule[4] + 1, last,
+                    )
+                ]
+            for span_start, span_end in spans:
+                found.update(range(
+                    max(span_start, first),
+                    min(span_end, last) + 1,
+                ))
+        return found
+
+    def dumps(self):
+        """Returns the index as bytes, for loads."""
+
+        rules = array(TYPECODE, [
+            value for rule in self.rules for value in rule
+        ])
+        return b"".join([
+            "{0} {1}\n".format(len(self.starts), len(self.rules)).encode(),
+            self.starts.tobytes(),
+            self.ends.tobytes(),
+            self.rule_numbers.tobytes(),
+            self.tree.tobytes(),
+            rules.tobytes(),
+        ])
+
+    @classmethod
+    def loads(cls, data):
+        """Returns the index dumps wrote to data, without rebuilding it."""
+
+        header, data = data.split(b"\n", 1)
+        count, rule_count = [int(value) for value in header.split()]
+
+        arrays = []
+        position = 0
+        for length in (count, count, count, cls.tree_length(count),
+                       rule_count * 5):
+            values = array(TYPECODE)
+            end = position + length * values.itemsize
+            values.frombytes(data[position:end])
+            position = end
+            arrays.append(values)
+
+        index = cls.__new__(cls)
+        index.starts, index.ends, index.rule_numbers, index.tree = arrays[:4]
+        index.rules = [
+            tuple(arrays[4][number:number + 5])
+            for number in range(0, len(arrays[4]), 5)
+        ]
+        return index
+
+
+def load(path, cache=None):
+    """Returns the EventIndex for the .ics file at path.
+
+    The index is read from the cache directory if it was written for this
+    exact version of the file, otherwise the file is parsed and the index
+    cached. Without a cache directory, see default_cache, it's always
+    parsed.
+    """
+
+    stat = os.stat(path)
+    cache = cache or default_cache()
+    key = "dateandtime-events {0} {1} {2}\n".format(
+        CACHE_VERSION,
+        stat.st_mtime_ns,
+        stat.st_size,
+    ).encode("utf-8")
+
+    cache_path = cache and os.path.join(cache, hashlib.sha1(
+        os.path.abspath(path).encode("utf-8"),
+    ).hexdigest())
+    if cache_path:
+        try:
+            with open(cache_path, "rb") as cache_file:
+                if cache_file.readline() == key:
+                    return EventIndex.loads(cache_file.read())
+        except (IOError, OSError, ValueError):
+            pass
+
+    with open(path, "rb") as ics:
+        index = EventIndex(*parse(ics.read().decode("utf-8", "replace")))
+
+    if cache_path:
+        try:
+            if not os.path.isdir(cache):
+                os.makedirs(cache, 0o700)
+            handle, temp_path = tempfile.mkstemp(dir=cache, prefix=".events")
+            with os.fdopen(handle, "wb") as temp_file:
+                temp_file.write(key + index.dumps())
+            os.rename(temp_path, cache_path)
+        except (IOError, OSError):
+            pass
+    return index
+
+
+class EventOverlay(object):
+    """The events of several .ics files, reloaded when they change."""
+
+    def __init__(self, paths, cache=None):
+        """Overlay setup, loads every file.
+
+        Args:
+            paths: list of .ics file paths
+            cache: the cache directory to use, defaults to default_cache()
+        """
+
+        self.paths = list(paths)
+        self.cache = cache
+        self.versions = {}
+        self.indexes = {}
+        self.poll()
+
+    def poll(self):
+        """Reloads the files whose mtime or size changed.
+
+        A file which can't be read keeps its last good index, until it
+        changes again.
+
+        Returns:
+            boolean, True if anything was reloaded
+        """
+
+        changed = False
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+                version = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                version = None
+            if version == self.versions.get(path, False):
+                continue
+
+            self.versions[path] = version
+            if version is None:
+                self.indexes.pop(path, None)
+            else:
+                try:
+                    self.indexes[path] = load(path, self.cache)
+                except (IOError, OSError, ValueError):
+                    continue
+            changed = True
+        return changed
+
+    def days(self, first, last):
+        """Returns the set of ordinals from first to last with an event."""
+
+        found = set()
+        for index in self.indexes.values():
+            found |= index.days(first, last)
+        return found
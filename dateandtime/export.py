@@ -0,0 +1,297 @@
+"""Render whole ranges of years to plain text, ANSI, JSON lines or iCalendar.
+
+Years are rendered in chunks by a pool of worker processes, and written out
+in order as each chunk is finished. Only a few chunks per worker are in
+flight at once, so memory doesn't grow with the range.
+
+Years are Gregorian. Every system's year starts on the first of January,
+so a chunk of Gregorian years is the same chunk in any of them.
+
+Usage Examples::
+
+    $ dateandtime export 2000 2099 --format ics -c discordian -o dd.ics
+    $ dateandtime export 2014 -d
+
+    >>> from dateandtime.export import export
+    >>> export(1900, 2099, "discordian", "json", jobs=4)
+"""
+
+
+import os
+import json
+import time
+import datetime
+import collections
+
+from dateandtime.sink import StreamSink, stdout_sink
+
+
+FORMATS = ("text", "ansi", "json", "ics")
+
+# export's options, in the form of base.OPTIONS
+OPTIONS = [
+    ("format", ["-f", "--format"], "|".join(FORMATS), "output format"),
+    ("output", ["-o", "--output"], "PATH", "write to PATH, not stdout"),
+    ("jobs", ["-j", "--jobs"], "N", "worker processes, defaults to cpus"),
+    ("chunk", ["--chunk"], "YEARS", "years rendered per task"),
+    ("calendar", ["-c", "--calendar"], "NAME", "use a registered calendar"),
+    ("help", ["-h", "--help"], None, "show this message"),
+]
+
+# tasks submitted per worker ahead of the one being written out
+LOOKAHEAD = 2
+
+
+def _text(system, year, ansi=False):
+    """Returns year's months as printed calendars, with or without colour."""
+
+    from dateandtime.ansi import ANSI
+    from dateandtime.renderer import SGR
+    from dateandtime.multicalendar import iter_months
+
+    lines = []
+    for line in iter_months(
+            datetime.date(year, 1, 1),
+            datetime.date(year, 12, 31),
+            system):
+        lines.append(line if ansi else SGR.sub("", line))
+        if line == ANSI.END:
+            lines.append("")  # a blank line after each month
+    return "{0}\n".format("\n".join(lines[:-1]))
+
+
+def _json(system, year):
+    """Returns one JSON object per month of year, one per line.
+
+    Days outside the month are null in its weeks.
+    """
+
+    from dateandtime.grid import OTHERMONTH
+    from dateandtime.systems import get_system
+    from dateandtime.multicalendar import iter_grids
+
+    names = get_system(system)
+    lines = []
+    for first, grid in iter_grids(
+            datetime.date(year, 1, 1),
+            datetime.date(year, 12, 31),
+            system):
+        days = [
+            None if state == OTHERMONTH else day
+            for day, state in zip(grid.days, grid.states)
+        ]
+        lines.append(json.dumps({
+            "system": names.name,
+            "year": names.year_label(first),
+            "month": names.month_name(first),
+            "weekdays": names.weekday_abbrs,
+            "weeks": [
+                days[week:week + grid.week_length]
+                for week in range(0, len(days), grid.week_length)
+            ],
+        }, sort_keys=True))
+    return "".join("{0}\n".format(line) for line in lines)
+
+
+def _ics(system, year, stamp):
+    """Returns an all day VEVENT for each day of year, named in system."""
+
+    from dateandtime.systems import get_system
+
+    system = get_system(system)
+    first = datetime.date(year, 1, 1).toordinal()
+    events = []
+    for ordinal in range(first, datetime.date(year + 1, 1, 1).toordinal()):
+        day = datetime.date.fromordinal(ordinal)
+        events.append(
+            "BEGIN:VEVENT\r\n"
+            "UID:{0}-{1}@dateandtime\r\n"
+            "DTSTAMP:{2}\r\n"
+            "DTSTART;VALUE=DATE:{0}\r\n"
+            "SUMMARY:{3}\r\n"
+            "END:VEVENT\r\n".format(
+                day.strftime("%Y%m%d"),
+                system.name,
+                stamp,
+                ics_escape(system.day_label(system.coerce(day))),
+            )
+        )
+    return "".join(events)
+
+
+def ics_escape(text):
+    """Escapes text for an iCalendar TEXT value."""
+
+    for char in ("\\", ";", ","):
+        text = text.replace(char, "\\" + char)
+    return text.replace("\n", "\\n")
+
+
+def render_years(system, fmt, years, stamp=None):
+    """Renders a chunk of years. Runs in the worker processes.
+
+    Args:
+        system: string name of the calendar system
+        fmt: one of FORMATS
+        years: list of integer Gregorian years
+        stamp: iCalendar DTSTAMP value, for the ics format
+
+    Returns:
+        string of the years' output, to be written out in order
+    """
+
+    parts = []
+    for year in years:
+        if fmt == "json":
+            parts.append(_json(system, year))
+        elif fmt == "ics":
+            parts.append(_ics(system, year, stamp))
+        else:
+            parts.append(_text(system, year, ansi=fmt == "ansi"))
+    separator = "\n" if fmt in ("text", "ansi") else ""
+    return separator.join(parts)
+
+
+def _in_order(executor, tasks, window):
+    """Yields render_years' results for tasks in order, as they finish.
+
+    At most window tasks are submitted ahead of the one being yielded.
+    Those not yet started are cancelled if we're closed early.
+    """
+
+    pending = collections.deque()
+    try:
+        for task in tasks:
+            pending.append(executor.submit(render_years, *task))
+            if len(pending) > window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def iter_export(start, end, system="gregorian", fmt="text", jobs=None,
+                chunk=1):
+    """Yields the export of years start to end, inclusive, in order.
+
+    Args:
+        start: integer first Gregorian year
+        end: integer last Gregorian year
+        system: string name of the calendar system
+        fmt: one of FORMATS
+        jobs: integer number of worker processes, defaults to the cpu
+              count. With 1, everything is rendered in this process.
+        chunk: integer number of years rendered per task
+
+    Raises:
+        SystemExit on an unknown format or system, or an empty range
+    """
+
+    if fmt not in FORMATS:
+        raise SystemExit("Unknown export format: {0}".format(fmt))
+    if end < start:
+        raise SystemExit("Cannot export {0} to {1}".format(start, end))
+
+    from dateandtime.systems import get_system
+
+    get_system(system)  # fail before starting any workers
+    stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+    tasks = (
+        (system, fmt, list(range(first, min(first + chunk, end + 1))), stamp)
+        for first in range(start, end + 1, chunk)
+    )
+
+    if fmt == "ics":
+        yield "BEGIN:VCALENDAR\r\nVERSION:2.0\r\n" \
+              "PRODID:-//dateandtime//export//EN\r\n"
+
+    executor = None
+    if jobs == 1:
+        results = (render_years(*task) for task in tasks)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        jobs = jobs or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(jobs)
+        results = _in_order(executor, tasks, LOOKAHEAD * jobs)
+
+    separator = "\n" if fmt in ("text", "ansi") else ""
+    try:
+        for number, part in enumerate(results):
+            yield (separator if number else "") + part
+    finally:
+        if executor is not None:
+            results.close()
+            executor.shutdown()
+
+    if fmt == "ics":
+        yield "END:VCALENDAR\r\n"
+
+
+def export(start, end, system="gregorian", fmt="text", jobs=None, chunk=1,
+           sink=None):
+    """Writes the export of years start to end, inclusive, to sink.
+
+    Args:
+        see iter_export
+        sink: where to write each chunk, defaults to stdout
+    """
+
+    sink = sink or stdout_sink()
+    for part in iter_export(start, end, system, fmt, jobs, chunk):
+        sink.write(part)
+
+
+def main(args):
+    """Entry point for `dateandtime export START [END] [options]`.
+
+    Args:
+        args: list of strings, the arguments after "export"
+    """
+
+    from dateandtime.base import (
+        calendar_kwargs, format_options, parse_options,
+    )
+    from dateandtime.systems import system_name
+
+    options, args = parse_options(args, OPTIONS)
+    years = [arg for arg in args if arg.isdigit()]
+    if options["help"] or not 1 <= len(years) <= 2:
+        raise SystemExit(
+            "Dateandtime export usage:\n"
+            "  dateandtime export START [END] [calendar] [options]\n"
+            "Options:\n  {0}".format(format_options(OPTIONS))
+        )
+
+    calendar = calendar_kwargs(options, [
+        arg for arg in args if arg not in years
+    ])
+    system = calendar.pop("system", None) or system_name(**calendar)
+    fmt = options["format"] if options["format"] is not True else None
+
+    try:
+        jobs = int(options["jobs"]) if options["jobs"] not in (
+            None, True) else None
+        chunk = int(options["chunk"]) if options["chunk"] not in (
+            None, True) else 1
+    except ValueError:
+        raise SystemExit("--jobs and --chunk take a number")
+
+    def _export(sink):
+        export(
+            int(years[0]),
+            int(years[-1]),
+            system,
+            fmt or "text",
+            jobs,
+            max(chunk, 1),
+            sink,
+        )
+
+    if options["output"] and options["output"] is not True:
+        with open(options["output"], "w", newline="") as output:
+            _export(StreamSink(output))
+    else:
+        _export(None)
@@ -0,0 +1,279 @@
+"""Compiled, strftime style formats for the time line and the tag line.
+
+A format is parsed once into literals and fields. A time format then
+builds a table of its lines for all 1440 minutes of a day, centered to the
+width asked for, from interned tables of hours, minutes and names. Making
+a time line on a tick is an index into that table, and a join with the
+second when the format shows seconds. Nothing is parsed and strftime is
+never called while running.
+
+Time line directives::
+
+    %H %-H  hour, 00-23 or 0-23     %I %-I  hour, 01-12 or 1-12
+    %M      minute, 00-59           %S      second, 00-59
+    %p %P   AM/PM or am/pm          %a %A   weekday, Mon or Monday
+    %d %-d  day, 01-31 or 1-31      %b %B   month, Mar or March
+    %m      month, 01-12            %Y %y   year, 2014 or 14
+    %j      day of the year         %V %G   ISO week and its year
+    %u      ISO weekday, 1-7        %%      a percent sign
+
+Tag line directives, in the calendar system's names::
+
+    %B  the month, shortened to fit    %b  the month's first three letters
+    %Y  the year                       %%  a percent sign
+
+Usage Examples::
+
+    $ dateandtime --time-format "%H:%M:%S"
+    $ dateandtime --time-format "W%V %-I:%M %P" --header-format "%b %Y"
+"""
+
+
+import re
+import sys
+import datetime
+
+from dateandtime.cache import LRUCache
+
+
+TIME_FORMAT = "%-I:%M %P"
+HEADER_FORMAT = "%B %Y"
+
+DIRECTIVE = re.compile(r"%(-?.)")
+
+MONTH_NAMES = tuple(sys.intern(name) for name in (
+    "January", "February", "March", "April", "May", "June", "July",
+    "August", "September", "October", "November", "December",
+))
+WEEKDAY_NAMES = tuple(sys.intern(name) for name in (
+    "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday",
+    "Sunday",
+))
+
+# zero padded numbers, indexed by the number
+PADDED = tuple(sys.intern("{0:02d}".format(number)) for number in range(60))
+UNPADDED = tuple(sys.intern(str(number)) for number in range(60))
+HOURS_12 = tuple(PADDED[hour % 12 or 12] for hour in range(24))
+HOURS_12_UNPADDED = tuple(UNPADDED[hour % 12 or 12] for hour in range(24))
+
+# fields of a time format, to their value at (hour, minute)
+MINUTE_FIELDS = {
+    "H": lambda hour, minute: PADDED[hour],
+    "-H": lambda hour, minute: UNPADDED[hour],
+    "I": lambda hour, minute: HOURS_12[hour],
+    "-I": lambda hour, minute: HOURS_12_UNPADDED[hour],
+    "M": lambda hour, minute: PADDED[minute],
+    "p": lambda hour, minute: "AM" if hour < 12 else "PM",
+    "P": lambda hour, minute: "am" if hour < 12 else "pm",
+}
+
+# fields of a time format, to their value on a datetime.date
+DATE_FIELDS = {
+    "a": lambda day: WEEKDAY_NAMES[day.weekday()][:3],
+    "A": lambda day: WEEKDAY_NAMES[day.weekday()],
+    "d": lambda day: PADDED[day.day],
+    "-d": lambda day: UNPADDED[day.day],
+    "b": lambda day: MONTH_NAMES[day.month - 1][:3],
+    "B": lambda day: MONTH_NAMES[day.month - 1],
+    "m": lambda day: PADDED[day.month],
+    "Y": lambda day: str(day.year),
+    "y": lambda day: PADDED[day.year % 100],
+    "j": lambda day: "{0:03d}".format(day.timetuple().tm_yday),
+    "V": lambda day: PADDED[day.isocalendar()[1]],
+    "G": lambda day: str(day.isocalendar()[0]),
+    "u": lambda day: UNPADDED[day.isoweekday()],
+}
+
+# stands in for the second in a time table, two characters wide like it
+SECOND_SLOT = "\0\0"
+
+HEADER_FIELDS = ("B", "b", "Y")
+
+# a Wednesday in September, the longest names, with two digit days
+LONGEST_DAY = datetime.date(2014, 9, 24)
+
+# compiled formats, keyed by their format string
+_COMPILED = {}
+
+
+def parse(fmt, fields, kind="time"):
+    """Splits fmt into literal strings and the names of its fields.
+
+    Args:
+        fmt: string format
+        fields: container of the field names allowed
+        kind: string name of the format, for errors
+
+    Returns:
+        list of (boolean is a field, string literal or field name)
+
+    Raises:
+        SystemExit on an unknown directive
+    """
+
+    parts = []
+    position = 0
+    for match in DIRECTIVE.finditer(fmt):
+        parts.append((False, fmt[position:match.start()]))
+        name = match.group(1)
+        if name == "%":
+            parts.append((False, "%"))
+        elif name in fields:
+            parts.append((True, name))
+        else:
+            raise SystemExit("Unknown {0} format directive: %{1}".format(
+                kind,
+                name,
+            ))
+        position = match.end()
+    parts.append((False, fmt[position:]))
+    return [(field, value) for field, value in parts if field or value]
+
+
+class TimeFormat(object):
+    """A time format, compiled to a table of lines per minute of the day."""
+
+    def __init__(self, fmt):
+        """Parses fmt, see the module's directives.
+
+        Raises:
+            SystemExit on an unknown directive
+        """
+
+        self.format = fmt
+        self.parts = parse(
+            fmt,
+            set(MINUTE_FIELDS) | set(DATE_FIELDS) | set(["S"]),
+        )
+        names = [value for field, value in self.parts if field]
+        self.seconds = "S" in names
+        self.dated = any(name in DATE_FIELDS for name in names)
+        # tables by (day, width), shared by every clock using this format
+        self._tables = LRUCache(maxsize=8)
+
+    def table(self, day=None, width=None):
+        """Returns the lines for every minute of day, centered to width.
+
+        Lines showing seconds are tuples of the pieces around them. The last
+        few tables built are kept, one per width the format is shown at, so
+        this is only slow once a day or per resize.
+
+        Args:
+            day: datetime.date, needed if the format shows the date
+            width: integer width to center to, or None not to
+        """
+
+        key = (day if self.dated else None, width)
+        return self._tables.get(key, lambda: self._build(*key))
+
+    def longest(self):
+        """Returns the length of the longest line, uncentered, on any day."""
+
+        return max(
+            len(SECOND_SLOT.join(line) if self.seconds else line)
+            for line in self._build(LONGEST_DAY if self.dated else None, None)
+        )
+
+    def _build(self, day, width):
+        dated = dict(
+            (name, field(day)) for name, field in DATE_FIELDS.items()
+        ) if self.dated else {}
+
+        lines = []
+        for hour in range(24):
+            for minute in range(60):
+                line = "".join(
+                    (MINUTE_FIELDS[value](hour, minute) if value in
+                     MINUTE_FIELDS else dated.get(value, SECOND_SLOT))
+                    if field else value
+                    for field, value in self.parts
+                )
+                if width:
+                    line = line.center(width, " ")
+                if self.seconds:
+                    lines.append(tuple(line.split(SECOND_SLOT)))
+                else:
+                    lines.append(sys.intern(line))
+        return tuple(lines)
+
+    def line(self, now, width=None):
+        """Returns the time line for now.
+
+        Args:
+            now: datetime.datetime to show
+            width: integer width to center to, or None not to
+        """
+
+        line = self.table(
+            now.date() if self.dated else None,
+            width,
+        )[now.hour * 60 + now.minute]
+        if self.seconds:
+            return PADDED[now.second].join(line)
+        return line
+
+
+class HeaderFormat(object):
+    """A tag line format, with the month shortened when it's too long."""
+
+    def __init__(self, fmt):
+        """Parses fmt, see the module's directives.
+
+        Raises:
+            SystemExit on an unknown directive
+        """
+
+        self.format = fmt
+        self.parts = parse(fmt, HEADER_FIELDS, "header")
+        self._lines = LRUCache(maxsize=256)
+
+    def _render(self, month, year):
+        values = {"B": month, "b": month[:3], "Y": str(year)}
+        return "".join(
+            values[value] if field else value for field, value in self.parts
+        )
+
+    def __call__(self, month, year, width):
+        """Returns the tag line, centered to width.
+
+        Args:
+            month: string name of the month
+            year: the year's label
+            width: integer width of the calendar
+        """
+
+        return self._lines.get(
+            (month, year, width),
+            lambda: sys.intern(self._fit(month, year, width).center(width)),
+        )
+
+    def _fit(self, month, year, width):
+        line = self._render(month, year)
+        if len(line) > width and (True, "B") in self.parts:
+            end = width - len(line)
+            if month.startswith("The "):
+                month_slice = slice(4, (end + 4) or None)
+            else:
+                month_slice = slice(0, end)
+            line = self._render(month[month_slice], year)
+        return line
+
+
+def time_format(fmt=None):
+    """Returns the compiled TimeFormat for fmt, TIME_FORMAT if None."""
+
+    fmt = fmt or TIME_FORMAT
+    key = ("time", fmt)
+    if key not in _COMPILED:
+        _COMPILED[key] = TimeFormat(fmt)
+    return _COMPILED[key]
+
+
+def header_format(fmt=None):
+    """Returns the compiled HeaderFormat for fmt, HEADER_FORMAT if None."""
+
+    fmt = fmt or HEADER_FORMAT
+    key = ("header", fmt)
+    if key not in _COMPILED:
+        _COMPILED[key] = HeaderFormat(fmt)
+    return _COMPILED[key]
@@ -0,0 +1,107 @@
+"""Compact layout of calendar months, kept apart from their ANSI formatting."""
+
+
+from array import array
+
+from dateandtime.ansi import ANSI
+from dateandtime.ordinals import overflow
+
+
+# per cell states
+CURRENT = 0
+PAST = 1
+TODAY = 2
+OTHERMONTH = 3
+EVENT = 4
+
+STYLES = ("", ANSI.PAST, ANSI.TODAY, ANSI.OTHERMONTH, ANSI.EVENT)
+
+# right justified day numbers, shared by every serialization
+DAY_LABELS = tuple(str(day).rjust(2) for day in range(100))
+
+
+class MonthGrid(object):
+    """A month laid out in weeks, as arrays of day numbers and cell states.
+
+    Cells before the first of the month are filled in with the end of the
+    previous month, cells after its last day with the start of the next.
+    """
+
+    __slots__ = ("week_length", "days", "states")
+
+    def __init__(self, week_length, first_weekday, month_length,
+                 previous_length, today=None, context=0, events=()):
+        """Lay out a month.
+
+        Args:
+            week_length: integer number of days in a week
+            first_weekday: integer column of the first day of the month
+            month_length: integer number of days in the month
+            previous_length: integer number of days in the month before
+            today: integer day of the month to highlight, or None
+            context: -1, 0 or 1 for a month before, of or after today
+            events: integer days of the month with events, shown unless
+                    they're today
+        """
+
+        self.week_length = week_length
+        cells = first_weekday + month_length + overflow(
+            week_length,
+            first_weekday,
+            month_length,
+        )[1]
+        self.days = array("B", [0]) * cells
+        self.states = array("B", [OTHERMONTH]) * cells
+
+        for cell in range(first_weekday):
+            self.days[cell] = previous_length - first_weekday + cell + 1
+
+        for day in range(1, month_length + 1):
+            cell = first_weekday + day - 1
+            self.days[cell] = day
+            if context < 0 or (context == 0 and today and day < today):
+                self.states[cell] = PAST
+            elif context == 0 and day == today:
+                self.states[cell] = TODAY
+            else:
+                self.states[cell] = CURRENT
+
+        for day in events:
+            cell = first_weekday + day - 1
+            if self.states[cell] != TODAY:
+                self.states[cell] = EVENT
+
+        for day, cell in enumerate(
+                range(first_weekday + month_length, len(self.days)), 1):
+            self.days[cell] = day
+
+    @property
+    def weeks(self):
+        """Returns the number of weeks in the grid."""
+
+        return len(self.days) // self.week_length
+
+    def lines(self):
+        """Serializes the grid into one ANSI formatted string per week.
+
+        Styles are only emitted when they change from the previous cell,
+        carrying across lines the same way the terminal does.
+
+        Returns:
+            list of strings
+        """
+
+        lines = []
+        style = ""
+        for week in range(self.weeks):
+            cells = []
+            start = week * self.week_length
+            for cell in range(start, start + self.week_length):
+                cell_style = STYLES[self.states[cell]]
+                label = DAY_LABELS[self.days[cell]]
+                if cell_style != style:
+                    label = (cell_style or ANSI.END) + label
+                    style = cell_style
+                cells.append(label)
+            lines.append(" ".join(cells))
+        return lines
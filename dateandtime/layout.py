@@ -0,0 +1,315 @@
+"""Lay out 1, 3 or 12 months to fit the terminal, and follow its resizes.
+
+Months come from BLOCK_CACHE as formatted blocks, then become panels: each
+line self contained (its carried over style restated, ended with
+ANSI.END) and padded to the block's width, so they can sit side by side.
+Panels are cached too. A day change or a resize only recomposes cached
+panels; the renderer then rewrites the cells which actually changed, the
+day which was today and the day which now is.
+"""
+
+
+import shutil
+import signal
+
+from dateandtime.ansi import ANSI
+from dateandtime.cache import LRUCache
+from dateandtime.renderer import parse_frame
+
+
+# padded, self contained month blocks, keyed by the block's lines
+PANEL_CACHE = LRUCache(maxsize=64)
+
+# spaces between months side by side
+GAP = 2
+
+# the month counts we choose between, largest first
+COUNTS = (12, 3, 1)
+
+
+class Resized(Exception):
+    """Raised out of a sleep when the terminal has been resized."""
+
+
+def terminal_size():
+    """Returns the terminal's (columns, rows), 80x24 if it can't tell."""
+
+    return tuple(shutil.get_terminal_size())
+
+
+def panel(block, width):
+    """Returns block's lines, each self contained and padded to width.
+
+    Args:
+        block: tuple of formatted lines, as calendar_lines returns them
+        width: integer width to pad each line to
+    """
+
+    def _panel():
+        rows, styles = parse_frame(block)
+        return tuple(
+            "{0}{1}{2}{3}".format(
+                "" if line.startswith(ANSI.END) else style,
+                line,
+                ANSI.END,
+                " " * (width - len(row)),
+            )
+            for line, row, style in zip(block, rows, styles)
+        )
+
+    return PANEL_CACHE.get((block, width), _panel)
+
+
+def compose(blocks, width, per_row, gap=GAP):
+    """Returns the lines of blocks, per_row of them side by side.
+
+    Args:
+        blocks: list of tuples of formatted lines
+        width: integer width of each block
+        per_row: integer number of blocks side by side
+        gap: integer spaces between blocks
+    """
+
+    lines = []
+    for start in range(0, len(blocks), per_row):
+        row = blocks[start:start + per_row]
+        lines.extend(side_by_side(row, [width] * len(row), gap))
+    return lines
+
+
+def side_by_side(blocks, widths, gap=GAP):
+    """Returns the lines of blocks next to each other.
+
+    Args:
+        blocks: list of tuples of formatted lines
+        widths: list of the integer width of each block
+        gap: integer spaces between blocks
+    """
+
+    panels = [panel(block, width) for block, width in zip(blocks, widths)]
+    height = max(len(panel_lines) for panel_lines in panels)
+    return [
+        (" " * gap).join(
+            panel_lines[number] if number < len(panel_lines)
+            else " " * width
+            for panel_lines, width in zip(panels, widths)
+        ).rstrip(" ")
+        for number in range(height)
+    ]
+
+
+class MonthLayout(object):
+    """Picks how many months to show and composes them for a day.
+
+    The terminal size is checked on every compose, so after a resize all
+    it takes is composing again. install() hooks SIGWINCH so a resize can
+    interrupt the clock's sleep, see sleeping().
+    """
+
+    def __init__(self, months=None, size=None, gap=GAP):
+        """Layout setup.
+
+        Args:
+            months: integer 1, 3 or 12, the most months to show, or None
+                    for as many as fit
+            size: callable returning the terminal's (columns, rows)
+            gap: integer spaces between months side by side
+        """
+
+        self.months = months
+        self.size = size or terminal_size
+        self.gap = gap
+        self.resized = False
+        self.asleep = False
+
+    def fit(self, count, width, height, reserved=1):
+        """Returns how many of count months fit side by side, or None.
+
+        Args:
+            count: integer number of months
+            width: integer width of a month
+            height: integer lines in a month
+            reserved: integer lines needed under the months
+        """
+
+        columns, rows = self.size()
+        for per_row in range(count, 0, -1):
+            rows_needed = -(-count // per_row) * height + reserved
+            if per_row * width + (per_row - 1) * self.gap <= columns and \
+               rows_needed <= rows:
+                return per_row
+        return None
+
+    def choose(self, system, height, reserved=1):
+        """Returns (months to show, how many side by side).
+
+        Args:
+            system: CalendarSystem object
+            height: integer lines in the tallest month
+            reserved: integer lines needed under the months
+        """
+
+        for count in COUNTS:
+            if self.months and count > self.months:
+                continue
+            # a whole year is however many months the system's year has
+            months = len(system.months(2000)) if count == 12 else count
+            per_row = self.fit(months, system.width, height, reserved)
+            if per_row:
+                return count, per_row
+        return 1, 1
+
+    def compose(self, day, discordian=False, eve_real=False, eve_game=False,
+                system=None, events=None, reserved=1, header_format=None):
+        """Builds the months around day, laid out for the terminal.
+
+        Args:
+            day: a datetime.date or datetime.datetime object
+            discordian, eve_real, eve_game, system, events, header_format:
+                the calendar, like calendar_for_day's
+            reserved: integer lines needed under the months
+
+        Returns:
+            tuple of (day's MultiCalendar, list of lines, integer width)
+        """
+
+        from dateandtime.multicalendar import MultiCalendar, calendar_for_day
+        from dateandtime.systems import get_system, system_name
+
+        calendar, lines = calendar_for_day(
+            day, discordian, eve_real, eve_game, system, events, header_format,
+        )
+        system = get_system(
+            system or system_name(discordian, eve_real, eve_game),
+        )
+
+        # the tallest a month of this system gets, tag to ANSI.END lines
+        height = 3 + -(-(system.week_length - 1 + max(
+            system.month_length(first) for first in system.months(2000)
+        )) // system.week_length)
+        count, per_row = self.choose(system, height, reserved)
+        if count == 1:
+            return calendar, lines, system.width
+
+        months = []
+        for year in (day.year - 1, day.year, day.year + 1):
+            months.extend(system.months(year))
+        keys = [system.month_key(first) for first in months]
+        current = keys.index(calendar.month_key)
+        if count == 3:
+            months = months[current - 1:current + 2]
+        else:
+            months = [
+                first for first, key in zip(months, keys)
+                if key[0] == calendar.month_key[0]
+            ]
+
+        blocks = []
+        for first in months:
+            if system.month_key(first) == calendar.month_key:
+                blocks.append(tuple(lines))
+            else:
+                blocks.append(tuple(MultiCalendar(
+                    system=system.name,
+                    date=first,
+                    now=calendar.date,
+                    events=events,
+                    header_format=header_format,
+                ).calendar_lines()))
+
+        width = per_row * system.width + (per_row - 1) * self.gap
+        return calendar, compose(blocks, system.width, per_row, self.gap), \
+            width
+
+    def compose_systems(self, day, systems, events=None, reserved=1,
+                        header_format=None):
+        """Builds day's month in each of systems, side by side.
+
+        Each system's month comes from BLOCK_CACHE, so only a new day
+        formats anything. Systems which don't fit next to each other go
+        on the next row.
+
+        Args:
+            day: a datetime.date or datetime.datetime object
+            systems: list of names of registered calendar systems
+            events, header_format: like calendar_for_day's
+            reserved: integer lines needed under the months, unused as
+                      there's always one month per system
+
+        Returns:
+            tuple of (the first system's MultiCalendar, list of lines,
+            integer width)
+        """
+
+        from dateandtime.multicalendar import calendar_for_day
+
+        calendars = [
+            calendar_for_day(
+                day,
+                system=name,
+                events=events,
+                header_format=header_format,
+            )
+            for name in systems
+        ]
+
+        columns = self.size()[0]
+        rows = [[]]
+        used = 0
+        for calendar, lines in calendars:
+            if rows[-1] and used + self.gap + calendar.max_width > columns:
+                rows.append([])
+            used = (used + self.gap if rows[-1] else 0) + calendar.max_width
+            rows[-1].append((calendar, lines))
+
+        composed = []
+        width = 0
+        for row in rows:
+            widths = [calendar.max_width for calendar, _ in row]
+            composed.extend(side_by_side(
+                [tuple(lines) for _, lines in row],
+                widths,
+                self.gap,
+            ))
+            width = max(width, sum(widths) + self.gap * (len(row) - 1))
+        return calendars[0][0], composed, width
+
+    def install(self):
+        """Starts following SIGWINCH, where the platform has it."""
+
+        if hasattr(signal, "SIGWINCH"):
+            signal.signal(signal.SIGWINCH, self._on_resize)
+
+    def _on_resize(self, signum, frame):
+        self.resized = True
+        if self.asleep:
+            self.asleep = False
+            raise Resized()
+
+    def sleeping(self):
+        """Returns a context manager for sleeps a resize may cut short.
+
+        Raises:
+            Resized, out of the with block, if a resize arrived before or
+            during it
+        """
+
+        return _Sleeping(self)
+
+
+class _Sleeping(object):
+    """Marks a layout as asleep, see MonthLayout.sleeping."""
+
+    def __init__(self, layout):
+        self.layout = layout
+
+    def __enter__(self):
+        self.layout.asleep = True
+        if self.layout.resized:
+            self.layout.asleep = False
+            raise Resized()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.layout.asleep = False
+        return False
@@ -1,21 +1,20 @@
 """Output formatting for dateandtime."""
 
 
-from __future__ import print_function
-
 import sys
-import calendar
-import datetime
-from ddate.base import DDate
 
+from dateandtime.ansi import ANSI
+from dateandtime import formats
+from dateandtime.cache import LRUCache
+from dateandtime.grid import MonthGrid
+from dateandtime.ordinals import discordian_season
+from dateandtime.sink import StreamSink
+from dateandtime.systems import get_system, system_name
 
-class ANSI(object):
-    """ANSI terminal colour settings."""
 
-    TODAY = "\033[94m"
-    PAST = "\033[31m"
-    OTHERMONTH = "\033[36m"
-    END = "\033[0m"
+# formatted month blocks, keyed by (system family, year, month, highlighted
+# day, context), the tag line's month, year and format and the event days
+BLOCK_CACHE = LRUCache(maxsize=64)
 
 
 def cmp(first, second):
@@ -32,212 +31,295 @@ def cmp(first, second):
 class MultiCalendar(object):
     """Prints multiple types of calendars."""
 
-    def __init__(self, discordian=False, eve_real=False, eve_game=False, date=None):
-        self.discordian = discordian
-        self.eve_real = eve_real
-        self.eve_game = eve_game
-
-        if self.discordian:
-            self.max_width = 14
-            self.date = date or DDate()
-            now = DDate()
-            self.context = cmp(
-                int("{0}{1}".format(self.date.year, self.date.season)),
-                int("{0}{1}".format(now.year, now.season))
-            )
-            self.calendar = discordian_calendar(self.date)
-            self.month = self.date.SEASONS[self.date.season]
-            self.ending_days = ["70", "71", "72", "73"]
-            self.day_of_month = self.date.day_of_season
-            self.weekday_abbrs = [d[:2].title() for d in self.date.WEEKDAYS]
-        else:
-            self.max_width = 20
-            now = datetime.datetime.now()
-            self.date = date or now
-            self.context = cmp(
-                int("{0}{1}".format(self.date.year, str(self.date.month).rjust(2, "0"))),
-                int("{0}{1}".format(now.year, str(now.month).rjust(2, "0"))),
-            )
-            self.month = self.date.strftime("%B")
-            # start the week on Sunday
-            self.calendar = calendar.TextCalendar(6).formatmonth(
-                self.date.year,
-                self.date.month,
-            ).splitlines()[2:]
-            self.ending_days = ["28", "29", "30", "31"]
-            self.day_of_month = self.date.strftime("%d")
-            self.weekday_abbrs = ["Su", "Mo", "Tu", "We", "Th", "Fr", "Sa"]
-
-        if self.eve_real:
-            self.year = 23236 + (self.date.year - 1898)
-        elif self.eve_game:
-            self.year = "YC {0}".format(self.date.year - 1898)
-        else:
-            self.year = self.date.year
-
-    def print_calendar(self):
-        """Prints the calendar, highlights the day."""
-
-        tag_line = "{0} {1}".format(self.month, self.year)
-
-        if len(tag_line) > self.max_width:
-            end = (self.max_width - len(str(self.year)) - 1) - len(self.month)
-            if self.month.startswith("The "):
-                month_slice = slice(4, (end + 4) or None)
-            else:
-                month_slice = slice(0, end)
-
-            tag_line = "{0} {1}".format(self.month[month_slice], self.year)
-
-        print(tag_line.center(self.max_width, " "))
-        print(" ".join(self.weekday_abbrs))
-
-        first_day = True
-        for line in self.calendar:
-            formatted_days = []
-            for day in line.split():
-                if int(day) == int(self.day_of_month) and self.context == 0:
-                    formatted_days.append("{end}{start}{day}{end}".format(
-                        start=ANSI.TODAY,
-                        day=str(day).rjust(2),
-                        end=ANSI.END,
-                    ))
-                    first_day = False
-                else:
-                    if first_day:
-                        first_day = False
-                        formatted_days.append("{start}{day}".format(
-                            start=ANSI.END if self.context > 0 else ANSI.PAST,
-                            day=str(day).rjust(2),
-                        ))
-                    else:
-                        formatted_days.append(str(day).rjust(2))
-            print("{line}".format(line=self.format_line(formatted_days)))
-
-        print(ANSI.END)
-
-    def print_spaces(self):
-        """Prints a bunch of spaces..."""
+    def __init__(self, discordian=False, eve_real=False, eve_game=False,
+                 date=None, now=None, system=None, highlight=True,
+                 events=None, time_format=None, header_format=None):
+        """Calendar setup.
 
-        print("\n".join([" " * self.max_width for _ in range(420)]))
+        Args:
+            discordian: boolean to use the discordian calendar
+            eve_real: boolean to use eve years as if they were real
+            eve_game: boolean to use the in game eve years
+            date: the day to show, in the system's date type, defaults to now
+            now: the current day, defaults to now
+            system: name of a registered calendar system, overrides the flags
+            highlight: boolean to highlight today and the days before it
+            events: EventOverlay whose days to highlight, if any
+            time_format: string format of the time line, see formats
+            header_format: string format of the tag line, see formats
+        """
 
-    def format_line(self, line):
-        """For a line of a calendar, replace any whitespace with the next or
-        previous month's dates.
+        self.system = get_system(
+            system or system_name(discordian, eve_real, eve_game),
+        )
+        self.discordian = self.system.name == "discordian"
+        self.eve_real = self.system.name == "eve_real"
+        self.eve_game = self.system.name == "eve_game"
+
+        self.max_width = self.system.width
+        now = self.system.today(now)
+        self.date = self.system.coerce(date) if date else now
+        self.month_key = self.system.month_key(self.date)
+        self.context = cmp(self.month_key, self.system.month_key(now))
+        if not highlight:
+            self.context = 1  # as if still to come, so nothing is coloured
+        self.month = self.system.month_name(self.date)
+        self.ending_days = self.system.ending_days
+        self.day_of_month = self.system.day_of_month(self.date)
+        # the day to highlight, if it's in this month's grid at all
+        self.today = None
+        if self.context == 0 and self.day_of_month:
+            self.today = int(self.day_of_month)
+        self.weekday_abbrs = self.system.weekday_abbrs
+        self.year = self.system.year_label(self.date)
+        self.time_format = formats.time_format(time_format)
+        self.header_format = formats.header_format(header_format)
+
+        self.event_days = ()
+        if events is not None:
+            first, last = self.system.month_ordinals(self.date)
+            self.event_days = tuple(sorted(self.system.day_numbers(
+                self.date,
+                events.days(first, last),
+            )))
+
+    def print_calendar(self, sink=None):
+        """Prints the calendar, highlights the day.
 
         Args:
-            line: the list of formatted days
+            sink: where to write the calendar, defaults to sys.stdout
+        """
+
+        (sink or StreamSink(sys.stdout)).write(self.format_calendar())
+
+    def format_calendar(self):
+        """Returns the calendar as print_calendar would print it."""
+
+        return "{0}\n".format("\n".join(self.calendar_lines()))
+
+    def calendar_lines(self):
+        """Builds the lines of the calendar, with the day highlighted.
+
+        Formatted blocks are shared through BLOCK_CACHE, so only the first
+        calendar for a given month and day does the formatting work.
 
         Returns:
-            line, joined by spaces, including the other month's formatted dates
+            list of strings, the tag line, weekdays, weeks and an ANSI.END
         """
 
-        if len(line) < 5 if self.discordian else 7:
-            first_week = True
-            for day in line:
-                for ending_day in self.ending_days:
-                    if ending_day == day:
-                        first_week = False
-                    elif day.endswith("{0}{1}".format(ending_day, ANSI.END)):
-                        first_week = False
-
-            if first_week:
-                return "{line}".format(
-                    line=" ".join(
-                        self.get_last_days_of_last_month(line))
-                )
-            else:
-                return "{line}".format(
-                    line=" ".join(self.get_next_days_of_next_month(line))
-                )
-        else:
-            return " ".join(line)
+        key = (self.system.family,) + self.month_key + (
+            self.today,
+            self.context,
+            self.month,
+            self.year,
+            self.header_format.format,
+            self.event_days,
+        )
+        return list(BLOCK_CACHE.get(key, lambda: tuple(self._format_block())))
+
+    def _format_block(self):
+        """Formats the tag line, weekdays and weeks of the calendar."""
+
+        lines = [
+            self.header_format(self.month, self.year, self.max_width),
+            " ".join(self.weekday_abbrs),
+        ]
 
-    def print_time(self, now):
+        lines.extend(self.month_grid().lines())
+        lines.append(ANSI.END)
+        return lines
+
+    def month_grid(self):
+        """Lays out the month numerically, with the day highlighted.
+
+        Returns:
+            MonthGrid object
+        """
+
+        first_weekday, month_length, previous_length = self.system.layout(
+            self.date,
+        )
+        return MonthGrid(
+            self.system.week_length,
+            first_weekday,
+            month_length,
+            previous_length,
+            today=self.today,
+            context=self.context,
+            events=self.event_days,
+        )
+
+    def print_spaces(self, sink=None):
+        """Prints a bunch of spaces..."""
+
+        (sink or StreamSink(sys.stdout)).write("{0}\n".format(
+            "\n".join([" " * self.max_width for _ in range(420)]),
+        ))
+
+    def print_time(self, now, sink=None):
         """Prints the time line.
 
         Args:
             now: a datetime.now() object
+            sink: where to write the time line, defaults to sys.stdout
         """
 
-        print(
-            "\r{time}".format(time="{hour}:{minute} {ampm}".format(
-                hour=int(now.strftime("%I")),
-                minute=now.strftime("%M"),
-                ampm=now.strftime("%p").lower(),
-            ).center(self.max_width, " ")),
-            end="",
-        )
-        sys.stdout.flush()
-
-    def get_next_days_of_next_month(self, line):
-        """Fill in trailing whitespace with formatted dates for next month."""
-
-        day = 0
-        while len(line) < (5 if self.discordian else 7):
-            day += 1
-            line.append("{start}{date}{end}".format(
-                start=ANSI.OTHERMONTH,
-                date=str(day).rjust(2),
-                end=ANSI.END,
-            ))
-        return line
+        (sink or StreamSink(sys.stdout)).write("\r{0}".format(
+            self.time_line(now),
+        ))
 
-    def get_last_days_of_last_month(self, line):
-        """Fill in leading whitespace with formatted dates from last month."""
+    def time_line(self, now, width=None):
+        """Builds the time line.
+
+        Args:
+            now: a datetime.now() object
+            width: integer width to center to, the calendar's if None
+
+        Returns:
+            string of the time of day, centered to width
+        """
 
-        if self.discordian:
-            day = 73
-            max_len = 5
+        return self.time_format.line(now, width or self.max_width)
+
+
+def month_starts(start, end, system):
+    """Yields the first day of each month from start's month to end's.
+
+    Args:
+        start: datetime.date in the first month
+        end: datetime.date in the last month
+        system: CalendarSystem object
+
+    Yields:
+        the system's date objects
+    """
+
+    first = system.month_key(system.coerce(start))
+    last = system.month_key(system.coerce(end))
+    for year in range(start.year, end.year + 1):
+        for day in system.months(year):
+            if first <= system.month_key(day) <= last:
+                yield day
+
+
+def iter_grids(start, end, system="gregorian", now=None):
+    """Yields each month from start's to end's as a MonthGrid.
+
+    Only the first month's layout is looked up. Weeks run on from one
+    month into the next, so each month's first weekday and its previous
+    month's length come from the month before it.
+
+    Args:
+        start: datetime.date in the first month
+        end: datetime.date in the last month
+        system: name of a registered calendar system
+        now: datetime.date to highlight, if any
+
+    Yields:
+        tuples of (the system's date for the month's first day, MonthGrid)
+    """
+
+    system = get_system(system)
+    today = system.coerce(now) if now else None
+    current = system.month_key(today) if now else None
+
+    length = None
+    for day in month_starts(start, end, system):
+        if length is None:
+            first_weekday, length, previous_length = system.layout(day)
         else:
-            day = 31
-            lastmonth = self.date.month - 1 or 12
-            lastmonthyear = self.date.year - (self.date.month - 1 == 0)
-            max_len = 7
-
-        while len(line) < max_len:
-            try:
-                if not self.discordian:
-                    datetime.datetime(
-                        year=lastmonthyear,
-                        month=lastmonth,
-                        day=day,
-                    )
-            except ValueError:
-                pass
-            else:
-                line.insert(0, "{start}{date}{end}".format(
-                    start=ANSI.OTHERMONTH,
-                    date=str(day).rjust(2),
-                    end=ANSI.END,
-                ))
-            finally:
-                day -= 1
-        return line
+            first_weekday = (first_weekday + length) % system.week_length
+            previous_length, length = length, system.month_length(day)
+
+        context = 1
+        highlight = None
+        if now:
+            context = cmp(system.month_key(day), current)
+            if context == 0 and system.day_of_month(today):
+                highlight = int(system.day_of_month(today))
+
+        yield day, MonthGrid(
+            system.week_length,
+            first_weekday,
+            length,
+            previous_length,
+            today=highlight,
+            context=context,
+        )
+
+
+def iter_months(start, end, system="gregorian", now=None):
+    """Yields the lines of each month from start's to end's, lazily.
+
+    Each month is formatted like MultiCalendar.calendar_lines, but only one
+    line exists at a time, however long the range.
+
+    Args:
+        see iter_grids
+
+    Yields:
+        strings, the tag line, weekdays, weeks and ANSI.END of each month
+    """
+
+    names = get_system(system)
+    weekdays = " ".join(names.weekday_abbrs)
+    header = formats.header_format()
+    for day, grid in iter_grids(start, end, system, now):
+        yield header(
+            names.month_name(day),
+            names.year_label(day),
+            names.width,
+        )
+        yield weekdays
+        for line in grid.lines():
+            yield line
+        yield ANSI.END
+
+
+def calendar_for_day(day, discordian=False, eve_real=False, eve_game=False,
+                     system=None, events=None, header_format=None):
+    """Builds and formats the calendar as it should look on day.
+
+    Args:
+        day: a datetime.date or datetime.datetime object
+        discordian: boolean to use the discordian calendar
+        eve_real: boolean to use eve years as if they were real
+        eve_game: boolean to use the in game eve years
+        system: name of a registered calendar system, overrides the flags
+        events: EventOverlay whose days to highlight, if any
+        header_format: string format of the tag line, see formats
+
+    Returns:
+        tuple of (MultiCalendar, list of formatted calendar lines)
+    """
+
+    calendar = MultiCalendar(
+        discordian,
+        eve_real,
+        eve_game,
+        date=day,
+        now=day,
+        system=system,
+        events=events,
+        header_format=header_format,
+    )
+    return calendar, calendar.calendar_lines()
 
 
 def discordian_calendar(date):
     """Simulate calendar.TextCalendar for discordian dates.
 
     Args:
-        date: a DDate object
+        date: a DDate object, St. Tib's Day shows the season of Chaos
 
     Returns:
         list of strings to make a calendar month
     """
 
-    first_day_of_season = DDate(
-        datetime.date(
-            year=date.date.year,
-            month=date.date.month,
-            day=date.date.day,
-        ) - datetime.timedelta(days=date.day_of_season - 1),
-    )
-
+    start_day = discordian_season(date.season or 0)[0]
     weeks = []
     first_week = True
 
-    start_day = first_day_of_season.day_of_week
     for week in range(1, 77, 5):
         if first_week:
             weeks.append("{0}{1}".format(
@@ -0,0 +1,157 @@
+"""Print the calendar or time once, for status lines and shell prompts.
+
+The day's calendar is kept in a small cache file, read through mmap. While
+the date and flags match its key nothing but this module is loaded, no
+MultiCalendar is built and ddate is never imported.
+"""
+
+
+import os
+import mmap
+import datetime
+import tempfile
+
+from dateandtime.cache import user_cache_dir
+from dateandtime.sink import stdout_sink
+
+
+# bump when the cached payload's format changes
+CACHE_VERSION = 1
+
+
+def default_cache():
+    """Returns the cache file path, from $DATEANDTIME_ONCE_CACHE or in
+    user_cache_dir, None if there's nowhere private to keep it.
+    """
+
+    path = os.environ.get("DATEANDTIME_ONCE_CACHE")
+    if path:
+        return path
+    directory = user_cache_dir()
+    return directory and os.path.join(directory, "once")
+
+
+def cache_key(day, calendar):
+    """Returns the bytes key for a day and calendar flags.
+
+    Args:
+        day: a datetime.date
+        calendar: dict of MultiCalendar kwargs, from calendar_kwargs
+
+    Returns:
+        bytes, ending in a newline
+    """
+
+    return "dateandtime {0} {1} {2}\n".format(
+        CACHE_VERSION,
+        day.isoformat(),
+        ",".join(
+            name if value is True else "{0}={1}".format(name, value)
+            for name, value in sorted(calendar.items()) if value
+        ),
+    ).encode("utf-8")
+
+
+def read_cache(path, key):
+    """Returns the cached payload if path's key matches key, else None."""
+
+    try:
+        cache_file = open(path, "rb")
+    except (IOError, OSError):
+        return None
+
+    with cache_file:
+        try:
+            mapped = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, mmap.error):  # empty file
+            return None
+        try:
+            if mapped[:len(key)] != key:
+                return None
+            return mapped[len(key):].decode("utf-8")
+        finally:
+            mapped.close()
+
+
+def write_cache(path, key, payload):
+    """Atomically replaces the cache at path with key and payload."""
+
+    directory = os.path.dirname(path) or "."
+    handle, temp_path = tempfile.mkstemp(dir=directory, prefix=".dateandtime")
+    try:
+        with os.fdopen(handle, "wb") as temp_file:
+            temp_file.write(key + payload.encode("utf-8"))
+        os.rename(temp_path, path)
+    except (IOError, OSError):
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+
+
+def render_payload(day, calendar):
+    """Builds the cache payload: the calendar's width, then its lines."""
+
+    from dateandtime.multicalendar import calendar_for_day
+
+    multicalendar, lines = calendar_for_day(day, **calendar)
+    return "{0}\n{1}".format(multicalendar.max_width, "\n".join(lines))
+
+
+def time_of_day(now, width, fmt=None):
+    """Formats the time like MultiCalendar.time_line, centered to width.
+
+    Args:
+        now: datetime to format
+        width: integer width to center to
+        fmt: string format of the time, see formats
+    """
+
+    from dateandtime.formats import time_format
+
+    return time_format(fmt).line(now, width)
+
+
+def once(calendar, what="calendar", now=None, path=None, time_format=None,
+         header_format=None):
+    """Prints the calendar and time line, or just the time line.
+
+    Args:
+        calendar: dict of MultiCalendar kwargs, from calendar_kwargs
+        what: "calendar" or "time"
+        now: datetime to display, defaults to now
+        path: the cache file to use, defaults to default_cache(), without
+              one nothing is cached
+        time_format: string format of the time line, see formats
+        header_format: string format of the tag line, see formats
+
+    Raises:
+        SystemExit on an unknown value for what
+    """
+
+    if what not in ("calendar", "time"):
+        raise SystemExit("--once takes 'calendar' or 'time', not {0}".format(
+            what,
+        ))
+
+    now = now or datetime.datetime.now()
+    path = path or default_cache()
+    if header_format:
+        calendar = dict(calendar, header_format=header_format)
+    key = cache_key(now.date(), calendar)
+
+    payload = read_cache(path, key) if path else None
+    if payload is None:
+        payload = render_payload(now.date(), calendar)
+        if path:
+            write_cache(path, key, payload)
+
+    width, lines = payload.split("\n", 1)
+    if what == "time":
+        output = "{0}\n".format(
+            time_of_day(now, int(width), time_format).strip(),
+        )
+    else:
+        output = "{0}\n{1}\n".format(
+            lines,
+            time_of_day(now, int(width), time_format),
+        )
+    stdout_sink().write(output)
@@ -0,0 +1,283 @@
+"""Day number arithmetic for every calendar dateandtime displays.
+
+Days are counted as proleptic Gregorian ordinals, the same numbering as
+datetime.date.toordinal(), with 0001-01-01 as day 1. Everything here is
+integer arithmetic on those numbers: no date objects are built, and no
+exceptions are raised to find out what a month looks like.
+
+Weekdays are columns in the displayed week, so Gregorian weekdays count
+from Sunday and Discordian ones from Sweetmorn.
+
+Discordian dates within a range of years are also kept in a compact table,
+built on first use, see discordian_table.
+"""
+
+
+import os
+from array import array
+
+
+# days in each Gregorian month, in a common year
+MONTH_LENGTHS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# days in the year before the first of each month, in a common year
+DAYS_BEFORE_MONTH = tuple(
+    sum(MONTH_LENGTHS[:month]) for month in range(12)
+)
+
+# days in 400, 100 and 4 Gregorian years
+DAYS_IN_400_YEARS = 146097
+DAYS_IN_100_YEARS = 36524
+DAYS_IN_4_YEARS = 1461
+
+SEASON_LENGTH = 73
+DISCORDIAN_WEEK = 5
+DISCORDIAN_EPOCH = 1166  # YOLD 1166 was 1 AD
+
+# day of the Gregorian year (counting from 0) St. Tib's Day falls on
+ST_TIBS = 59
+
+
+def is_leap(year):
+    """Returns True if the Gregorian year has a 29th of February."""
+
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def month_length(year, month):
+    """Returns the number of days in the Gregorian year's month (1-12)."""
+
+    if month == 2 and is_leap(year):
+        return 29
+    return MONTH_LENGTHS[month - 1]
+
+
+def days_before_year(year):
+    """Returns the number of days from 0001-01-01 to the year's first."""
+
+    year -= 1
+    return year * 365 + year // 4 - year // 100 + year // 400
+
+
+def days_before_month(year, month):
+    """Returns the number of days in the year before the month's first."""
+
+    return DAYS_BEFORE_MONTH[month - 1] + (month > 2 and is_leap(year))
+
+
+def to_ordinal(year, month, day):
+    """Returns the ordinal of the Gregorian year, month and day."""
+
+    return days_before_year(year) + days_before_month(year, month) + day
+
+
+def from_ordinal(ordinal):
+    """Returns the (year, month, day) of a Gregorian ordinal."""
+
+    days = ordinal - 1
+    cycles, days = divmod(days, DAYS_IN_400_YEARS)
+    centuries, days = divmod(days, DAYS_IN_100_YEARS)
+    olympiads, days = divmod(days, DAYS_IN_4_YEARS)
+    years, days = divmod(days, 365)
+    year = cycles * 400 + centuries * 100 + olympiads * 4 + years + 1
+
+    # the last day of a leap year spills into the next count
+    if years == 4 or centuries == 4:
+        return year - 1, 12, 31
+
+    month = (days + 50) >> 5  # never more than one too many
+    if days_before_month(year, month) > days:
+        month -= 1
+    return year, month, days - days_before_month(year, month) + 1
+
+
+def weekday(ordinal):
+    """Returns the ordinal's weekday, counting from Sunday."""
+
+    return ordinal % 7
+
+
+def overflow(week_length, first_weekday, length):
+    """Returns the (leading, trailing) days from the adjacent months.
+
+    Args:
+        week_length: integer number of days in a week
+        first_weekday: integer column of the month's first day
+        length: integer number of days in the month
+    """
+
+    return first_weekday, -(first_weekday + length) % week_length
+
+
+def gregorian_month(year, month):
+    """Returns (first weekday, length, previous month's length).
+
+    Args:
+        year: integer Gregorian year
+        month: integer month, 1-12
+    """
+
+    return (
+        weekday(to_ordinal(year, month, 1)),
+        month_length(year, month),
+        month_length(year - (month == 1), month - 1 or 12),
+    )
+
+
+def discordian_date(ordinal):
+    """Returns the Discordian date of a Gregorian ordinal.
+
+    Returns:
+        tuple of (year, season, day of season, weekday), seasons and
+        weekdays counting from 0 and days from 1. On St. Tib's Day, which
+        is outside of any week or season, all but the year are None.
+    """
+
+    year, month, day = from_ordinal(ordinal)
+    day_of_year = days_before_month(year, month) + day - 1
+    if is_leap(year):
+        if day_of_year == ST_TIBS:
+            return year + DISCORDIAN_EPOCH, None, None, None
+        elif day_of_year > ST_TIBS:
+            day_of_year -= 1
+
+    season, day_of_season = divmod(day_of_year, SEASON_LENGTH)
+    return (
+        year + DISCORDIAN_EPOCH,
+        season,
+        day_of_season + 1,
+        day_of_year % DISCORDIAN_WEEK,
+    )
+
+
+def discordian_season(season):
+    """Returns (first weekday, length, previous season's length).
+
+    Every year starts on Sweetmorn and St. Tib's Day is skipped by the
+    week, so neither depends on the year.
+
+    Args:
+        season: integer season, 0-4
+    """
+
+    return (
+        season * SEASON_LENGTH % DISCORDIAN_WEEK,
+        SEASON_LENGTH,
+        SEASON_LENGTH,
+    )
+
+
+# Gregorian years the Discordian table covers, inclusive, unless overridden
+# by DATEANDTIME_DISCORDIAN_YEARS, as in "1600-2400"
+TABLE_YEARS = (1900, 2099)
+
+# a table entry packs season << 10 | weekday << 7 | day of season
+ST_TIBS_ENTRY = 0xFFFF
+
+_TABLE = []
+
+
+def _year_entries(leap):
+    """Returns the table entries of one Gregorian year."""
+
+    entries = array("H")
+    for day_of_year in range(365):
+        season, day_of_season = divmod(day_of_year, SEASON_LENGTH)
+        entries.append(
+            season << 10 |
+            day_of_year % DISCORDIAN_WEEK << 7 |
+            day_of_season + 1
+        )
+    if leap:
+        entries.insert(ST_TIBS, ST_TIBS_ENTRY)
+    return entries
+
+
+class DiscordianTable(object):
+    """Discordian dates of a range of Gregorian years, two bytes a day.
+
+    Each year is one of two precomputed patterns, common or leap, so
+    building the table is just copying those.
+    """
+
+    def __init__(self, first_year, last_year):
+        """Builds the table.
+
+        Args:
+            first_year: integer first Gregorian year covered
+            last_year: integer last Gregorian year covered
+        """
+
+        self.first_year = first_year
+        self.last_year = last_year
+        self.first = days_before_year(first_year) + 1
+        self.last = days_before_year(last_year + 1)
+
+        common, leap = _year_entries(False), _year_entries(True)
+        self.entries = array("H")
+        self.year_starts = array("l")
+        for year in range(first_year, last_year + 1):
+            self.year_starts.append(self.first + len(self.entries))
+            self.entries.extend(leap if is_leap(year) else common)
+
+    def __contains__(self, ordinal):
+        return self.first <= ordinal <= self.last
+
+    def lookup(self, ordinal):
+        """Returns (season, day of season, weekday) of a covered ordinal.
+
+        All three are None on St. Tib's Day, like discordian_date's.
+        """
+
+        entry = self.entries[ordinal - self.first]
+        if entry == ST_TIBS_ENTRY:
+            return None, None, None
+        return entry >> 10, entry & 0x7F, entry >> 7 & 0x7
+
+    def season_start(self, year, season):
+        """Returns the ordinal of the first day of a season.
+
+        Args:
+            year: integer Gregorian year, covered by the table
+            season: integer season, 0-4
+        """
+
+        return self.year_starts[year - self.first_year] + \
+            season * SEASON_LENGTH + (season and is_leap(year))
+
+
+def table_years(value):
+    """Returns the (first, last) years of a "FIRST-LAST" or "YEAR" range.
+
+    Raises:
+        SystemExit naming DATEANDTIME_DISCORDIAN_YEARS, on a malformed or
+        inverted range, or years datetime can't represent
+    """
+
+    first, _, last = value.partition("-")
+    try:
+        years = (int(first), int(last or first))
+    except ValueError:
+        years = None
+    if years is None or not 1 <= years[0] <= years[1] <= 9999:
+        raise SystemExit(
+            "DATEANDTIME_DISCORDIAN_YEARS takes FIRST-LAST years, from 1 to "
+            "9999, or a single year, not {0!r}".format(value)
+        )
+    return years
+
+
+def discordian_table():
+    """Returns the DiscordianTable, building it on the first call.
+
+    Raises:
+        SystemExit on a bad $DATEANDTIME_DISCORDIAN_YEARS, see table_years
+    """
+
+    if not _TABLE:
+        years = TABLE_YEARS
+        override = os.environ.get("DATEANDTIME_DISCORDIAN_YEARS")
+        if override:
+            years = table_years(override)
+        _TABLE.append(DiscordianTable(*years))
+    return _TABLE[0]
@@ -0,0 +1,237 @@
+"""Differential ANSI frame rendering for dateandtime."""
+
+
+import re
+
+from dateandtime.ansi import ANSI
+from dateandtime.sink import stdout_sink
+
+
+SGR = re.compile(r"\033\[[0-9;]*m")
+
+
+def parse_frame(lines):
+    """Splits a frame into rows of cells, the way a terminal would see them.
+
+    Styles are tracked across lines, as print_calendar relies on a colour
+    carrying on until the next ANSI.END. Whitespace is always unstyled, as
+    our styles only colour the foreground.
+
+    Args:
+        lines: list of strings, possibly containing ANSI SGR sequences
+
+    Returns:
+        tuple of (rows, styles), rows being lists of (character, style)
+        tuples and styles the active style at the start of each line
+    """
+
+    style = ""
+    rows = []
+    styles = []
+    for line in lines:
+        styles.append(style)
+        row, style = parse_line(line, style)
+        rows.append(row)
+    return rows, styles
+
+
+def parse_line(line, style=""):
+    """Splits one line into cells, see parse_frame.
+
+    Args:
+        line: string, possibly containing ANSI SGR sequences
+        style: the style active at the start of the line
+
+    Returns:
+        tuple of (list of (character, style) tuples, the style active at
+        the end of the line)
+    """
+
+    row = []
+    position = 0
+    for match in SGR.finditer(line):
+        row.extend(_cells(line[position:match.start()], style))
+        style = "" if match.group() == ANSI.END else match.group()
+        position = match.end()
+    row.extend(_cells(line[position:], style))
+    return row, style
+
+
+def _cells(text, style):
+    """Returns a list of (character, style) for each character in text."""
+
+    return [(char, style if char.strip() else "") for char in text]
+
+
+class FrameRenderer(object):
+    """Keeps the last frame written and only rewrites the cells that changed.
+
+    The cursor is moved relative to where the last write left it, so the
+    frame can live anywhere on the screen without addressing it absolutely.
+    """
+
+    BLANK = (" ", "")
+
+    def __init__(self, sink=None, gap=4):
+        """Renderer setup.
+
+        Args:
+            sink: where to write each frame's changes, defaults to stdout
+            gap: unchanged cells between two changes to rewrite rather than
+                 moving the cursor over
+        """
+
+        self.sink = sink or stdout_sink()
+        self.gap = gap
+        self.lines = None
+        self.styles = None
+        self.rows = None
+        self.ends = None
+        self.row = 0
+        self.column = 0
+        self.bytes_written = 0
+
+    def render(self, lines):
+        """Draws lines, only writing what changed since the last frame.
+
+        Args:
+            lines: list of strings making up the frame
+
+        Returns:
+            integer number of characters written
+        """
+
+        rows, styles, ends = self._parse(lines)
+        if self.rows is None:
+            output = "\033[H\033[2J" + self._draw(lines, rows)
+        elif len(rows) != len(self.rows):
+            output = self._move(0, 0) + "\033[J" + self._draw(lines, rows)
+        else:
+            output = self._update(lines, rows, styles)
+
+        self.lines = list(lines)
+        self.styles = styles
+        self.rows = rows
+        self.ends = ends
+
+        if output:
+            self.sink.write(output)
+            self.bytes_written += len(output)
+        return len(output)
+
+    def reset(self):
+        """Forgets the last frame, so the next is drawn on a cleared screen.
+        """
+
+        self.lines = None
+        self.styles = None
+        self.rows = None
+        self.ends = None
+        self.row = 0
+        self.column = 0
+
+    def _parse(self, lines):
+        """Like parse_frame, reusing the last frame's rows for lines which
+        are unchanged and start in the same style.
+
+        Returns:
+            tuple of (rows, styles, the style active at the end of each line)
+        """
+
+        previous = len(self.lines) if self.lines is not None else 0
+        style = ""
+        rows = []
+        styles = []
+        ends = []
+        for number, line in enumerate(lines):
+            styles.append(style)
+            if number < previous and line == self.lines[number] and \
+               style == self.styles[number]:
+                row, style = self.rows[number], self.ends[number]
+            else:
+                row, style = parse_line(line, style)
+            rows.append(row)
+            ends.append(style)
+        return rows, styles, ends
+
+    def snapshot(self):
+        """Returns the output to draw the last frame on a fresh terminal.
+
+        The cursor is left where this renderer's is, so the output of any
+        further render() calls can be applied after it.
+
+        Returns:
+            string, empty if nothing has been rendered yet
+        """
+
+        if self.rows is None:
+            return ""
+
+        row, column = self.row, self.column
+        output = "\033[H\033[2J" + self._draw(self.lines, self.rows)
+        return output + self._move(row, column)
+
+    def _draw(self, lines, rows):
+        """Returns the output to write the whole frame from the top row."""
+
+        self.row = len(rows) - 1
+        self.column = len(rows[-1])
+        return "{0}{1}{0}".format(ANSI.END, "\n".join(lines))
+
+    def _update(self, lines, rows, styles):
+        """Returns the output to rewrite only the changed cells."""
+
+        output = []
+        for number, row in enumerate(rows):
+            if lines[number] == self.lines[number] and \
+               styles[number] == self.styles[number]:
+                continue
+            for start, end in self._changed(self.rows[number], row):
+                output.append(self._move(number, start))
+                output.append(self._write(row, start, end))
+        return "".join(output)
+
+    def _changed(self, old, new):
+        """Returns a list of (start, end) column runs which differ."""
+
+        runs = []
+        for column in range(max(len(old), len(new))):
+            old_cell = old[column] if column < len(old) else self.BLANK
+            new_cell = new[column] if column < len(new) else self.BLANK
+            if old_cell == new_cell:
+                continue
+            if runs and column - runs[-1][1] <= self.gap:
+                runs[-1][1] = column + 1
+            else:
+                runs.append([column, column + 1])
+        return runs
+
+    def _move(self, row, column):
+        """Returns the escape codes to move the cursor to row, column."""
+
+        move = ""
+        if row < self.row:
+            move = "\033[{0}A".format(self.row - row)
+        elif row > self.row:
+            move = "\033[{0}B".format(row - self.row)
+        if column != self.column or move:
+            move += "\033[{0}G".format(column + 1)
+        self.row = row
+        self.column = column
+        return move
+
+    def _write(self, row, start, end):
+        """Returns the styled characters of row between start and end."""
+
+        output = []
+        current = ""
+        for column in range(start, end):
+            char, style = row[column] if column < len(row) else self.BLANK
+            if style != current:
+                output.append(style or ANSI.END)
+                current = style
+            output.append(char)
+        if current:
+            output.append(ANSI.END)
+        self.column = end
+        return "".join(output)
@@ -0,0 +1,109 @@
+"""Deadline driven tick scheduling for dateandtime's clock loop."""
+
+
+import time
+import datetime
+
+try:
+    from time import monotonic
+except ImportError:  # python 2
+    from time import time as monotonic
+
+
+class TickScheduler(object):
+    """Sleeps until the next minute or day boundary instead of polling.
+
+    Naps are measured against a monotonic clock, then the wall clock is
+    re-read on every wake up. A wake up before the deadline just naps again,
+    a wall clock that moved more than `tolerance` seconds away from the
+    monotonic clock (suspend/resume, NTP steps, manual changes) ends the wait
+    early so the caller can redraw with the new time.
+    """
+
+    def __init__(self, now=datetime.datetime.now, sleep=time.sleep,
+                 clock=monotonic, max_nap=60, tolerance=2, utc=time.time):
+        """Scheduler setup.
+
+        Args:
+            now: callable returning the current wall clock datetime
+            sleep: callable taking a number of seconds to sleep for
+            clock: callable returning monotonic seconds
+            max_nap: the longest single sleep, in seconds
+            tolerance: seconds the wall clock may drift per nap before the
+                       wait is considered interrupted by a clock jump
+            utc: callable returning the wall clock as UTC seconds since the
+                 epoch, which unlike a local datetime is never ambiguous
+        """
+
+        self.now = now
+        self.utc = utc
+        self.sleep = sleep
+        self.clock = clock
+        self.max_nap = max_nap
+        self.tolerance = tolerance
+        self.wakeups = 0
+        self.jumps = 0
+
+    @staticmethod
+    def next_minute(now):
+        """Returns the datetime of the start of the minute after now."""
+
+        return now.replace(second=0, microsecond=0) + datetime.timedelta(
+            minutes=1,
+        )
+
+    @staticmethod
+    def next_second(now):
+        """Returns the datetime of the start of the second after now."""
+
+        return now.replace(microsecond=0) + datetime.timedelta(seconds=1)
+
+    @staticmethod
+    def next_day(now):
+        """Returns the datetime of the midnight following now."""
+
+        return now.replace(
+            hour=0,
+            minute=0,
+            second=0,
+            microsecond=0,
+        ) + datetime.timedelta(days=1)
+
+    def sleep_until(self, deadline):
+        """Sleep until the wall clock reaches deadline.
+
+        Args:
+            deadline: a datetime to wake up at
+
+        Returns:
+            the wall clock datetime at wake up, which is at or past deadline
+            unless the wall clock jumped while we were asleep
+        """
+
+        while True:
+            now = self.now()
+            remaining = (deadline - now).total_seconds()
+            if remaining <= 0:
+                return now
+
+            nap = min(remaining, self.max_nap)
+            started = self.clock()
+            self.sleep(nap)
+            self.wakeups += 1
+
+            woke = self.now()
+            slept = self.clock() - started
+            walked = (woke - now).total_seconds()
+            if abs(walked - slept) > self.tolerance:
+                self.jumps += 1
+                return woke
+
+    def wait_for_minute(self, now):
+        """Sleep until the minute after now has started, returns the time."""
+
+        return self.sleep_until(self.next_minute(now))
+
+    def wait_for_second(self, now):
+        """Sleep until the second after now has started, returns the time."""
+
+        return self.sleep_until(self.next_second(now))
@@ -0,0 +1,272 @@
+"""Serve calendar frames to many panes from one process.
+
+Each distinct calendar and timezone gets one Channel, shared by all of its
+subscribers. One tick loop wakes on every minute boundary, renders each
+channel's frame once and pushes the same ANSI updates to every subscriber,
+so a subscriber can be as thin as `nc -U`::
+
+    $ dateandtime --serve &
+    $ (echo "-d TZ=Europe/Berlin"; cat) | \
+        nc -U $XDG_RUNTIME_DIR/dateandtime/sock
+"""
+
+
+import os
+import socket
+import asyncio
+import datetime
+
+from dateandtime.base import calendar_kwargs, parse_options
+from dateandtime.client import default_socket
+from dateandtime.sink import BufferSink
+from dateandtime.renderer import FrameRenderer
+from dateandtime.scheduler import TickScheduler
+from dateandtime.worldclock import get_zone
+from dateandtime.multicalendar import calendar_for_day
+
+
+def parse_subscription(line):
+    """Parses a subscriber's request line.
+
+    Args:
+        line: string of calendar flags as given on the command line, and an
+              optional TZ=Area/Location token
+
+    Returns:
+        tuple of (calendar kwargs, timezone name or None)
+
+    Raises:
+        SystemExit on an invalid request
+    """
+
+    timezone = None
+    flags = []
+    for token in line.split():
+        if token.startswith("TZ="):
+            timezone = token[3:]
+        else:
+            flags.append(token)
+
+    kwargs = calendar_kwargs(*parse_options(flags))
+    get_zone(timezone)
+    return kwargs, timezone
+
+
+def listening(path):
+    """Returns True if something answers on the unix socket at path."""
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        return False
+    finally:
+        sock.close()
+    return True
+
+
+class Channel(object):
+    """One calendar configuration and everyone subscribed to it."""
+
+    def __init__(self, calendar, timezone=None, write_limit=65536):
+        """Channel setup.
+
+        Args:
+            calendar: dict of MultiCalendar kwargs, from calendar_kwargs
+            timezone: string IANA zone name, or None for local time
+            write_limit: bytes a subscriber may fall behind before it's
+                         dropped
+        """
+
+        self.calendar = calendar
+        self.timezone = timezone
+        self.zone = get_zone(timezone)
+        self.write_limit = write_limit
+        self.subscribers = set()
+        self.buffer = BufferSink()
+        self.renderer = FrameRenderer(sink=self.buffer)
+        self.day = None
+        self.multicalendar = None
+        self.calendar_lines = None
+
+    def local_time(self, now):
+        """Returns the naive local time in our timezone for the UTC now."""
+
+        return now.astimezone(self.zone).replace(tzinfo=None)
+
+    def update(self, now):
+        """Renders the frame for now and pushes the changes to subscribers.
+
+        Args:
+            now: timezone aware UTC datetime
+
+        Returns:
+            bytes of the update sent to each subscriber
+        """
+
+        local = self.local_time(now)
+        if local.date() != self.day:
+            self.day = local.date()
+            self.multicalendar, self.calendar_lines = calendar_for_day(
+                local,
+                **self.calendar
+            )
+
+        self.renderer.render(
+            self.calendar_lines + [self.multicalendar.time_line(local)]
+        )
+        update = self.buffer.take().encode("utf-8")
+        if update:
+            for writer in list(self.subscribers):
+                self.send(writer, update)
+        return update
+
+    def subscribe(self, writer):
+        """Sends the whole current frame to writer and subscribes it."""
+
+        self.subscribers.add(writer)
+        self.send(writer, self.renderer.snapshot().encode("utf-8"))
+
+    def unsubscribe(self, writer):
+        """Stops sending updates to writer."""
+
+        self.subscribers.discard(writer)
+
+    def send(self, writer, data):
+        """Writes data to a subscriber, dropping it if it's fallen behind."""
+
+        transport = writer.transport
+        if transport.is_closing() or \
+           transport.get_write_buffer_size() > self.write_limit:
+            self.unsubscribe(writer)
+            transport.abort()
+        else:
+            writer.write(data)
+
+
+class CalendarServer(object):
+    """Serves calendar frames over a unix socket."""
+
+    def __init__(self, path=None, scheduler=None, request_timeout=10):
+        """Server setup.
+
+        Args:
+            path: string path of the unix socket to listen on
+            scheduler: TickScheduler whose wall clock and nap size to use
+            request_timeout: seconds a subscriber has to send its request
+        """
+
+        self.path = path or default_socket()
+        self.scheduler = scheduler or TickScheduler()
+        self.request_timeout = request_timeout
+        self.channels = {}
+        self.server = None
+
+    def channel(self, calendar, timezone=None):
+        """Returns the channel for calendar and timezone, creating it."""
+
+        key = (tuple(sorted(calendar.items())), timezone)
+        if key not in self.channels:
+            self.channels[key] = Channel(calendar, timezone)
+            self.channels[key].update(self.utc_now())
+        return self.channels[key]
+
+    def utc_now(self):
+        """Returns the timezone aware UTC time from our scheduler's clock."""
+
+        return self.scheduler.now().astimezone(datetime.timezone.utc)
+
+    def tick(self, now=None):
+        """Updates every channel, dropping those without subscribers."""
+
+        now = now or self.utc_now()
+        for key, channel in list(self.channels.items()):
+            if channel.subscribers:
+                channel.update(now)
+            else:
+                del self.channels[key]
+
+    async def start(self):
+        """Starts listening on our socket, replacing a stale one.
+
+        Raises:
+            SystemExit if another server is already listening on it
+        """
+
+        if os.path.exists(self.path):
+            if listening(self.path):
+                raise SystemExit(
+                    "A calendar server is already listening on {0}".format(
+                        self.path,
+                    )
+                )
+            os.unlink(self.path)
+        self.server = await asyncio.start_unix_server(
+            self.handle,
+            path=self.path,
+        )
+
+    async def run(self):
+        """Listens and ticks forever."""
+
+        await self.start()
+        try:
+            while True:
+                now = self.scheduler.now()
+                deadline = self.scheduler.next_minute(now)
+                while now < deadline:
+                    await asyncio.sleep(min(
+                        (deadline - now).total_seconds(),
+                        self.scheduler.max_nap,
+                    ))
+                    now = self.scheduler.now()
+                self.tick()
+        finally:
+            self.close()
+
+    def close(self):
+        """Stops listening and removes our socket."""
+
+        if self.server is not None:
+            self.server.close()
+            self.server = None
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+        for channel in self.channels.values():
+            for writer in list(channel.subscribers):
+                channel.unsubscribe(writer)
+                writer.transport.abort()
+
+    async def handle(self, reader, writer):
+        """Reads a subscriber's request and keeps it subscribed until EOF."""
+
+        try:
+            request = await asyncio.wait_for(
+                reader.readline(),
+                self.request_timeout,
+            )
+            calendar, timezone = parse_subscription(request.decode("utf-8"))
+        except SystemExit as error:
+            writer.write("{0}\n".format(error).encode("utf-8"))
+            writer.close()
+            return
+        except (asyncio.TimeoutError, UnicodeDecodeError, ConnectionError):
+            writer.close()
+            return
+
+        channel = self.channel(calendar, timezone)
+        channel.subscribe(writer)
+        try:
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            channel.unsubscribe(writer)
+            writer.close()
+
+
+def serve(path=None):
+    """Runs a CalendarServer until interrupted."""
+
+    asyncio.run(CalendarServer(path).run())
@@ -0,0 +1,176 @@
+"""Fast forward the clock loop through virtual time.
+
+be_a_clock runs unchanged against a VirtualClock: its wall clock, its
+monotonic clock and its sleeps. A sleep only moves the clocks forward, so
+months of minute ticks take seconds to run. The wall clock follows an IANA
+timezone, DST transitions included, and can be stepped at given times to
+play clock jumps. Every frame drawn is recorded along with the output it
+took.
+
+Requires python 3.9 or newer for zones, for zoneinfo.
+
+Usage Examples::
+
+    >>> import datetime
+    >>> from dateandtime.simulation import simulate
+    >>> frames = simulate(
+    ...     datetime.datetime(2016, 2, 28),
+    ...     datetime.datetime(2016, 3, 2),
+    ...     discordian=True,
+    ... )
+    >>> frames[-1].lines[-1].strip()
+    '12:00 am'
+"""
+
+
+import datetime
+import collections
+
+from dateandtime.renderer import FrameRenderer
+from dateandtime.sink import BufferSink
+
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+# a frame drawn at time, and the output written for it
+Frame = collections.namedtuple("Frame", ("time", "lines", "output"))
+
+
+class Finished(Exception):
+    """Raised out of a sleep once the virtual clock has reached its end."""
+
+
+class VirtualClock(object):
+    """Wall and monotonic clocks which only move when slept on.
+
+    Time is kept as UTC seconds. The wall clock is those in zone, as the
+    naive local datetime datetime.now would return, plus any jumps so far.
+    """
+
+    def __init__(self, start, end, zone=None, jumps=None):
+        """Clock setup.
+
+        Args:
+            start: naive local datetime to start at
+            end: naive local datetime at which sleeping raises Finished
+            zone: IANA timezone name of the wall clock, or None for UTC
+            jumps: dict of naive local datetime to the timedelta the wall
+                   clock steps by once it's reached
+        """
+
+        self.zone = None
+        if zone:
+            import zoneinfo
+
+            self.zone = zoneinfo.ZoneInfo(zone)
+        self.end = end
+        self.jumps = sorted((jumps or {}).items())
+        self.skew = 0.0
+        self.mono = 0.0
+        self.naps = 0
+        self.utc = self._utc(start)
+
+    def _utc(self, local):
+        if self.zone is None:
+            return (local - EPOCH).total_seconds()
+        return local.replace(tzinfo=self.zone).timestamp()
+
+    def now(self):
+        """Returns the wall clock, like datetime.datetime.now."""
+
+        seconds = self.timestamp()
+        if self.zone is None:
+            return EPOCH + datetime.timedelta(seconds=seconds)
+        return datetime.datetime.fromtimestamp(
+            seconds,
+            self.zone,
+        ).replace(tzinfo=None)
+
+    def timestamp(self):
+        """Returns the wall clock as UTC seconds, like time.time."""
+
+        return self.utc + self.skew
+
+    def clock(self):
+        """Returns the monotonic seconds slept so far."""
+
+        return self.mono
+
+    def sleep(self, seconds):
+        """Moves both clocks forward, then makes any jumps that are due.
+
+        Raises:
+            Finished once the wall clock has reached the end
+        """
+
+        if self.now() >= self.end:
+            raise Finished()
+        self.naps += 1
+        self.mono += seconds
+        self.utc += seconds
+        while self.jumps and self.now() >= self.jumps[0][0]:
+            self.skew += self.jumps.pop(0)[1].total_seconds()
+
+
+class FrameRecorder(FrameRenderer):
+    """A FrameRenderer which hands each frame and its output on."""
+
+    def __init__(self, clock, on_frame):
+        """Recorder setup.
+
+        Args:
+            clock: VirtualClock, to time each frame with
+            on_frame: callable taking each Frame drawn
+        """
+
+        super(FrameRecorder, self).__init__(sink=BufferSink())
+        self.clock = clock
+        self.on_frame = on_frame
+
+    def render(self, lines):
+        written = super(FrameRecorder, self).render(lines)
+        self.on_frame(Frame(self.clock.now(), tuple(lines), self.sink.take()))
+        return written
+
+
+def simulate(start, end, zone=None, jumps=None, on_frame=None, size=(20, 24),
+             stats=None, **clock):
+    """Runs the clock from start to end in virtual time.
+
+    Args:
+        start: naive local datetime to start at
+        end: naive local datetime to stop at, its frame included
+        zone: IANA timezone name of the wall clock, or None for UTC
+        jumps: dict of naive local datetime to a timedelta the wall clock
+               steps by there, see VirtualClock
+        on_frame: callable taking each Frame, instead of keeping them all
+        size: (columns, rows) of the virtual terminal
+        stats: Stats to record the clock's timings in
+        clock: any other be_a_clock kwargs, the calendar, zones, formats
+
+    Returns:
+        list of the Frames drawn, empty if on_frame was given
+    """
+
+    from dateandtime.base import be_a_clock
+    from dateandtime.layout import MonthLayout
+    from dateandtime.scheduler import TickScheduler
+
+    frames = []
+    virtual = VirtualClock(start, end, zone, jumps)
+    try:
+        be_a_clock(
+            scheduler=TickScheduler(
+                now=virtual.now,
+                sleep=virtual.sleep,
+                clock=virtual.clock,
+                utc=virtual.timestamp,
+            ),
+            renderer=FrameRecorder(virtual, on_frame or frames.append),
+            layout=MonthLayout(clock.pop("months", None), size=lambda: size),
+            stats=stats,
+            **clock
+        )
+    except Finished:
+        pass
+    return frames
@@ -0,0 +1,70 @@
+"""Output sinks, which take each rendered frame in a single write."""
+
+
+import os
+import sys
+
+
+class BufferSink(object):
+    """Keeps everything written in memory."""
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, data):
+        self.parts.append(data)
+
+    def getvalue(self):
+        """Returns everything written so far."""
+
+        return "".join(self.parts)
+
+    def take(self):
+        """Returns and forgets everything written so far."""
+
+        data, self.parts = self.getvalue(), []
+        return data
+
+
+class FdSink(object):
+    """Writes each frame to a raw file descriptor with one os.write call.
+
+    Only a partial write (a full pipe, a signal) leads to another call for
+    the remainder.
+    """
+
+    def __init__(self, fd, encoding="utf-8"):
+        self.fd = fd
+        self.encoding = encoding
+
+    def write(self, data):
+        data = data.encode(self.encoding)
+        while data:
+            data = data[os.write(self.fd, data):]
+
+
+class StreamSink(object):
+    """Writes each frame to a file like object, then flushes it."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, data):
+        self.stream.write(data)
+        self.stream.flush()
+
+
+def stdout_sink():
+    """Returns a sink for stdout, writing to its fd directly if it has one.
+
+    Anything already buffered in sys.stdout is flushed first, so it can't
+    end up after our frames.
+    """
+
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, ValueError, IOError, OSError):
+        return StreamSink(sys.stdout)
+
+    sys.stdout.flush()
+    return FdSink(fd, getattr(sys.stdout, "encoding", None) or "utf-8")
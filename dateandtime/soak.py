@@ -0,0 +1,251 @@
+"""Soak the clock loop in virtual time, watching its memory with tracemalloc.
+
+The real loop runs through years of minute ticks, see simulation, traced
+from the start. After a warm up long enough to fill BLOCK_CACHE, traced
+memory is sampled every interval of virtual days and must stay within
+bound of the first sample for the soak to pass. The report lists the
+samples, the sites which grew most since the warm up and the top
+allocating sites in multicalendar.
+
+Tracing slows the loop down about six times, ten years take a while.
+
+Usage Examples::
+
+    $ dateandtime soak 10 -d --interval 90
+    $ dateandtime soak 1 -c eve_game --bound 64
+
+    >>> from dateandtime.soak import soak
+    >>> report = soak(days=365, system="discordian")
+    >>> report.passed
+    True
+"""
+
+
+import gc
+import datetime
+import tracemalloc
+
+
+# soak's options, in the form of base.OPTIONS
+OPTIONS = [
+    ("interval", ["-i", "--interval"], "DAYS", "virtual days per sample"),
+    ("warmup", ["-w", "--warmup"], "DAYS",
+     "virtual days before the first sample"),
+    ("bound", ["-b", "--bound"], "KIB", "growth allowed after warm up"),
+    ("top", ["-t", "--top"], "N", "allocation sites to report"),
+    ("zone", ["-z", "--zone"], "ZONE", "timezone of the virtual clock"),
+    ("calendar", ["-c", "--calendar"], "NAME", "use a registered calendar"),
+    ("help", ["-h", "--help"], None, "show this message"),
+]
+
+START = datetime.datetime(2016, 1, 1)
+
+# virtual days before the first sample, past BLOCK_CACHE's 64 days
+WARMUP = 90
+
+# allocations made by the clock, rather than by the soak watching it
+CLOCK_FILES = [
+    tracemalloc.Filter(True, "*dateandtime*"),
+    tracemalloc.Filter(False, "*dateandtime*soak.py"),
+    tracemalloc.Filter(False, "*dateandtime*simulation.py"),
+]
+
+MULTICALENDAR_FILES = [tracemalloc.Filter(True, "*multicalendar.py")]
+
+
+class SoakReport(object):
+    """The memory samples of a soak, and what allocated the most."""
+
+    def __init__(self, bound, frames=0):
+        """Report setup.
+
+        Args:
+            bound: integer bytes memory may grow by after the warm up
+            frames: integer number of frames drawn
+        """
+
+        self.bound = bound
+        self.frames = frames
+        self.samples = []
+        self.growth_sites = []
+        self.multicalendar_sites = []
+
+    @property
+    def growth(self):
+        """Bytes traced at the last sample, over those at the first."""
+
+        if not self.samples:
+            return 0
+        return self.samples[-1][1] - self.samples[0][1]
+
+    @property
+    def peak_growth(self):
+        """The most bytes traced at any sample, over those at the first."""
+
+        if not self.samples:
+            return 0
+        return max(size for _, size in self.samples) - self.samples[0][1]
+
+    @property
+    def passed(self):
+        """True if memory stayed within bound of the first sample's."""
+
+        return self.peak_growth <= self.bound
+
+    def format(self):
+        """Returns the report as text."""
+
+        lines = [
+            "{0} after {1} frames: grew {2} bytes, peaked at +{3}, "
+            "bound {4}".format(
+                "PASSED" if self.passed else "FAILED",
+                self.frames,
+                self.growth,
+                self.peak_growth,
+                self.bound,
+            ),
+            "",
+            "Traced memory:",
+        ]
+        lines.extend(
+            "  {0:%Y-%m-%d}: {1} bytes".format(time, size)
+            for time, size in self.samples
+        )
+        lines.append("")
+        lines.append("Growth since warm up:")
+        lines.extend("  {0}".format(stat) for stat in self.growth_sites)
+        lines.append("")
+        lines.append("Top allocating sites in multicalendar:")
+        lines.extend("  {0}".format(stat) for stat in self.multicalendar_sites)
+        return "{0}\n".format("\n".join(lines))
+
+
+def _traced():
+    """Returns the bytes traced now, after a full collection."""
+
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def soak(days=3653, start=None, interval=30, bound=256 * 1024, top=10,
+         zone=None, warmup=WARMUP, **clock):
+    """Runs the clock loop for days of virtual time, sampling its memory.
+
+    Args:
+        days: integer virtual days to run for, warm up included
+        start: naive datetime to start at, defaults to START
+        interval: integer virtual days between samples
+        bound: integer bytes memory may grow by after the warm up
+        top: integer number of allocation sites to report
+        zone: IANA timezone name of the virtual clock, or None for UTC
+        warmup: integer virtual days to run before the first sample
+        clock: be_a_clock kwargs, the calendar, formats and so on
+
+    Returns:
+        SoakReport
+
+    Raises:
+        SystemExit if nothing would be run after the warm up
+    """
+
+    from dateandtime.simulation import simulate
+
+    if days <= warmup:
+        raise SystemExit("Cannot soak {0} days after a {1} day warm up".format(
+            days,
+            warmup,
+        ))
+
+    start = start or START
+    end = start + datetime.timedelta(days=days)
+    step = datetime.timedelta(days=interval)
+    report = SoakReport(bound)
+    state = {"next": start + datetime.timedelta(days=warmup), "baseline": None}
+
+    def on_frame(frame):
+        report.frames += 1
+        if frame.time < state["next"]:
+            return
+        state["next"] = frame.time + step
+        if state["baseline"] is None:
+            state["baseline"] = tracemalloc.take_snapshot().filter_traces(
+                CLOCK_FILES,
+            )
+        report.samples.append((frame.time, _traced()))
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        simulate(start, end, zone=zone, on_frame=on_frame, **clock)
+        if report.samples[-1][0] < end:
+            report.samples.append((end, _traced()))
+        final = tracemalloc.take_snapshot()
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+    report.growth_sites = final.filter_traces(CLOCK_FILES).compare_to(
+        state["baseline"],
+        "lineno",
+    )[:top]
+    report.multicalendar_sites = final.filter_traces(
+        MULTICALENDAR_FILES,
+    ).statistics("lineno")[:top]
+    return report
+
+
+def main(args):
+    """Entry point for `dateandtime soak [YEARS] [options]`.
+
+    Args:
+        args: list of strings, the arguments after "soak"
+
+    Raises:
+        SystemExit with the report, non zero if the soak failed
+    """
+
+    from dateandtime.base import (
+        calendar_kwargs, format_options, parse_options,
+    )
+    from dateandtime.sink import stdout_sink
+    from dateandtime.systems import system_name
+
+    options, args = parse_options(args, OPTIONS)
+    years = [arg for arg in args if arg.isdigit()]
+    if options["help"] or len(years) > 1:
+        raise SystemExit(
+            "Dateandtime soak usage:\n"
+            "  dateandtime soak [YEARS] [calendar] [options]\n"
+            "Options:\n  {0}".format(format_options(OPTIONS))
+        )
+
+    calendar = calendar_kwargs(options, [
+        arg for arg in args if arg not in years
+    ], multiple=True)
+    systems = calendar.pop("systems", None)
+    system = calendar.pop("system", None) or system_name(**calendar)
+
+    try:
+        numbers = dict(
+            (name, int(options[name]))
+            for name in ("interval", "warmup", "bound", "top")
+            if options[name] not in (None, True)
+        )
+    except ValueError:
+        raise SystemExit("--interval, --warmup, --bound and --top take a "
+                         "number")
+
+    report = soak(
+        days=int(round(365.2425 * int(years[0] if years else 10))),
+        interval=max(numbers.get("interval", 30), 1),
+        warmup=numbers.get("warmup", WARMUP),
+        bound=numbers.get("bound", 256) * 1024,
+        top=numbers.get("top", 10),
+        zone=options["zone"] if options["zone"] is not True else None,
+        system=system,
+        systems=systems,
+    )
+    stdout_sink().write(report.format())
+    if not report.passed:
+        raise SystemExit(1)
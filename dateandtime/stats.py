@@ -0,0 +1,176 @@
+"""Counters and histograms describing what the clock loop is doing.
+
+A Stats object is written as JSON to its file on every frame, or only
+after a SIGUSR1. The signal just raises a flag, the clock loop writes the
+file on its next frame, so it's never written in the middle of a frame.
+Nothing is written to the terminal the clock is drawing on. NULL_STATS
+stands in when instrumentation is disabled, its methods do nothing.
+"""
+
+
+import os
+import sys
+import math
+import signal
+
+
+class Histogram(object):
+    """Count, sum, min, max and power of two buckets of observed values."""
+
+    __slots__ = ("count", "total", "minimum", "maximum", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.buckets = {}
+
+    def observe(self, value):
+        """Adds a value to the histogram."""
+
+        self.count += 1
+        self.total += value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+        # bucket by the power of two at or above the magnitude of value
+        exponent = math.frexp(abs(value))[1] if value else None
+        self.buckets[exponent] = self.buckets.get(exponent, 0) + 1
+
+    def snapshot(self):
+        """Returns the histogram as a JSON serializable dict."""
+
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.minimum,
+            "max": self.maximum,
+            "buckets": dict(
+                ("0" if exponent is None else repr(2.0 ** exponent), count)
+                for exponent, count in sorted(
+                    self.buckets.items(),
+                    key=lambda bucket: (bucket[0] is not None, bucket[0]),
+                )
+            ),
+        }
+
+
+class Stats(object):
+    """Named counters and histograms for the clock loop."""
+
+    enabled = True
+
+    def __init__(self, path=None, periodic=True):
+        """Stats setup.
+
+        Args:
+            path: optional file path to write snapshots to
+            periodic: boolean, False to only write after a SIGUSR1
+        """
+
+        self.path = path
+        self.periodic = periodic
+        self.requested = False
+        self.counters = {}
+        self.histograms = {}
+
+    def incr(self, name, value=1):
+        """Adds value to the counter name."""
+
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, value):
+        """Adds value to the histogram name."""
+
+        if name not in self.histograms:
+            self.histograms[name] = Histogram()
+        self.histograms[name].observe(value)
+
+    def snapshot(self):
+        """Returns every counter and histogram as a JSON serializable dict."""
+
+        return {
+            "pid": os.getpid(),
+            "counters": dict(self.counters),
+            "histograms": dict(
+                (name, histogram.snapshot())
+                for name, histogram in self.histograms.items()
+            ),
+        }
+
+    def dump(self, stream=None):
+        """Writes a JSON snapshot to stream, stderr by default."""
+
+        import json
+
+        stream = stream or sys.stderr
+        stream.write(json.dumps(self.snapshot(), sort_keys=True))
+        stream.write("\n")
+        stream.flush()
+
+    def flush(self):
+        """Atomically rewrites our snapshot file, if we have one and it's
+        written periodically or was asked for.
+        """
+
+        if not self.path or not (self.periodic or self.requested):
+            return
+        self.requested = False
+
+        import tempfile
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        handle, temp_path = tempfile.mkstemp(dir=directory, prefix=".stats")
+        try:
+            with os.fdopen(handle, "w") as temp_file:
+                self.dump(temp_file)
+            os.rename(temp_path, self.path)
+        except (IOError, OSError):
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+    def install(self):
+        """Asks for our file to be written on the next flush on SIGUSR1."""
+
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, self._on_signal)
+
+    def _on_signal(self, *_):
+        self.requested = True
+
+
+def default_path():
+    """Returns a stats file path for this process, in user_cache_dir.
+
+    Raises:
+        SystemExit if there's no private cache directory to put it in
+    """
+
+    from dateandtime.cache import user_cache_dir
+
+    directory = user_cache_dir()
+    if directory is None:
+        raise SystemExit("No private cache directory, --stats needs a PATH")
+    return os.path.join(directory, "stats-{0}.json".format(os.getpid()))
+
+
+class NullStats(object):
+    """Stands in for Stats when instrumentation is disabled."""
+
+    enabled = False
+
+    def incr(self, name, value=1):
+        pass
+
+    def observe(self, name, value):
+        pass
+
+    def flush(self):
+        pass
+
+
+NULL_STATS = NullStats()
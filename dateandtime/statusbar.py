@@ -0,0 +1,146 @@
+"""Feed desktop status bars JSON instead of ANSI calendars.
+
+Two protocols are spoken: i3bar's, an endless JSON array of status lines
+after a header, and waybar's custom module "return-type": "json", one
+object per line. A record is written when the minute or the day changes,
+or the second if the time format shows seconds, never in between.
+
+Each day's record is serialized once, with placeholders for the time of
+day. On a tick the time, escaped, is joined into those pieces, so no
+record is encoded and no ANSI rendering happens while running.
+
+Usage Examples::
+
+    # ~/.config/i3/config
+    bar {
+        status_command dateandtime --bar i3bar -d
+    }
+
+    // ~/.config/waybar/config
+    "custom/dateandtime": {
+        "exec": "dateandtime --bar waybar -e",
+        "return-type": "json"
+    }
+"""
+
+
+import json
+
+from dateandtime.formats import time_format as compile_time_format
+from dateandtime.sink import stdout_sink
+from dateandtime.scheduler import TickScheduler
+from dateandtime.systems import get_system, system_name
+
+
+PROTOCOLS = ("i3bar", "waybar")
+
+# stands in for the time of day until a record is written, never in a label
+PLACEHOLDER = "\0"
+
+I3BAR_HEADER = '{"version": 1}\n[\n'
+
+
+def day_record(protocol, system, label):
+    """Returns the unserialized record for a day.
+
+    Args:
+        protocol: one of PROTOCOLS
+        system: CalendarSystem object
+        label: string of the day, as system.day_label writes it
+    """
+
+    if protocol == "i3bar":
+        return [{
+            "name": "dateandtime",
+            "instance": system.name,
+            "full_text": "{0} {1}".format(label, PLACEHOLDER),
+            "short_text": PLACEHOLDER,
+        }]
+    return {
+        "text": PLACEHOLDER,
+        "alt": system.name,
+        "class": system.name,
+        "tooltip": label,
+    }
+
+
+class DayTemplate(object):
+    """One day's record, serialized but for its time of day."""
+
+    __slots__ = ("day", "parts")
+
+    def __init__(self, protocol, system, day):
+        """Serializes the day's record.
+
+        Args:
+            protocol: one of PROTOCOLS
+            system: CalendarSystem object
+            day: datetime.date or datetime.datetime
+        """
+
+        self.day = day
+        line = json.dumps(
+            day_record(protocol, system, system.day_label(system.today(day))),
+            sort_keys=True,
+        ) + (",\n" if protocol == "i3bar" else "\n")
+        self.parts = line.split(json.dumps(PLACEHOLDER)[1:-1])
+
+    def line(self, time_of_day):
+        """Returns the serialized record at time_of_day.
+
+        The time is escaped for JSON, it comes from the user's time format.
+        """
+
+        return json.dumps(time_of_day)[1:-1].join(self.parts)
+
+
+def status_bar(protocol="i3bar", discordian=False, eve_real=False,
+               eve_game=False, system=None, scheduler=None, sink=None,
+               test=False, time_format=None):
+    """Writes a status bar record on every minute or day change, forever.
+
+    Args:
+        protocol: one of PROTOCOLS
+        discordian, eve_real, eve_game, system: the calendar, like
+            be_a_clock's
+        scheduler: TickScheduler to sleep with
+        sink: where to write each record, defaults to stdout
+        test: boolean to return after the first record
+        time_format: string format of the time, see formats, with seconds
+            a record is written every second
+
+    Raises:
+        SystemExit on an unknown protocol
+    """
+
+    if protocol not in PROTOCOLS:
+        raise SystemExit("--bar takes {0}, not {1}".format(
+            " or ".join(PROTOCOLS),
+            protocol,
+        ))
+
+    system = get_system(system or system_name(discordian, eve_real, eve_game))
+    scheduler = scheduler or TickScheduler()
+    sink = sink or stdout_sink()
+    time_line = compile_time_format(time_format)
+    wait = scheduler.wait_for_second if time_line.seconds \
+        else scheduler.wait_for_minute
+    if protocol == "i3bar":
+        sink.write(I3BAR_HEADER)
+
+    template = None
+    written = None
+    now = scheduler.now()
+    while True:
+        if template is None or template.day != now.date():
+            template = DayTemplate(protocol, system, now.date())
+
+        tick = (now.date(), now.hour, now.minute,
+                now.second if time_line.seconds else 0)
+        if tick != written:  # a clock jump can wake us in the same tick
+            written = tick
+            sink.write(template.line(time_line.line(now)))
+            if test:
+                return
+
+        now = wait(now)
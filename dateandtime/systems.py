@@ -0,0 +1,254 @@
+"""Registry of the calendar systems dateandtime can display.
+
+Each system describes its weeks, months, names and years to the render
+engine, so MultiCalendar runs the same code for all of them. Backends are
+only imported the first time they're used. Other packages can add systems
+through the "dateandtime.calendars" entry point group, pointing at a
+CalendarSystem subclass; they're only looked up for names we don't know.
+"""
+
+
+import datetime
+import importlib
+
+from dateandtime.ordinals import gregorian_month, month_length, to_ordinal
+
+
+ENTRY_POINT_GROUP = "dateandtime.calendars"
+
+# (name, "module:attribute" backend, command line flags), in help order
+BUILTIN = [
+    ("gregorian", "dateandtime.systems:Gregorian", []),
+    ("discordian", "dateandtime.discordian:Discordian",
+     ["-d", "--discord", "--discordian", "--discordianism"]),
+    ("eve_game", "dateandtime.systems:EveGame", ["-e", "--eve", "--eve-game"]),
+    ("eve_real", "dateandtime.systems:EveReal",
+     ["-r", "--eve-real", "--eve-is-real"]),
+]
+
+_BACKENDS = dict((name, backend) for name, backend, _ in BUILTIN)
+_LOADED = {}
+
+
+class CalendarSystem(object):
+    """A calendar system, as the render engine sees it.
+
+    Dates are whatever object the system uses natively, see coerce().
+    Months are identified by a (year, month) key where month counts from
+    the system's first month of the year.
+    """
+
+    name = None
+    # systems sharing a family share their month blocks, see BLOCK_CACHE
+    family = None
+    week_length = 7
+    weekday_abbrs = []
+    # the last days a month can end on
+    ending_days = []
+
+    @property
+    def width(self):
+        """Returns the width of a week, in characters."""
+
+        return self.week_length * 3 - 1
+
+    def coerce(self, date):
+        """Returns date as this system's date object."""
+
+        raise NotImplementedError
+
+    def today(self, now=None):
+        """Returns today, or now, as this system's date object."""
+
+        return self.coerce(now or datetime.datetime.now())
+
+    def month_key(self, date):
+        """Returns the (year, month) tuple of the month date falls in."""
+
+        raise NotImplementedError
+
+    def month_name(self, date):
+        """Returns the name of the month date falls in."""
+
+        raise NotImplementedError
+
+    def year_label(self, date):
+        """Returns the year of date, as it should be displayed."""
+
+        raise NotImplementedError
+
+    def day_of_month(self, date):
+        """Returns the day of the month of date, None if it's in no month."""
+
+        raise NotImplementedError
+
+    def day_label(self, date):
+        """Returns date written out, like "March 12, 2014"."""
+
+        return "{0} {1}, {2}".format(
+            self.month_name(date),
+            int(self.day_of_month(date)),
+            self.year_label(date),
+        )
+
+    def months(self, year):
+        """Returns the first day of each month starting in a Gregorian year.
+
+        Args:
+            year: integer Gregorian year
+
+        Returns:
+            list of this system's date objects
+        """
+
+        raise NotImplementedError
+
+    def layout(self, date):
+        """Returns (first weekday, month length, previous month length)."""
+
+        raise NotImplementedError
+
+    def month_length(self, date):
+        """Returns the number of days in the month date falls in."""
+
+        return self.layout(date)[1]
+
+    def month_ordinals(self, date):
+        """Returns the Gregorian ordinals of the first and last days of the
+        month date falls in.
+        """
+
+        raise NotImplementedError
+
+    def day_numbers(self, date, ordinals):
+        """Returns the days of date's month for Gregorian day ordinals.
+
+        Args:
+            date: this system's date object
+            ordinals: iterable of ordinals, all within month_ordinals(date)
+        """
+
+        first = self.month_ordinals(date)[0]
+        return [ordinal - first + 1 for ordinal in ordinals]
+
+
+class Gregorian(CalendarSystem):
+    """The Gregorian calendar, weeks starting on Sunday."""
+
+    name = "gregorian"
+    family = "gregorian"
+    weekday_abbrs = ["Su", "Mo", "Tu", "We", "Th", "Fr", "Sa"]
+    ending_days = ["28", "29", "30", "31"]
+
+    def coerce(self, date):
+        return date
+
+    def today(self, now=None):
+        return now or datetime.datetime.now()
+
+    def month_key(self, date):
+        return (date.year, date.month)
+
+    def month_name(self, date):
+        return date.strftime("%B")
+
+    def year_label(self, date):
+        return date.year
+
+    def day_of_month(self, date):
+        return date.strftime("%d")
+
+    def months(self, year):
+        return [datetime.date(year, month, 1) for month in range(1, 13)]
+
+    def layout(self, date):
+        return gregorian_month(date.year, date.month)
+
+    def month_length(self, date):
+        return month_length(date.year, date.month)
+
+    def month_ordinals(self, date):
+        first = to_ordinal(date.year, date.month, 1)
+        return first, first + month_length(date.year, date.month) - 1
+
+
+class EveGame(Gregorian):
+    """Gregorian months, with EVE online's in game (YC) years."""
+
+    name = "eve_game"
+
+    def year_label(self, date):
+        return "YC {0}".format(date.year - 1898)
+
+
+class EveReal(Gregorian):
+    """Gregorian months, with EVE years as if they were real."""
+
+    name = "eve_real"
+
+    def year_label(self, date):
+        return 23236 + (date.year - 1898)
+
+
+def register(name, backend):
+    """Registers a calendar system.
+
+    Args:
+        name: string name to look the system up by
+        backend: a CalendarSystem subclass, or a "module:attribute" string
+                 pointing at one, imported on first use
+    """
+
+    _BACKENDS[name] = backend
+    _LOADED.pop(name, None)
+
+
+def _entry_point(name):
+    """Returns the backend registered by another package under name."""
+
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # pragma: no cover
+        return None
+
+    try:
+        found = entry_points(group=ENTRY_POINT_GROUP)
+    except TypeError:  # pragma: no cover, python < 3.10
+        found = entry_points().get(ENTRY_POINT_GROUP, [])
+
+    for entry_point in found:
+        if entry_point.name == name:
+            return entry_point.value
+    return None
+
+
+def get_system(name):
+    """Returns the calendar system registered under name.
+
+    Raises:
+        SystemExit if no system by that name can be found
+    """
+
+    if name not in _LOADED:
+        backend = _BACKENDS.get(name) or _entry_point(name)
+        if backend is None:
+            raise SystemExit("Unknown calendar system: {0}".format(name))
+
+        if not isinstance(backend, type):
+            module, attribute = backend.split(":")
+            backend = getattr(importlib.import_module(module), attribute)
+        _LOADED[name] = backend()
+
+    return _LOADED[name]
+
+
+def system_name(discordian=False, eve_real=False, eve_game=False):
+    """Returns the system name for MultiCalendar's boolean flags."""
+
+    if discordian:
+        return "discordian"
+    elif eve_real:
+        return "eve_real"
+    elif eve_game:
+        return "eve_game"
+    return "gregorian"
@@ -0,0 +1,62 @@
+"""Terminal cursor control, without shelling out to setterm."""
+
+
+import os
+import sys
+
+
+# standard (DEC private mode 25) fallbacks when there's no terminfo entry
+HIDE_CURSOR = "\033[?25l"
+SHOW_CURSOR = "\033[?25h"
+
+
+def cursor_sequences(fd=None):
+    """Returns the (hide, show) cursor sequences for the terminal on fd.
+
+    Uses terminfo's civis and cnorm capabilities when curses and an entry
+    for $TERM are available, the standard escape sequences otherwise.
+
+    Args:
+        fd: integer file descriptor of the terminal, defaults to stdout's
+
+    Returns:
+        tuple of strings
+    """
+
+    try:
+        import curses
+        curses.setupterm(fd=sys.stdout.fileno() if fd is None else fd)
+        hide = curses.tigetstr("civis")
+        show = curses.tigetstr("cnorm")
+    except Exception:  # no curses, no $TERM, no terminfo entry...
+        return HIDE_CURSOR, SHOW_CURSOR
+
+    if not hide or not show:
+        return HIDE_CURSOR, SHOW_CURSOR
+    return hide.decode("ascii"), show.decode("ascii")
+
+
+class HiddenCursor(object):
+    """Context manager hiding the cursor of a tty stream while inside."""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.show = None
+
+    def __enter__(self):
+        try:
+            is_tty = os.isatty(self.stream.fileno())
+        except (AttributeError, ValueError, IOError, OSError):
+            is_tty = False
+
+        if is_tty:
+            hide, self.show = cursor_sequences(self.stream.fileno())
+            self.stream.write(hide)
+            self.stream.flush()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.show:
+            self.stream.write(self.show)
+            self.stream.flush()
+        return False
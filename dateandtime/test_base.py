@@ -1,6 +1,9 @@
 """Test dateandtime's base functions."""
 
 
+import sys
+import subprocess
+
 import pytest
 from mock import patch
 
@@ -45,18 +48,24 @@ def test_two_args_the_same(defaults):
     assert parse_args(["dateandtime", "-d", "--discordian"]) == defaults
 
 
-def test_two_different_args_raise():
-    """Should raise SystemExit."""
+def test_two_different_args(defaults):
+    """Several calendars can be asked for at once."""
+
+    defaults.update({"eve_game": True, "eve_real": True})
+    assert parse_args(["dateandtime", "-r", "-e"]) == defaults
+
+
+def _calendar_kwargs(args, multiple=False):
+    """Returns calendar_kwargs for a command line."""
 
-    with pytest.raises(SystemExit):
-        parse_args(["dateandtime", "-r", "-e"])
+    return base.calendar_kwargs(*base.parse_options(args), multiple=multiple)
 
 
 def test_three_raise_content():
     """Test the output of the sys exit being raised."""
 
     with pytest.raises(SystemExit) as error:
-        parse_args(["dateandtime", "-r", "-e", "-d"])
+        _calendar_kwargs(["dateandtime", "-r", "-e", "-d"])
 
     expected = (
         "Please limit yourself to a single calendar.\nI cannot display "
@@ -69,7 +78,7 @@ def test_two_raise_content():
     """Test the content of the sys exit being raised."""
 
     with pytest.raises(SystemExit) as error:
-        parse_args(["dateandtime", "-r", "-d"])
+        _calendar_kwargs(["dateandtime", "-r", "-d"])
 
     expected = (
         "Please limit yourself to a single calendar.\nI cannot display "
@@ -82,7 +91,7 @@ def test_two_raise_content_two():
     """Test the ording of the sys exit being raised."""
 
     with pytest.raises(SystemExit) as error:
-        parse_args(["dateandtime", "-r", "-e"])
+        _calendar_kwargs(["dateandtime", "-r", "-e"])
 
     expected = (
         "Please limit yourself to a single calendar.\nI cannot display "
@@ -91,6 +100,54 @@ def test_two_raise_content_two():
     assert expected == error.value.args[0]
 
 
+def test_several_systems(defaults):
+    """Several flags, or several --calendar names, make a list of systems."""
+
+    defaults["systems"] = ["discordian", "eve_real"]
+    assert _calendar_kwargs(["dateandtime", "-r", "-d"], multiple=True) == \
+        defaults
+    assert _calendar_kwargs(
+        ["dateandtime", "-r", "-c", "gregorian,eve_game,gregorian"],
+        multiple=True,
+    )["systems"] == ["gregorian", "eve_game"]
+
+
+def test_calendar_overrides_flags():
+    """A single --calendar name still overrides the flags, in any mode."""
+
+    for multiple in (True, False):
+        calendar = _calendar_kwargs(
+            ["dateandtime", "-d", "-c", "gregorian"],
+            multiple=multiple,
+        )
+        assert calendar["system"] == "gregorian"
+        assert "systems" not in calendar
+
+
+def test_several_systems_clock(capfd):
+    """main shows several calendars in one clock."""
+
+    argv = ["dateandtime", "-d", "-e"]
+    with patch.object(base.sys, "argv", argv):
+        with patch.object(base, "be_a_clock") as patched_clock:
+            base.main()
+    _, kwargs = patched_clock.call_args
+    assert kwargs["systems"] == ["discordian", "eve_game"]
+    assert not kwargs["discordian"]
+
+
+def test_several_systems_months():
+    """--months is refused with several calendars rather than ignored."""
+
+    argv = ["dateandtime", "-c", "gregorian,discordian", "-m", "3"]
+    with patch.object(base.sys, "argv", argv):
+        with patch.object(base, "be_a_clock") as patched_clock:
+            with pytest.raises(SystemExit) as error:
+                base.main()
+    assert not patched_clock.called
+    assert "--months" in str(error.value)
+
+
 def test_help_message():
     """Ensure the test message looks correct."""
 
@@ -101,6 +158,149 @@ def test_help_message():
         "Dateandtime usage:\n  dateandtime [calendar] [-h/--help]\n"
         "Alternate calendars (usage flags):\n  Discordian: [-d, --discord,"
         " --discordian, --discordianism]\n  Eve (game): [-e, --eve, --eve-"
-        "game]\n  Eve (real): [-r, --eve-real, --eve-is-real]"
+        "game]\n  Eve (real): [-r, --eve-real, --eve-is-real]\n"
+        "Options:\n  --serve [PATH]: serve frames to many panes over a socket"
+        "\n  --connect [PATH]: show frames from a --serve process"
+        "\n  --once [calendar|time]: print once and exit"
+        "\n  --stats [PATH]: record timings, to PATH or on SIGUSR1"
+        "\n  -z, --zones [ZONE,...]: also show the time in zones"
+        "\n  -c, --calendar [NAME,...]: use registered calendars"
+        "\n  --bar [i3bar|waybar]: write JSON for a status bar"
+        "\n  --events [ICS,...]: highlight days with events"
+        "\n  -m, --months [1|3|12]: show at most this many months"
+        "\n  --time-format [FORMAT]: strftime style time line"
+        "\n  --header-format [FORMAT]: strftime style tag"
     )
     assert expected == error.value.args[0]
+
+
+def test_prepare_offset_bounds():
+    """Preparation should happen well clear of both midnights."""
+
+    offsets = [base.prepare_offset(pid) for pid in range(1, 5000, 7)]
+    assert min(offsets) >= base.datetime.timedelta(hours=1)
+    assert max(offsets) < base.datetime.timedelta(hours=23)
+    assert len(set(offsets)) > 1
+
+
+def test_be_a_clock_draws_once(capfd):
+    """The test short circut should draw a single whole frame."""
+
+    be_a_clock(test=True)
+    out, _ = capfd.readouterr()
+    assert out.startswith("\033[H\033[2J")
+
+
+def test_options_are_pulled_out():
+    """Options and their values are removed from the calendar arguments."""
+
+    options, remaining = base.parse_options([
+        "dateandtime", "-d", "--serve", "/tmp/sock", "TZ=UTC",
+    ])
+    assert options["serve"] == "/tmp/sock"
+    assert options["connect"] is None
+    assert remaining == ["dateandtime", "-d", "TZ=UTC"]
+
+
+def test_option_without_value():
+    """An option followed by a flag doesn't take the flag as its value."""
+
+    options, remaining = base.parse_options(["--connect", "-e"])
+    assert options["connect"] is True
+    assert remaining == ["-e"]
+
+
+def test_no_shell_outs(capfd):
+    """main shouldn't fork a shell to hide the cursor."""
+
+    with patch.object(base.os, "system") as patched_system:
+        with patch.object(base.sys, "argv", ["dateandtime"]):
+            with patch.object(base, "be_a_clock") as patched_clock:
+                base.main()
+    assert not patched_system.called
+    patched_clock.assert_called_once_with(
+        stats=None,
+        zones=None,
+        events=None,
+        months=None,
+        discordian=False,
+        eve_game=False,
+        eve_real=False,
+    )
+
+
+def test_format_options(capfd):
+    """--time-format and --header-format are passed on to the clock."""
+
+    argv = ["dateandtime", "--time-format", "%H:%M:%S", "--header-format",
+            "%b %Y"]
+    with patch.object(base.sys, "argv", argv):
+        with patch.object(base, "be_a_clock") as patched_clock:
+            base.main()
+    _, kwargs = patched_clock.call_args
+    assert kwargs["time_format"] == "%H:%M:%S"
+    assert kwargs["header_format"] == "%b %Y"
+
+
+def test_format_options_once(capfd):
+    """--once and --bar follow the formats too."""
+
+    argv = ["dateandtime", "--once", "--time-format", "%H:%M"]
+    with patch.object(base.sys, "argv", argv):
+        with patch("dateandtime.once.once") as patched_once:
+            base.main()
+    _, kwargs = patched_once.call_args
+    assert kwargs == {"time_format": "%H:%M"}
+
+    argv = ["dateandtime", "--bar", "--time-format", "%H:%M"]
+    with patch.object(base.sys, "argv", argv):
+        with patch("dateandtime.statusbar.status_bar") as patched_bar:
+            base.main()
+    _, kwargs = patched_bar.call_args
+    assert kwargs["time_format"] == "%H:%M"
+
+
+@pytest.mark.parametrize("mode", ["--serve", "--connect", "--bar"])
+def test_format_options_refused(mode):
+    """Formats which wouldn't be followed are refused."""
+
+    argv = ["dateandtime", mode, "--header-format", "%b %Y"]
+    with patch.object(base.sys, "argv", argv):
+        with pytest.raises(SystemExit) as error:
+            base.main()
+    assert "--header-format" in str(error.value)
+
+
+def test_calendar_option():
+    """--calendar names a system, passed along with the flags."""
+
+    options, args = base.parse_options(["dateandtime", "-c", "eve_game"])
+    assert base.calendar_kwargs(options, args) == {
+        "discordian": False,
+        "eve_game": False,
+        "eve_real": False,
+        "system": "eve_game",
+    }
+
+
+def test_import_stays_lazy():
+    """Importing the entry point loads no calendar code or heavy modules.
+
+    See benchmarks/bench_startup.py for how long starting up takes.
+    """
+
+    imported = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, dateandtime.base; print(' '.join(sys.modules))",
+        ],
+        stdout=subprocess.PIPE,
+        check=True,
+    ).stdout.decode("utf-8").split()
+
+    assert "dateandtime.base" in imported
+    for lazy in ("ddate", "dateandtime.multicalendar", "dateandtime.formats",
+                 "dateandtime.layout", "dateandtime.events", "asyncio",
+                 "numpy"):
+        assert lazy not in imported
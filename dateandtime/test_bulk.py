@@ -0,0 +1,66 @@
+"""Tests for dateandtime's vectorized bulk conversions."""
+
+
+import pytest
+from ddate.base import DDate
+
+numpy = pytest.importorskip("numpy")
+
+from dateandtime import bulk  # noqa: E402
+
+
+def _every_day(start, end):
+    """Returns a datetime64[D] array of every day from start until end."""
+
+    return numpy.arange(start, end, dtype="datetime64[D]")
+
+
+def test_matches_ddate():
+    """Every day across leap and non leap years should match DDate."""
+
+    days = _every_day("1899-12-01", "2017-01-01")
+    converted = bulk.to_discordian(days)
+    for day, row in zip(days.tolist(), converted.tolist()):
+        ddate = DDate(day)
+        year, season, day_of_season, weekday, st_tibs = row
+        assert year == ddate.year
+        assert st_tibs == (ddate.holiday == "St. Tib's Day")
+        if st_tibs:
+            assert (season, day_of_season, weekday) == (-1, -1, -1)
+        else:
+            assert season == ddate.season
+            assert day_of_season == ddate.day_of_season
+            assert weekday == ddate.day_of_week
+
+
+def test_any_datetime_unit():
+    """Timestamps finer than a day are floored to their day."""
+
+    stamps = numpy.array(["2016-02-29T23:59:59", "2016-03-01T00:00:00"],
+                         dtype="datetime64[s]")
+    converted = bulk.to_discordian(stamps)
+    assert converted["st_tibs"].tolist() == [True, False]
+    assert converted["day_of_season"].tolist() == [-1, 60]
+
+
+def test_shape_is_kept():
+    """Multidimensional input gives multidimensional output."""
+
+    days = _every_day("2014-01-01", "2014-01-07").reshape(2, 3)
+    assert bulk.to_discordian(days).shape == (2, 3)
+    assert bulk.to_eve(days).shape == (2, 3)
+
+
+def test_eve_years():
+    """EVE years match MultiCalendar's inline math."""
+
+    converted = bulk.to_eve(numpy.array(["2014-06-01"], dtype="datetime64"))
+    assert converted["real"].tolist() == [23236 + (2014 - 1898)]
+    assert converted["game"].tolist() == [2014 - 1898]
+
+
+def test_rejects_non_dates():
+    """Plain integers aren't dates."""
+
+    with pytest.raises(TypeError):
+        bulk.to_discordian(numpy.arange(3))
@@ -0,0 +1,91 @@
+"""Tests for dateandtime's LRU cache and cache directory."""
+
+
+import os
+import stat
+
+from mock import patch
+
+from dateandtime.cache import LRUCache, user_cache_dir
+
+
+def test_miss_then_hit():
+    """The factory is only called on a miss."""
+
+    cache = LRUCache()
+    calls = []
+    assert cache.get("key", lambda: calls.append(1) or "value") == "value"
+    assert cache.get("key", lambda: calls.append(1) or "other") == "value"
+    assert calls == [1]
+    assert cache.info() == {"hits": 1, "misses": 1, "size": 1, "maxsize": 32}
+
+
+def test_least_recently_used_is_dropped():
+    """Going over maxsize drops the entry used longest ago."""
+
+    cache = LRUCache(maxsize=2)
+    cache.get("a", lambda: 1)
+    cache.get("b", lambda: 2)
+    cache.get("a", lambda: 1)
+    cache.get("c", lambda: 3)
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert len(cache) == 2
+
+
+def test_resize():
+    """Shrinking the cache trims the oldest entries."""
+
+    cache = LRUCache(maxsize=5)
+    for key in range(5):
+        cache.get(key, lambda: key)
+    cache.resize(2)
+    assert len(cache) == 2
+    assert 3 in cache and 4 in cache
+
+
+def test_clear_resets_counters():
+    """Clearing drops entries and the hit/miss counts."""
+
+    cache = LRUCache()
+    cache.get("a", lambda: 1)
+    cache.get("a", lambda: 1)
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hits == cache.misses == 0
+
+
+def test_user_cache_dir(tmpdir, monkeypatch):
+    """The cache directory is made under $XDG_CACHE_HOME, private."""
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmpdir))
+    path = user_cache_dir()
+    assert path == str(tmpdir.join("dateandtime"))
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o700
+
+
+def test_user_cache_dir_made_private(tmpdir, monkeypatch):
+    """An existing directory open to others is closed up first."""
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmpdir))
+    tmpdir.mkdir("dateandtime").chmod(0o777)
+    path = user_cache_dir()
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o700
+
+
+def test_user_cache_dir_not_ours(tmpdir, monkeypatch):
+    """A directory someone else owns is never used."""
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmpdir))
+    tmpdir.mkdir("dateandtime")
+    with patch("os.getuid", return_value=os.getuid() + 1):
+        assert user_cache_dir() is None
+
+
+def test_user_cache_dir_symlink(tmpdir, monkeypatch):
+    """A link planted in place of the directory is never followed."""
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmpdir))
+    tmpdir.join("dateandtime").mksymlinkto(tmpdir.mkdir("elsewhere"))
+    assert user_cache_dir() is None
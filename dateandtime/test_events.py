@@ -0,0 +1,215 @@
+"""Tests for dateandtime's iCalendar event overlay."""
+
+
+import os
+import random
+import datetime
+
+from mock import patch
+
+from dateandtime import events
+from dateandtime.ansi import ANSI
+from dateandtime.grid import EVENT, TODAY, MonthGrid
+from dateandtime.multicalendar import MultiCalendar
+
+
+ICS = """BEGIN:VCALENDAR
+VERSION:2.0
+BEGIN:VEVENT
+SUMMARY:Conference
+DTSTART;VALUE=DATE:20140310
+DTEND;VALUE=DATE:20140313
+END:VEVENT
+BEGIN:VEVENT
+SUMMARY:Standup
+DTSTART:20140303T093000
+DTEND:20140303T094500
+RRULE:FREQ=WEEKLY;BYDAY=MO,TH;UNTIL=20140331T000000Z
+BEGIN:VALARM
+TRIGGER:-PT15M
+END:VALARM
+END:VEVENT
+BEGIN:VEVENT
+SUMMARY:Rent
+DTSTART;VALUE=DATE:20140131
+RRULE:FREQ=MONTHLY
+END:VEVENT
+BEGIN:VEVENT
+SUMMARY:Leap party
+DTSTART;VALUE=DATE:20120229
+RRULE:FREQ=YEARLY;COUNT=3
+END:VEVENT
+BEGIN:VEVENT
+SUMMARY:Cancelled
+DTSTART;VALUE=DATE:20140301
+STATUS:CANCELLED
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+def _days(index, year, month):
+    """Returns the sorted days of a month with events."""
+
+    first = datetime.date(year, month, 1).toordinal()
+    last = first + events.month_length(year, month) - 1
+    return sorted(day - first + 1 for day in index.days(first, last))
+
+
+def test_parse_and_recurrences():
+    """Spans, weekly, monthly and yearly series land on the right days."""
+
+    index = events.EventIndex(*events.parse(ICS))
+    assert len(index) == 4
+    assert _days(index, 2014, 3) == [3, 6, 10, 11, 12, 13, 17, 20, 24, 27, 31]
+    # no 31st in April, the standup has ended
+    assert _days(index, 2014, 4) == []
+    assert _days(index, 2014, 5) == [31]
+
+
+def test_yearly_count_skips_missing_days():
+    """February 29th only happens in leap years, COUNT ends the series."""
+
+    index = events.EventIndex(*events.parse(ICS))
+    assert _days(index, 2016, 2) == [29]
+    assert _days(index, 2020, 2) == [29]
+    assert _days(index, 2024, 2) == []
+    assert _days(index, 2015, 2) == []
+
+
+def test_index_matches_brute_force():
+    """Overlap lookups find exactly the overlapping intervals."""
+
+    generator = random.Random(19)
+    intervals = []
+    for _ in range(2000):
+        start = generator.randrange(730000, 740000)
+        intervals.append((start, start + generator.randrange(400), -1))
+    index = events.EventIndex(intervals)
+
+    for _ in range(200):
+        first = generator.randrange(729000, 741000)
+        last = first + generator.randrange(60)
+        expected = set()
+        for start, end, _ in intervals:
+            expected.update(range(max(start, first), min(end, last) + 1))
+        assert index.days(first, last) == expected
+
+
+def test_dumps_round_trip():
+    """A loaded index answers like the one it was dumped from."""
+
+    index = events.EventIndex(*events.parse(ICS))
+    loaded = events.EventIndex.loads(index.dumps())
+    assert loaded.tree == index.tree
+    assert loaded.rules == index.rules
+    assert _days(loaded, 2014, 3) == _days(index, 2014, 3)
+    assert len(events.EventIndex.loads(events.EventIndex().dumps())) == 0
+
+
+def test_cache_and_poll(tmpdir):
+    """Files are parsed once per version, and reloaded when they change."""
+
+    path = tmpdir.join("calendar.ics")
+    path.write(ICS)
+    cache = str(tmpdir.join("cache"))
+
+    overlay = events.EventOverlay([str(path)], cache=cache)
+    with patch.object(events, "parse") as patched:
+        assert not overlay.poll()
+        events.EventOverlay([str(path)], cache=cache)
+    assert not patched.called
+
+    path.write(ICS.replace("20140310", "20140308"))
+    os.utime(str(path), (0, 0))
+    assert overlay.poll()
+    first = datetime.date(2014, 3, 8).toordinal()
+    assert first in overlay.days(first, first)
+
+
+MALFORMED = """\
+BEGIN:VCALENDAR
+BEGIN:VEVENT
+DTSTART;VALUE=DATE:20140301
+DURATION:-P1D
+END:VEVENT
+BEGIN:VEVENT
+DTSTART:2016XX01
+END:VEVENT
+BEGIN:VEVENT
+DTSTART;VALUE=DATE:20141301
+END:VEVENT
+BEGIN:VEVENT
+DTSTART;VALUE=DATE:20140305
+RRULE:FREQ=DAILY;COUNT=many
+END:VEVENT
+BEGIN:VEVENT
+DTSTART;VALUE=DATE:20140320
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+def test_malformed_events_skipped():
+    """Events we can't read are skipped, the rest of the file isn't."""
+
+    index = events.EventIndex(*events.parse(MALFORMED))
+    assert _days(index, 2014, 3) == [20]
+
+
+def test_poll_keeps_last_good_index(tmpdir):
+    """A file which fails to load keeps showing its last good index."""
+
+    path = tmpdir.join("calendar.ics")
+    path.write(ICS)
+    overlay = events.EventOverlay([str(path)], cache=str(tmpdir.join("c")))
+    first = datetime.date(2014, 3, 10).toordinal()
+    assert first in overlay.days(first, first)
+
+    path.write(MALFORMED + " ")
+    with patch.object(events, "parse", side_effect=ValueError):
+        assert not overlay.poll()
+    assert first in overlay.days(first, first)
+
+
+def test_default_cache(tmpdir, monkeypatch):
+    """Indexes are cached in user_cache_dir, not in a shared directory."""
+
+    monkeypatch.delenv("DATEANDTIME_EVENTS_CACHE", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmpdir.join("xdg")))
+    path = tmpdir.join("calendar.ics")
+    path.write(ICS)
+
+    events.load(str(path))
+    cache = tmpdir.join("xdg", "dateandtime", "events")
+    assert len(cache.listdir()) == 1
+
+
+def test_grid_event_state():
+    """Event days get their own style, except for today."""
+
+    month = MonthGrid(7, 6, 31, 28, today=12, context=0, events=(3, 12))
+    assert month.states[6 + 2] == EVENT
+    assert month.states[6 + 11] == TODAY
+
+
+def test_calendar_highlights_events():
+    """Discordian days are found through the season's Gregorian ordinals."""
+
+    overlay = events.EventOverlay([])
+    overlay.indexes["test"] = events.EventIndex(*events.parse(ICS))
+    # Discord 3180 runs from March 15th to May 26th 2014
+    day = datetime.date(2014, 4, 20)
+    cal = MultiCalendar(discordian=True, date=day, now=day, events=overlay)
+    assert cal.event_days == (3, 6, 10, 13, 17)
+    assert ANSI.EVENT in "".join(cal.calendar_lines())
+
+
+def test_st_tibs_events():
+    """Events on St. Tib's Day aren't on any day of Chaos."""
+
+    overlay = events.EventOverlay([])
+    overlay.indexes["test"] = events.EventIndex(*events.parse(ICS))
+    day = datetime.date(2016, 3, 1)
+    cal = MultiCalendar(discordian=True, date=day, now=day, events=overlay)
+    assert cal.event_days == (31,)
@@ -0,0 +1,119 @@
+"""Tests for dateandtime's bulk export."""
+
+
+import json
+from concurrent.futures import Future
+
+import pytest
+
+from dateandtime import export
+from dateandtime.ansi import ANSI
+from dateandtime.sink import BufferSink
+
+
+def _export(*args, **kwargs):
+    """Returns the output of an export, as a string."""
+
+    sink = BufferSink()
+    export.export(*args, sink=sink, **kwargs)
+    return sink.getvalue()
+
+
+def test_text_has_no_colour():
+    """Plain text is the calendars without any escape codes."""
+
+    output = _export(2014, 2014, jobs=1)
+    assert "\033" not in output
+    assert output.startswith("    January 2014    \n")
+    assert output.count("Su Mo Tu We Th Fr Sa") == 12
+
+
+def test_ansi_nothing_highlighted():
+    """ANSI output keeps the other month colours, but no today or past."""
+
+    output = _export(2014, 2014, "discordian", "ansi", jobs=1)
+    assert ANSI.OTHERMONTH in output
+    assert ANSI.TODAY not in output
+    assert ANSI.PAST not in output
+    assert output.count("Sw Bo Pu Pr Se") == 5
+
+
+def test_json_lines():
+    """Each month is a JSON object on its own line."""
+
+    months = [
+        json.loads(line)
+        for line in _export(2016, 2016, "eve_game", "json", jobs=1).split("\n")
+        if line
+    ]
+    assert len(months) == 12
+    assert months[1]["month"] == "February"
+    assert months[1]["year"] == "YC 118"
+    assert months[1]["weeks"][0] == [None, 1, 2, 3, 4, 5, 6]
+    assert months[1]["weeks"][-1][1] == 29
+
+
+def test_ics_days():
+    """Every day is an all day event, St. Tib's Day included."""
+
+    output = _export(2016, 2016, "discordian", "ics", jobs=1)
+    assert output.startswith("BEGIN:VCALENDAR\r\n")
+    assert output.endswith("END:VCALENDAR\r\n")
+    assert output.count("BEGIN:VEVENT") == 366
+    assert "SUMMARY:St. Tib's Day\\, 3182\r\n" in output
+    assert "DTSTART;VALUE=DATE:20160301\r\nSUMMARY:Chaos 60\\, 3182" in output
+
+
+def test_pool_matches_serial():
+    """Chunks rendered by the pool come out in order."""
+
+    serial = _export(2010, 2015, "discordian", jobs=1)
+    pooled = _export(2010, 2015, "discordian", jobs=2, chunk=2)
+    assert pooled == serial
+
+
+def test_closing_early_cancels():
+    """Tasks still waiting for a worker are cancelled when we stop early."""
+
+    submitted = []
+
+    class _Executor(object):
+        def submit(self, func, *args):
+            future = Future()
+            if not submitted:
+                future.set_result("first")
+            submitted.append(future)
+            return future
+
+    results = export._in_order(_Executor(), [()] * 4, 2)
+    assert next(results) == "first"
+    results.close()
+    assert [future.cancelled() for future in submitted] == [
+        False, True, True,
+    ]
+
+
+def test_bad_requests():
+    """Unknown formats and empty ranges exit before rendering anything."""
+
+    with pytest.raises(SystemExit):
+        _export(2014, 2014, fmt="pdf")
+    with pytest.raises(SystemExit):
+        _export(2015, 2014)
+
+
+def test_main_options(capfd):
+    """The command line picks the calendar, format and range."""
+
+    export.main(["2016", "-d", "--format", "json", "-j", "1"])
+    out, _ = capfd.readouterr()
+    assert len(out.splitlines()) == 5
+    assert json.loads(out.splitlines()[0])["system"] == "discordian"
+
+
+def test_main_usage():
+    """Without years, the usage is shown."""
+
+    with pytest.raises(SystemExit) as error:
+        export.main(["-d"])
+    assert "dateandtime export START [END]" in error.value.args[0]
@@ -0,0 +1,117 @@
+"""Tests for dateandtime's compiled time and tag line formats."""
+
+
+import datetime
+
+import pytest
+
+from dateandtime import formats
+
+
+DAY = datetime.date(2015, 12, 31)
+
+
+def test_default_time_format():
+    """Every minute of the default format matches strftime's."""
+
+    time_format = formats.time_format()
+    start = datetime.datetime(2014, 3, 15)
+    for minute in range(1440):
+        now = start + datetime.timedelta(minutes=minute)
+        assert time_format.line(now, 20) == "{0}:{1} {2}".format(
+            int(now.strftime("%I")),
+            now.strftime("%M"),
+            now.strftime("%p").lower(),
+        ).center(20, " ")
+
+
+@pytest.mark.parametrize("fmt", [
+    "%H:%M:%S",
+    "%I:%M %p",
+    "%a %d %b %Y %H:%M",
+    "%A %B %m/%y day %j",
+    "%G-W%V-%u %H%M%S",
+    "100%% %H",
+])
+def test_matches_strftime(fmt):
+    """Directives strftime also has give the same text."""
+
+    time_format = formats.time_format(fmt)
+    for now in (
+            datetime.datetime(2015, 12, 31, 23, 59, 59),
+            datetime.datetime(2016, 1, 1, 0, 0, 0),
+            datetime.datetime(2016, 2, 29, 12, 30, 7),
+    ):
+        assert time_format.line(now) == now.strftime(fmt)
+
+
+def test_seconds_centered():
+    """Seconds are joined into a line centered ahead of time."""
+
+    time_format = formats.time_format("%H:%M:%S")
+    assert time_format.seconds
+    now = datetime.datetime(2014, 3, 15, 9, 5, 3)
+    assert time_format.line(now, 14) == "   09:05:03   "
+
+
+def test_tables_are_reused():
+    """Ticks on the same day and width share one table."""
+
+    time_format = formats.time_format("%H:%M %d")
+    table = time_format.table(DAY, 20)
+    assert time_format.table(DAY, 20) is table
+    assert time_format.table(DAY + datetime.timedelta(days=1), 20) \
+        is not table
+    assert formats.time_format("%H:%M %d") is time_format
+
+
+def test_tables_per_width():
+    """Clocks of different widths sharing a format don't rebuild tables."""
+
+    time_format = formats.time_format("%H:%M")
+    narrow = time_format.table(None, 14)
+    wide = time_format.table(None, 20)
+    unpadded = time_format.table()
+    assert time_format.table(None, 14) is narrow
+    assert time_format.table(None, 20) is wide
+    assert time_format.table() is unpadded
+    assert narrow is not wide
+
+
+def test_longest():
+    """The longest line is found across hours, names and seconds."""
+
+    assert formats.time_format().longest() == len("12:00 am")
+    assert formats.time_format("%H:%M:%S").longest() == 8
+    assert formats.time_format("%A %-d %B").longest() == len(
+        "Wednesday 30 September",
+    )
+
+
+def test_unknown_directive():
+    """Directives we don't know are refused up front."""
+
+    with pytest.raises(SystemExit) as error:
+        formats.time_format("%H:%Q")
+    assert "%Q" in str(error.value)
+    with pytest.raises(SystemExit):
+        formats.header_format("%H")
+
+
+@pytest.mark.parametrize("month, year, width, expected", [
+    ("March", 2014, 20, "     March 2014     "),
+    ("Bureaucracy", 3180, 14, "Bureaucra 3180"),
+    ("The Aftermath", 3180, 14, "Aftermath 3180"),
+    ("September", "YC 116", 14, "Septemb YC 116"),
+])
+def test_default_header(month, year, width, expected):
+    """The default tag line shortens the month to fit."""
+
+    assert formats.header_format()(month, year, width) == expected
+
+
+def test_custom_header():
+    """Tag lines follow their format, the month abbreviated with %b."""
+
+    header = formats.header_format("%b '%Y")
+    assert header("December", 2014, 12) == " Dec '2014  "
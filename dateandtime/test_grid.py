@@ -0,0 +1,55 @@
+"""Tests for dateandtime's month grid model."""
+
+
+from dateandtime import grid
+from dateandtime.ansi import ANSI
+
+
+def test_layout():
+    """Days are laid out after the previous month's overflow."""
+
+    # March 2014 starts on a Saturday, February had 28 days
+    month = grid.MonthGrid(7, 6, 31, 28)
+    assert month.weeks == 6
+    assert month.days[:7].tolist() == [23, 24, 25, 26, 27, 28, 1]
+    assert month.days[-7:].tolist() == [30, 31, 1, 2, 3, 4, 5]
+    assert month.states[:6].tolist() == [grid.OTHERMONTH] * 6
+    assert month.states[-5:].tolist() == [grid.OTHERMONTH] * 5
+
+
+def test_exact_fit():
+    """A month filling its weeks has no overflow at all."""
+
+    # February 2015 starts on a Sunday and has 28 days
+    month = grid.MonthGrid(7, 0, 28, 31)
+    assert month.weeks == 4
+    assert grid.OTHERMONTH not in month.states
+
+
+def test_today_and_past():
+    """Days before today are past, today is highlighted."""
+
+    month = grid.MonthGrid(5, 0, 73, 73, today=3, context=0)
+    assert month.states[:4].tolist() == [
+        grid.PAST, grid.PAST, grid.TODAY, grid.CURRENT,
+    ]
+
+
+def test_context():
+    """Past months are all past, future months have nothing highlighted."""
+
+    past = grid.MonthGrid(5, 0, 73, 73, today=3, context=-1)
+    future = grid.MonthGrid(5, 0, 73, 73, today=3, context=1)
+    assert set(past.states) == set([grid.PAST, grid.OTHERMONTH])
+    assert set(future.states) == set([grid.CURRENT, grid.OTHERMONTH])
+
+
+def test_styles_only_on_change():
+    """Serialization only emits a style where it changes."""
+
+    lines = grid.MonthGrid(5, 2, 73, 73, today=2, context=0).lines()
+    assert lines[0] == "{0}72 73 {1} 1 {2} 2 {3} 3".format(
+        ANSI.OTHERMONTH, ANSI.PAST, ANSI.TODAY, ANSI.END,
+    )
+    assert lines[1] == " 4  5  6  7  8"
+    assert lines[-1] == "69 70 71 72 73"
@@ -0,0 +1,165 @@
+"""Tests for dateandtime's multi-month terminal layout."""
+
+
+import datetime
+
+import mock
+import pytest
+
+from dateandtime import layout
+from dateandtime.ansi import ANSI
+from dateandtime.renderer import FrameRenderer, SGR
+from dateandtime.systems import get_system
+
+
+DAY = datetime.date(2014, 3, 15)
+
+
+def _layout(columns, rows, months=None):
+    """Returns a MonthLayout for a terminal of columns by rows."""
+
+    return layout.MonthLayout(months, size=lambda: (columns, rows))
+
+
+def test_panel_is_self_contained():
+    """Every panel line restates its style, ends it and pads to width."""
+
+    block = ("{0}a b".format(ANSI.PAST), "c d", "{0}e".format(ANSI.END))
+    lines = layout.panel(block, 6)
+    assert lines[1] == "{0}c d{1}   ".format(ANSI.PAST, ANSI.END)
+    assert [len(SGR.sub("", line)) for line in lines] == [6, 6, 6]
+
+
+def test_compose_side_by_side():
+    """Blocks sit per_row side by side, short ones padded out."""
+
+    lines = layout.compose([("ab",), ("cd", "ef"), ("gh",)], 2, 2, gap=1)
+    assert [SGR.sub("", line) for line in lines] == [
+        "ab cd",
+        "   ef",
+        "gh",
+    ]
+
+
+@pytest.mark.parametrize("size, months, expected", [
+    ((80, 24), None, (3, 3)),
+    ((40, 40), None, (3, 1)),
+    ((80, 50), None, (12, 3)),
+    ((200, 50), 3, (3, 3)),
+    ((20, 10), None, (1, 1)),
+])
+def test_choose(size, months, expected):
+    """As many months as fit are shown, up to the most asked for."""
+
+    month_layout = _layout(*size, months=months)
+    assert month_layout.choose(get_system("gregorian"), 9) == expected
+
+
+def test_compose_one_month():
+    """A single month is calendar_for_day's lines, unchanged."""
+
+    from dateandtime.multicalendar import calendar_for_day
+
+    calendar, lines, width = _layout(20, 24).compose(DAY)
+    assert lines == calendar_for_day(DAY, False, False, False)[1]
+    assert width == 20 == calendar.max_width
+
+
+def test_compose_three_months():
+    """Three months are the previous, current and next, side by side."""
+
+    calendar, lines, width = _layout(80, 24).compose(DAY)
+    assert width == 64
+    assert SGR.sub("", lines[0]).split() == [
+        "February", "2014", "March", "2014", "April", "2014",
+    ]
+    assert sum(ANSI.TODAY in line for line in lines) == 1
+    assert len(calendar.time_line(datetime.datetime(2014, 3, 15, 12), width)) \
+        == width
+
+
+def test_compose_year():
+    """Twelve months are the system's year, in rows."""
+
+    _, lines, _ = _layout(200, 50).compose(DAY)
+    headers = " ".join(SGR.sub("", line) for line in lines if "2014" in line)
+    for name in ("January", "June", "December"):
+        assert name in headers
+    assert "2013" not in headers and "2015" not in headers
+
+
+def test_compose_discordian_year():
+    """A Discordian year is its five seasons."""
+
+    _, lines, width = _layout(200, 50).compose(DAY, discordian=True)
+    assert width == 5 * 14 + 4 * layout.GAP
+    assert SGR.sub("", lines[0]).split() == [
+        "Chaos", "3180", "Discord", "3180", "Confusion", "3180",
+        "Bureaucra", "3180", "Aftermath", "3180",
+    ]
+
+
+def test_resize_interrupts_sleep():
+    """A resize during a sleep raises Resized out of it."""
+
+    month_layout = _layout(80, 24)
+    with pytest.raises(layout.Resized):
+        with month_layout.sleeping():
+            month_layout._on_resize(None, None)
+    assert not month_layout.asleep
+
+
+def test_resize_before_sleep():
+    """A resize between sleeps cuts the next one short."""
+
+    month_layout = _layout(80, 24)
+    month_layout._on_resize(None, None)
+    assert month_layout.resized and not month_layout.asleep
+    with pytest.raises(layout.Resized):
+        with month_layout.sleeping():
+            pass
+
+
+def test_renderer_reset():
+    """After a reset, the whole frame is drawn again."""
+
+    sink = mock.Mock()
+    renderer = FrameRenderer(sink=sink)
+    renderer.render(["abc"])
+    assert renderer.render(["abc"]) == 0
+    renderer.reset()
+    assert renderer.render(["abc"]) > 0
+
+
+def test_compose_systems():
+    """Each system's month sits next to the others, today in each."""
+
+    calendar, lines, width = _layout(80, 24).compose_systems(
+        DAY,
+        ["gregorian", "discordian", "eve_game"],
+    )
+    assert calendar.system.name == "gregorian"
+    assert width == 20 + 14 + 20 + 2 * layout.GAP
+    assert SGR.sub("", lines[0]).split() == [
+        "March", "2014", "Discord", "3180", "March", "YC", "116",
+    ]
+    assert sum(line.count(ANSI.TODAY) for line in lines) == 3
+    assert max(len(SGR.sub("", line)) for line in lines) == width
+
+
+def test_compose_systems_stacked():
+    """Systems which don't fit next to each other start a new row."""
+
+    _, lines, width = _layout(40, 24).compose_systems(
+        DAY,
+        ["gregorian", "discordian", "eve_real"],
+    )
+    assert width == 20 + 14 + layout.GAP
+    headers = [
+        SGR.sub("", line).split() for line in lines
+        if "2014" in line or "23352" in line
+    ]
+    assert headers == [
+        ["March", "2014", "Discord", "3180"],
+        ["March", "23352"],
+    ]
@@ -25,12 +25,19 @@ def cal(request):
     return request.param
 
 
+@pytest.fixture(autouse=True)
+def empty_caches():
+    """Start and finish every test without any cached months."""
+
+    multicalendar.BLOCK_CACHE.clear()
+    yield
+    multicalendar.BLOCK_CACHE.clear()
+
+
 def test_discordian_settings():
     """Verify settings for using Discordian calendar."""
 
-    with patch.object(multicalendar, "discordian_calendar") as patched_cal:
-        disco = multicalendar.MultiCalendar(discordian=True)
-    patched_cal.assert_called_once_with(disco.date)
+    disco = multicalendar.MultiCalendar(discordian=True)
     assert disco.discordian
     assert disco.max_width == 14
     assert isinstance(disco.date, DDate)
@@ -46,10 +53,7 @@ def test_discordian_settings():
 def test_normal_settings():
     """Verify settings for normal calendar."""
 
-    patchcal = patch.object(multicalendar.calendar.TextCalendar, "formatmonth")
-    with patchcal as patched_cal:
-        normal = multicalendar.MultiCalendar()
-    patched_cal.assert_called_once_with(normal.date.year, normal.date.month)
+    normal = multicalendar.MultiCalendar()
     assert isinstance(normal.date, datetime.datetime)
     assert normal.max_width == 20
     assert normal.month == normal.date.strftime("%B")
@@ -128,45 +132,6 @@ def test_print_spaces(cal, capfd):
     assert len(out.splitlines()) == 420
 
 
-@pytest.mark.format_line
-def test_full_line(cal):
-    """Ensure full lines are passed back."""
-
-    preformat = [int(x) for x in range(len(cal.weekday_abbrs), 1)]
-    assert cal.format_line(preformat) == " ".join(preformat)
-
-
-@pytest.mark.format_line
-def test_calling_last_days(cal):
-    """Ensure we call the function to get the last days of last month."""
-
-    preformat = [int(x) for x in range(len(cal.weekday_abbrs) - 1, 1)]
-    with patch.object(cal, "get_last_days_of_last_month") as patch_last:
-        cal.format_line(preformat)
-    patch_last.assert_called_once_with(preformat)
-
-
-@pytest.mark.format_line
-def test_calling_next_days(cal):
-    """Ensure we call the function to get the next days of next month."""
-
-    preformat = cal.ending_days[-2:]
-    with patch.object(cal, "get_next_days_of_next_month") as patch_next:
-        cal.format_line(preformat)
-    patch_next.assert_called_once_with(preformat)
-
-
-@pytest.mark.format_line
-def test_parse_out_ansi_end(cal):
-    """Ensure we've accounted for the ANSI.END sequence."""
-
-    preformat = ["5", "6", "7", "{0}{1}".format(
-        cal.ending_days[-1], multicalendar.ANSI.END)]
-    with patch.object(cal, "get_next_days_of_next_month") as patch_next:
-        cal.format_line(preformat)
-    patch_next.assert_called_once_with(preformat)
-
-
 def test_print_time(cal, capfd):
     """Ensure we're printing the time correctly."""
 
@@ -185,26 +150,106 @@ def test_print_time(cal, capfd):
     assert out[-1] == " "  # don't end with a newline...
 
 
-def test_getting_last_days():
-    """We should try from 31 down to get the last days of last month."""
-
-    def _ansi_wrapped(day):
-        return "{0}{1}{2}".format(
-            multicalendar.ANSI.OTHERMONTH,
-            day,
-            multicalendar.ANSI.END,
-        )
-
-    cal = multicalendar.MultiCalendar(date=datetime.datetime(2014, 3, 1))
-    fake_line = ["1", "2", "3"]
-    returned = cal.get_last_days_of_last_month(fake_line)
-    expected = [
-        _ansi_wrapped(25),
-        _ansi_wrapped(26),
-        _ansi_wrapped(27),
-        _ansi_wrapped(28),
-        "1",
-        "2",
-        "3",
-    ]
-    assert returned == expected
+def test_blocks_are_cached():
+    """A second identical calendar should be served from the caches."""
+
+    date = datetime.datetime(2014, 3, 12)
+    first = multicalendar.MultiCalendar(date=date, now=date)
+    first_lines = first.calendar_lines()
+
+    with patch.object(multicalendar.MultiCalendar, "_format_block") as patched:
+        second = multicalendar.MultiCalendar(date=date, now=date)
+        assert second.calendar_lines() == first_lines
+    assert not patched.called
+    assert multicalendar.BLOCK_CACHE.hits == 1
+
+
+def test_block_cache_keys_on_highlight():
+    """Highlighting a different day is a different block."""
+
+    first = datetime.datetime(2014, 3, 12)
+    second = datetime.datetime(2014, 3, 13)
+    lines = multicalendar.MultiCalendar(date=first, now=first).calendar_lines()
+    assert multicalendar.MultiCalendar(
+        date=second,
+        now=second,
+    ).calendar_lines() != lines
+    assert multicalendar.BLOCK_CACHE.misses == 2
+
+
+def test_calendar_for_day():
+    """Tomorrow's calendar can be built today, highlighting tomorrow."""
+
+    tomorrow = datetime.date(2014, 4, 1)
+    cal, lines = multicalendar.calendar_for_day(tomorrow)
+    assert cal.context == 0
+    assert "{0} 1 ".format(multicalendar.ANSI.TODAY) in "\n".join(lines)
+    assert multicalendar.BLOCK_CACHE.misses == 1
+
+
+def test_calendar_for_day_discordian():
+    """Discordian days are converted before building the calendar."""
+
+    cal, lines = multicalendar.calendar_for_day(
+        datetime.date(2014, 4, 20),
+        discordian=True,
+    )
+    assert isinstance(cal.date, DDate)
+    assert cal.day_of_month == 37
+    assert cal.context == 0
+    assert "Discord 3180" in lines[0]
+
+
+@pytest.mark.parametrize("system", [
+    "gregorian", "discordian", "eve_game", "eve_real",
+])
+def test_iter_months_matches_calendars(system):
+    """Streamed months are the same blocks MultiCalendar formats."""
+
+    start = datetime.date(2015, 11, 3)
+    end = datetime.date(2017, 1, 1)
+    lines = list(multicalendar.iter_months(start, end, system))
+
+    months = list(multicalendar.month_starts(
+        start,
+        end,
+        multicalendar.get_system(system),
+    ))
+    assert len(months) == (7 if system == "discordian" else 15)
+
+    expected = []
+    for first in months:
+        expected.extend(multicalendar.MultiCalendar(
+            system=system,
+            date=first,
+            now=first,
+            highlight=False,
+        ).calendar_lines())
+    assert lines == expected
+
+
+@pytest.mark.parametrize("system", [
+    "gregorian", "discordian", "eve_game", "eve_real",
+])
+def test_iter_months_highlights(system):
+    """With now, its day is highlighted like calendar_for_day's."""
+
+    today = datetime.date(2016, 3, 20)
+    lines = list(multicalendar.iter_months(today, today, system, now=today))
+    assert lines == multicalendar.calendar_for_day(today, system=system)[1]
+
+
+def test_iter_grids_shares_layouts():
+    """Each month's layout follows on from the last, across years."""
+
+    system = multicalendar.get_system("gregorian")
+    grids = multicalendar.iter_grids(
+        datetime.date(1999, 1, 1),
+        datetime.date(2001, 12, 1),
+    )
+    for day, grid in grids:
+        first_weekday, length, previous_length = system.layout(day)
+        assert grid.days[first_weekday] == 1
+        assert grid.days[first_weekday + length - 1] == length
+        if first_weekday:
+            assert grid.days[first_weekday - 1] == previous_length
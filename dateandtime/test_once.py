@@ -0,0 +1,141 @@
+"""Tests for dateandtime's one shot mode and its mmap cache."""
+
+
+import os
+import sys
+import datetime
+import subprocess
+
+import pytest
+from mock import patch
+
+from dateandtime import once
+
+
+NOW = datetime.datetime(2014, 3, 12, 21, 5)
+CALENDAR = {"discordian": False, "eve_game": False, "eve_real": False}
+
+
+@pytest.fixture
+def cache_path(tmpdir):
+    """A cache file path which doesn't exist yet."""
+
+    return str(tmpdir.join("once"))
+
+
+def test_cold_then_cached(cache_path, capfd):
+    """The first call renders and caches, the second only reads."""
+
+    once.once(CALENDAR, now=NOW, path=cache_path)
+    cold, _ = capfd.readouterr()
+    assert os.path.exists(cache_path)
+
+    with patch.object(once, "render_payload") as patched_render:
+        once.once(CALENDAR, now=NOW, path=cache_path)
+    cached, _ = capfd.readouterr()
+
+    assert not patched_render.called
+    assert cached == cold
+    assert "March 2014" in cached
+    assert cached.endswith("9:05 pm".center(20) + "\n")
+
+
+def test_key_change_regenerates(cache_path, capfd):
+    """A new day or different flags replace the cache."""
+
+    once.once(CALENDAR, now=NOW, path=cache_path)
+    once.once(CALENDAR, now=NOW + datetime.timedelta(days=30), path=cache_path)
+    out, _ = capfd.readouterr()
+    assert "April 2014" in out
+
+    eve = dict(CALENDAR, eve_game=True)
+    once.once(eve, now=NOW, path=cache_path)
+    out, _ = capfd.readouterr()
+    assert "YC 116" in out
+    with open(cache_path, "rb") as cache_file:
+        assert cache_file.read().startswith(once.cache_key(NOW.date(), eve))
+
+
+def test_time_only(cache_path, capfd):
+    """The time line is printed without its centering."""
+
+    once.once(CALENDAR, "time", now=NOW, path=cache_path)
+    out, _ = capfd.readouterr()
+    assert out == "9:05 pm\n"
+
+
+def test_formats(cache_path, capfd):
+    """The formats are followed, and the tag line's is part of the key."""
+
+    once.once(CALENDAR, now=NOW, path=cache_path)
+    capfd.readouterr()
+    once.once(CALENDAR, now=NOW, path=cache_path, time_format="%H:%M",
+              header_format="%b %Y")
+    out, _ = capfd.readouterr()
+    assert "Mar 2014" in out
+    assert out.endswith("21:05".center(20) + "\n")
+
+
+def test_time_of_day_matches_multicalendar():
+    """The cached path formats time the same as MultiCalendar."""
+
+    from dateandtime.multicalendar import MultiCalendar
+
+    cal = MultiCalendar()
+    for hour in range(24):
+        now = NOW.replace(hour=hour, minute=hour * 2)
+        assert once.time_of_day(now, cal.max_width) == cal.time_line(now)
+
+
+def test_bad_mode(cache_path):
+    """Only calendar and time can be printed."""
+
+    with pytest.raises(SystemExit):
+        once.once(CALENDAR, "weather", now=NOW, path=cache_path)
+
+
+def test_default_cache(tmpdir, monkeypatch):
+    """Without $DATEANDTIME_ONCE_CACHE the cache is in user_cache_dir."""
+
+    monkeypatch.delenv("DATEANDTIME_ONCE_CACHE", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmpdir))
+    assert once.default_cache() == str(tmpdir.join("dateandtime", "once"))
+
+
+def test_no_private_cache(capfd):
+    """With nowhere private to cache, the calendar is still printed."""
+
+    with patch.object(once, "default_cache", return_value=None):
+        with patch.object(once, "write_cache") as patched_write:
+            once.once(CALENDAR, now=NOW)
+    out, _ = capfd.readouterr()
+    assert not patched_write.called
+    assert "March 2014" in out
+
+
+def test_cached_path_skips_ddate(cache_path):
+    """A cached run shouldn't import multicalendar or ddate at all."""
+
+    script = (
+        "import sys\n"
+        "from dateandtime.base import main\n"
+        "sys.argv = ['dateandtime', '--once', '-d']\n"
+        "main()\n"
+        "sys.stderr.write(str(sorted(\n"
+        "    name for name in sys.modules\n"
+        "    if name.startswith(('ddate', 'dateandtime.multicalendar'))\n"
+        ")))\n"
+    )
+    env = dict(os.environ, DATEANDTIME_ONCE_CACHE=cache_path)
+    runs = [
+        subprocess.run(
+            [sys.executable, "-c", script],
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+        ) for _ in range(2)
+    ]
+    assert b"ddate.base" in runs[0].stderr
+    assert runs[1].stderr == b"[]"
+    assert runs[0].stdout == runs[1].stdout
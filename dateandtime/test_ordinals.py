@@ -0,0 +1,157 @@
+"""Tests for dateandtime's day number arithmetic, against stdlib and ddate."""
+
+
+import random
+import calendar
+import datetime
+
+import pytest
+from mock import patch
+from ddate.base import DDate
+from dateandtime import ordinals
+from dateandtime.ansi import ANSI
+from dateandtime.multicalendar import MultiCalendar
+
+
+# every day of the years around a non leap century, and random samples
+EDGE_ORDINALS = list(range(
+    datetime.date(1899, 1, 1).toordinal(),
+    datetime.date(1905, 1, 1).toordinal(),
+))
+SAMPLED_ORDINALS = random.Random(1166).sample(
+    range(1, datetime.date.max.toordinal() + 1),
+    5000,
+)
+
+
+def test_ordinal_round_trip():
+    """Ordinals match date.toordinal, both ways."""
+
+    for ordinal in EDGE_ORDINALS + SAMPLED_ORDINALS + [1, 730120, 3652059]:
+        date = datetime.date.fromordinal(ordinal)
+        assert ordinals.from_ordinal(ordinal) == (
+            date.year, date.month, date.day,
+        )
+        assert ordinals.to_ordinal(date.year, date.month, date.day) == ordinal
+
+
+def test_weekday():
+    """Weekdays count from Sunday."""
+
+    for ordinal in SAMPLED_ORDINALS:
+        date = datetime.date.fromordinal(ordinal)
+        assert ordinals.weekday(ordinal) == (date.weekday() + 1) % 7
+
+
+def test_gregorian_months():
+    """Month layouts match calendar.monthrange, across leap rules."""
+
+    for year in list(range(1896, 1905)) + list(range(1996, 2005)):
+        for month in range(1, 13):
+            first, length, previous = ordinals.gregorian_month(year, month)
+            expected_first, expected_length = calendar.monthrange(year, month)
+            assert first == (expected_first + 1) % 7
+            assert length == expected_length
+            assert previous == calendar.monthrange(
+                year - (month == 1),
+                month - 1 or 12,
+            )[1]
+
+
+def test_overflow():
+    """Leading and trailing days fill the first and last weeks."""
+
+    # March 2014 starts on a Saturday
+    assert ordinals.overflow(7, 6, 31) == (6, 5)
+    # February 2015 starts on a Sunday and fills its weeks
+    assert ordinals.overflow(7, 0, 28) == (0, 0)
+    for season in range(5):
+        first, length, _ = ordinals.discordian_season(season)
+        leading, trailing = ordinals.overflow(5, first, length)
+        assert (leading + length + trailing) % 5 == 0
+
+
+def test_discordian_dates():
+    """Discordian dates match ddate's, St. Tib's Day included."""
+
+    for ordinal in EDGE_ORDINALS + SAMPLED_ORDINALS[:500]:
+        date = datetime.date.fromordinal(ordinal)
+        expected = DDate(date)
+        assert ordinals.discordian_date(ordinal) == (
+            expected.year,
+            expected.season,
+            expected.day_of_season,
+            expected.day_of_week,
+        )
+
+
+def test_discordian_seasons():
+    """A season's first weekday is the weekday of its first day."""
+
+    for season in range(5):
+        first_day = datetime.date(2015, 1, 1) + datetime.timedelta(
+            days=season * 73,
+        )
+        assert ordinals.discordian_season(season)[0] == (
+            DDate(first_day).day_of_week
+        )
+
+
+def test_st_tibs_day():
+    """St. Tib's Day shows Chaos, without highlighting any day."""
+
+    st_tibs = datetime.date(2016, 2, 29)
+    cal = MultiCalendar(discordian=True, date=st_tibs, now=st_tibs)
+    lines = cal.calendar_lines()
+    assert cal.month == "Chaos"
+    assert cal.today is None
+    assert "Chaos 3182" in lines[0]
+    assert not any(ANSI.TODAY in line for line in lines)
+
+
+def test_discordian_table():
+    """Every day of the table matches discordian_date."""
+
+    table = ordinals.discordian_table()
+    assert ordinals.discordian_table() is table
+    assert len(table.entries) == table.last - table.first + 1
+    for ordinal in range(table.first, table.last + 1):
+        assert table.lookup(ordinal) == ordinals.discordian_date(ordinal)[1:]
+    assert table.first - 1 not in table
+    assert table.last + 1 not in table
+
+
+def test_discordian_table_seasons():
+    """Discord starts on March 15th, St. Tib's Day or not."""
+
+    table = ordinals.DiscordianTable(2015, 2016)
+    for year in (2015, 2016):
+        starts = [table.season_start(year, season) for season in range(5)]
+        assert starts[0] == datetime.date(year, 1, 1).toordinal()
+        assert starts[1] == datetime.date(year, 3, 15).toordinal()
+        assert starts[4] == datetime.date(year, 10, 20).toordinal()
+
+
+def test_discordian_table_years():
+    """The table's range can be set through the environment."""
+
+    with patch.object(ordinals, "_TABLE", []):
+        with patch.dict(
+                "os.environ", {"DATEANDTIME_DISCORDIAN_YEARS": "2000-2003"}):
+            table = ordinals.discordian_table()
+    assert (table.first_year, table.last_year) == (2000, 2003)
+    assert len(table.entries) == 4 * 365 + 1
+
+
+@pytest.mark.parametrize("value", ["abc", "2000-1999", "0-10", "1999-10000"])
+def test_discordian_table_bad_years(value):
+    """A bad range exits, naming the variable, before building anything."""
+
+    with patch.object(ordinals, "_TABLE", []):
+        with patch.dict(
+                "os.environ", {"DATEANDTIME_DISCORDIAN_YEARS": value}):
+            with pytest.raises(SystemExit) as error:
+                ordinals.discordian_table()
+            assert not ordinals._TABLE
+    assert "DATEANDTIME_DISCORDIAN_YEARS" in str(error.value)
+    assert repr(value) in str(error.value)
@@ -0,0 +1,97 @@
+"""Tests for dateandtime's differential frame renderer."""
+
+
+import datetime
+
+import pytest
+
+from dateandtime.multicalendar import ANSI, MultiCalendar
+from dateandtime.renderer import FrameRenderer, parse_frame
+
+
+class Recorder(object):
+    """Collects everything written to it."""
+
+    def __init__(self):
+        self.writes = []
+
+    def write(self, data):
+        self.writes.append(data)
+
+
+@pytest.fixture
+def renderer():
+    """A renderer writing into a Recorder."""
+
+    return FrameRenderer(sink=Recorder())
+
+
+def _frame(date, now):
+    """Returns the frame be_a_clock would draw for date at now."""
+
+    cal = MultiCalendar(date=date, now=date)
+    return cal.calendar_lines() + [cal.time_line(now)]
+
+
+def test_parse_frame_carries_style():
+    """Styles should carry across lines until an ANSI.END."""
+
+    rows, styles = parse_frame([
+        "{0} 1  2".format(ANSI.PAST),
+        " 3{0} 4".format(ANSI.END),
+    ])
+    assert rows[0][1] == ("1", ANSI.PAST)
+    assert rows[0][2] == (" ", "")
+    assert rows[1][1] == ("3", ANSI.PAST)
+    assert rows[1][3] == ("4", "")
+    assert styles == ["", ANSI.PAST]
+
+
+def test_first_frame_is_drawn_whole(renderer):
+    """The first frame clears the screen and is written as is."""
+
+    lines = ["one", "two"]
+    renderer.render(lines)
+    written = "".join(renderer.sink.writes)
+    assert written.startswith("\033[H\033[2J")
+    assert "one\ntwo" in written
+    assert "\n" * 2 not in written
+
+
+def test_unchanged_frame_writes_nothing(renderer):
+    """Rendering the same frame twice shouldn't write anything."""
+
+    lines = ["one", "two"]
+    renderer.render(lines)
+    assert renderer.render(lines) == 0
+    assert len(renderer.sink.writes) == 1
+
+
+def test_only_changed_cells_are_written(renderer):
+    """A minute tick only rewrites the minute digits."""
+
+    date = datetime.datetime(2014, 3, 12)
+    renderer.render(_frame(date, date.replace(hour=9, minute=41)))
+    renderer.render(_frame(date, date.replace(hour=9, minute=42)))
+    assert renderer.sink.writes[-1] == "\033[10G2"
+
+
+def test_day_rollover_is_small(renderer):
+    """Moving the highlighted day should cost a few dozen bytes."""
+
+    today = datetime.datetime(2014, 3, 12, 23, 59)
+    tomorrow = datetime.datetime(2014, 3, 13, 0, 0)
+    renderer.render(_frame(today, today))
+    written = renderer.render(_frame(tomorrow, tomorrow))
+    assert 0 < written < 100
+    update = renderer.sink.writes[-1]
+    assert "{0}12{1}".format(ANSI.PAST, ANSI.END) in update
+    assert "{0}13{1}".format(ANSI.TODAY, ANSI.END) in update
+
+
+def test_row_count_change_redraws(renderer):
+    """A month with a different number of weeks redraws from the top."""
+
+    renderer.render(["one", "two", "three"])
+    renderer.render(["one", "two"])
+    assert renderer.sink.writes[-1].startswith("\033[2A\033[1G\033[J")
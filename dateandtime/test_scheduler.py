@@ -0,0 +1,108 @@
+"""Tests for dateandtime's tick scheduler."""
+
+
+import datetime
+
+from dateandtime.scheduler import TickScheduler
+
+
+class FakeClock(object):
+    """Wall and monotonic clocks that only move when slept on."""
+
+    def __init__(self, start, jumps=None):
+        self.wall = start
+        self.mono = 0.0
+        self.naps = []
+        self.jumps = jumps or {}
+
+    def now(self):
+        return self.wall
+
+    def clock(self):
+        return self.mono
+
+    def sleep(self, seconds):
+        self.naps.append(seconds)
+        self.mono += seconds
+        self.wall += datetime.timedelta(seconds=seconds)
+        self.wall += self.jumps.get(len(self.naps), datetime.timedelta(0))
+
+
+def _scheduler(fake, **kwargs):
+    return TickScheduler(
+        now=fake.now,
+        sleep=fake.sleep,
+        clock=fake.clock,
+        **kwargs
+    )
+
+
+def test_next_minute():
+    """The next minute boundary drops seconds and microseconds."""
+
+    now = datetime.datetime(2014, 12, 31, 23, 59, 12, 345)
+    assert TickScheduler.next_minute(now) == datetime.datetime(2015, 1, 1)
+
+
+def test_next_day():
+    """The next day boundary is the following midnight."""
+
+    now = datetime.datetime(2016, 2, 28, 0, 0, 1)
+    assert TickScheduler.next_day(now) == datetime.datetime(2016, 2, 29)
+
+
+def test_single_wakeup_per_minute():
+    """We should sleep exactly until the minute changes, once."""
+
+    fake = FakeClock(datetime.datetime(2014, 3, 1, 12, 30, 15, 500000))
+    woke = _scheduler(fake).wait_for_minute(fake.now())
+    assert woke == datetime.datetime(2014, 3, 1, 12, 31)
+    assert fake.naps == [44.5]
+
+
+def test_long_waits_are_split():
+    """Naps are capped so a suspend can't hide a boundary for long."""
+
+    fake = FakeClock(datetime.datetime(2014, 3, 1, 23, 0))
+    scheduler = _scheduler(fake, max_nap=600)
+    woke = scheduler.sleep_until(TickScheduler.next_day(fake.now()))
+    assert woke == datetime.datetime(2014, 3, 2)
+    assert fake.naps == [600] * 6
+    assert scheduler.wakeups == 6
+
+
+def test_early_wake_sleeps_again():
+    """A wall clock slewed behind the deadline just naps a little more."""
+
+    fake = FakeClock(
+        datetime.datetime(2014, 3, 1, 12, 30, 59),
+        jumps={1: datetime.timedelta(seconds=-1)},
+    )
+    woke = _scheduler(fake).wait_for_minute(fake.now())
+    assert woke == datetime.datetime(2014, 3, 1, 12, 31)
+    assert fake.naps == [1, 1]
+
+
+def test_backwards_jump_returns_early():
+    """Setting the clock back should wake us up to redraw."""
+
+    fake = FakeClock(
+        datetime.datetime(2014, 3, 1, 12, 30, 30),
+        jumps={1: datetime.timedelta(hours=-1)},
+    )
+    scheduler = _scheduler(fake)
+    woke = scheduler.wait_for_minute(fake.now())
+    assert woke == datetime.datetime(2014, 3, 1, 11, 31)
+    assert scheduler.jumps == 1
+
+
+def test_forwards_jump_returns_now():
+    """Resuming from suspend lands past the deadline, return right away."""
+
+    fake = FakeClock(
+        datetime.datetime(2014, 3, 1, 12, 30, 30),
+        jumps={1: datetime.timedelta(hours=3)},
+    )
+    woke = _scheduler(fake).wait_for_minute(fake.now())
+    assert woke == datetime.datetime(2014, 3, 1, 15, 31)
+    assert fake.naps == [30]
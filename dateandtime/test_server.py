@@ -0,0 +1,206 @@
+"""Tests for dateandtime's calendar server, including a load test."""
+
+
+import os
+import shutil
+import socket
+import resource
+import asyncio
+import datetime
+import tempfile
+
+import pytest
+
+from dateandtime import server
+from dateandtime.scheduler import TickScheduler
+
+
+START = datetime.datetime(2014, 3, 12, 9, 41, tzinfo=datetime.timezone.utc)
+
+# seconds the load test waits on its clients before failing, not hanging
+TIMEOUT = 30
+
+
+@pytest.fixture
+def socket_path():
+    """A short unix socket path in a fresh directory."""
+
+    directory = tempfile.mkdtemp(prefix="dat")
+    yield os.path.join(directory, "sock")
+    shutil.rmtree(directory)
+
+
+def _server(path):
+    """Returns a CalendarServer frozen at START."""
+
+    return server.CalendarServer(
+        path,
+        scheduler=TickScheduler(now=lambda: START),
+    )
+
+
+def test_parse_subscription():
+    """Calendar flags are parsed like the command line, TZ= separately."""
+
+    calendar, timezone = server.parse_subscription("-d TZ=Europe/Berlin\n")
+    assert calendar == {
+        "discordian": True,
+        "eve_game": False,
+        "eve_real": False,
+    }
+    assert timezone == "Europe/Berlin"
+
+
+def test_bad_subscriptions():
+    """Unknown zones and multiple calendars are refused."""
+
+    with pytest.raises(SystemExit):
+        server.parse_subscription("TZ=Not/AZone")
+    with pytest.raises(SystemExit):
+        server.parse_subscription("-d -e")
+
+
+def test_channels_are_shared():
+    """The same calendar and zone share one channel."""
+
+    calendar_server = _server("unused")
+    calendar, _ = server.parse_subscription("-e")
+    first = calendar_server.channel(calendar, "UTC")
+    assert calendar_server.channel(dict(calendar), "UTC") is first
+    assert calendar_server.channel(calendar, "Asia/Tokyo") is not first
+
+
+def test_channel_time_zones():
+    """Each channel renders its own local time."""
+
+    channel = server.Channel(server.parse_subscription("")[0], "Asia/Tokyo")
+    channel.update(START)
+    assert "6:41 pm" in channel.renderer.lines[-1]
+
+
+def test_default_socket(tmpdir, monkeypatch):
+    """The default socket is in a private directory of $XDG_RUNTIME_DIR."""
+
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmpdir))
+    path = server.default_socket()
+    assert path == str(tmpdir.join("dateandtime", "sock"))
+    assert os.stat(os.path.dirname(path)).st_mode & 0o777 == 0o700
+
+
+def test_default_socket_taken(tmpdir, monkeypatch):
+    """A directory someone else planted is refused, not used."""
+
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmpdir))
+    tmpdir.join("dateandtime").mksymlinkto(tmpdir.mkdir("theirs"))
+    with pytest.raises(SystemExit):
+        server.default_socket()
+
+
+def test_stale_socket_is_replaced(socket_path):
+    """A socket left behind with nothing listening is taken over."""
+
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path)
+    stale.close()
+    assert not server.listening(socket_path)
+
+    async def _start():
+        calendar_server = _server(socket_path)
+        await calendar_server.start()
+        assert server.listening(socket_path)
+        calendar_server.close()
+
+    asyncio.run(_start())
+    assert not os.path.exists(socket_path)
+
+
+def test_live_socket_is_kept(socket_path):
+    """A second server refuses to take the socket from a live one."""
+
+    async def _start_twice():
+        first = _server(socket_path)
+        await first.start()
+        second = _server(socket_path)
+        try:
+            with pytest.raises(SystemExit) as error:
+                await second.start()
+            second.close()
+            assert server.listening(socket_path)
+        finally:
+            first.close()
+        return error
+
+    error = asyncio.run(_start_twice())
+    assert "already listening on {0}".format(socket_path) in str(error.value)
+
+
+async def _load(path, clients):
+    """Connects clients to a server at path, ticks and reads everything."""
+
+    calendar_server = _server(path)
+    await calendar_server.start()
+
+    requests = [
+        "", "-d", "-e", "-r", "TZ=UTC", "-d TZ=Asia/Tokyo",
+    ]
+    connections = []
+    for number in range(clients):
+        reader, writer = await asyncio.open_unix_connection(path)
+        writer.write("{0}\n".format(
+            requests[number % len(requests)],
+        ).encode("utf-8"))
+        connections.append((reader, writer))
+
+    async def _first_frame(reader):
+        # the calendar ends in an ANSI.END line, the time line with ANSI.END
+        frame = await reader.readuntil(b"\033[0m\n")
+        return frame + await reader.readuntil(b"\033[0m")
+
+    frames = await asyncio.wait_for(asyncio.gather(*[
+        _first_frame(reader) for reader, _ in connections
+    ]), TIMEOUT)
+
+    channels = len(calendar_server.channels)
+    calendar_server.tick(START + datetime.timedelta(minutes=1))
+
+    updates = await asyncio.wait_for(asyncio.gather(*[
+        reader.read(1024) for reader, _ in connections
+    ]), TIMEOUT)
+
+    calendar_server.close()
+    for _, writer in connections:
+        writer.close()
+        await writer.wait_closed()
+    await asyncio.sleep(0)
+    return channels, frames, updates
+
+
+@pytest.fixture
+def fd_limit():
+    """Raises our open file limit to what the load test needs, for the test.
+
+    Each client holds a socket at both ends, plus pytest's own files.
+    """
+
+    needed = 2 * 1000 + 100
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft >= needed:
+        yield
+        return
+    if hard != resource.RLIM_INFINITY and hard < needed:
+        pytest.skip("needs {0} open files, limited to {1}".format(
+            needed,
+            hard,
+        ))
+    resource.setrlimit(resource.RLIMIT_NOFILE, (needed, hard))
+    yield
+    resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+
+
+def test_thousand_clients(socket_path, fd_limit):
+    """1,000 local clients are served by one channel per configuration."""
+
+    channels, frames, updates = asyncio.run(_load(socket_path, 1000))
+    assert channels == 6
+    assert all(frame.startswith(b"\033[H\033[2J") for frame in frames)
+    assert all(update.endswith(b"2") for update in updates)
@@ -0,0 +1,202 @@
+"""Tests for dateandtime's clock loop, driven through virtual time."""
+
+
+import datetime
+
+import pytest
+
+from dateandtime.ansi import ANSI
+from dateandtime.renderer import SGR
+from dateandtime.simulation import Finished, VirtualClock, simulate
+
+
+def _days(frames):
+    """Returns the number of frames drawn on each day."""
+
+    counts = {}
+    for frame in frames:
+        counts[frame.time.date()] = counts.get(frame.time.date(), 0) + 1
+    return counts
+
+
+def _today(frame):
+    """Returns the highlighted day of a frame, or None."""
+
+    for line in frame.lines:
+        if ANSI.TODAY in line:
+            return int(SGR.sub(" ", line.split(ANSI.TODAY, 1)[1]).split()[0])
+    return None
+
+
+def test_virtual_clock():
+    """Sleeps move the wall and monotonic clocks together, until the end."""
+
+    clock = VirtualClock(
+        datetime.datetime(2014, 3, 12),
+        datetime.datetime(2014, 3, 12, 0, 2),
+    )
+    clock.sleep(90)
+    assert clock.now() == datetime.datetime(2014, 3, 12, 0, 1, 30)
+    assert clock.clock() == 90
+    clock.sleep(30)
+    with pytest.raises(Finished):
+        clock.sleep(1)
+
+
+def test_leap_day():
+    """Every minute of February 29th is drawn, then March takes over."""
+
+    frames = simulate(
+        datetime.datetime(2016, 2, 28, 23, 58),
+        datetime.datetime(2016, 3, 1, 0, 1),
+    )
+    counts = _days(frames)
+    assert counts[datetime.date(2016, 2, 29)] == 1440
+    assert counts[datetime.date(2016, 3, 1)] == 2
+    leap_day = [frame for frame in frames if frame.time.day == 29]
+    assert _today(leap_day[0]) == 29
+    assert "February 2016" in leap_day[0].lines[0]
+    assert leap_day[0].lines[-1].strip() == "12:00 am"
+    assert "March 2016" in frames[-1].lines[0]
+    assert _today(frames[-1]) == 1
+
+
+def test_minute_ticks_write_little():
+    """A minute tick rewrites the time, not the whole frame."""
+
+    frames = simulate(
+        datetime.datetime(2014, 3, 12, 9, 41),
+        datetime.datetime(2014, 3, 12, 9, 45),
+    )
+    assert frames[0].output.startswith("\033[H\033[2J")
+    assert all(len(frame.output) < 10 for frame in frames[1:])
+
+
+def test_st_tibs_day():
+    """St. Tib's Day shows Chaos with no day highlighted."""
+
+    frames = simulate(
+        datetime.datetime(2016, 2, 28, 23, 59),
+        datetime.datetime(2016, 3, 1, 0, 0),
+        discordian=True,
+    )
+    st_tibs = [frame for frame in frames if frame.time.day == 29]
+    assert len(st_tibs) == 1440
+    assert "Chaos 3182" in st_tibs[0].lines[0]
+    assert _today(st_tibs[0]) is None
+    assert _today(frames[0]) == 59
+    assert _today(frames[-1]) == 60
+
+
+def test_dst_transitions():
+    """Spring forward skips an hour of frames, fall back repeats one."""
+
+    zoneinfo = pytest.importorskip("zoneinfo")  # noqa: F841
+    spring = simulate(
+        datetime.datetime(2014, 3, 30),
+        datetime.datetime(2014, 3, 31),
+        zone="Europe/Berlin",
+    )
+    assert _days(spring)[datetime.date(2014, 3, 30)] == 23 * 60
+    assert not any(frame.time.hour == 2 for frame in spring)
+
+    autumn = simulate(
+        datetime.datetime(2014, 10, 26),
+        datetime.datetime(2014, 10, 27),
+        zone="Europe/Berlin",
+    )
+    assert _days(autumn)[datetime.date(2014, 10, 26)] == 25 * 60
+    assert sum(frame.time.hour == 2 for frame in autumn) == 120
+
+
+def test_world_clock_through_fall_back():
+    """Zone lines follow UTC through the repeated hour, not local time."""
+
+    zoneinfo = pytest.importorskip("zoneinfo")  # noqa: F841
+    frames = simulate(
+        datetime.datetime(2014, 10, 26, 1, 59),
+        datetime.datetime(2014, 10, 26, 3, 1),
+        zone="Europe/Berlin",
+        zones=["UTC"],
+    )
+    repeated = [
+        frame.lines[-1].split()[-2:] for frame in frames
+        if frame.time == datetime.datetime(2014, 10, 26, 2, 30)
+    ]
+    assert repeated == [["12:30", "am"], ["1:30", "am"]]
+    assert frames[-1].lines[-1].split()[-2:] == ["2:01", "am"]
+
+
+def test_world_clock_fits_the_calendar():
+    """Zone lines are as wide as the time line, whatever the layout."""
+
+    pytest.importorskip("zoneinfo")
+    frames = simulate(
+        datetime.datetime(2014, 3, 12, 9, 0),
+        datetime.datetime(2014, 3, 12, 9, 1),
+        size=(80, 24),
+        months=3,
+        zones=["Asia/Tokyo"],
+    )
+    time_line, zone_line = frames[-1].lines[-2:]
+    assert len(time_line) > 20
+    assert len(zone_line) == len(time_line)
+    assert zone_line.endswith(" 6:01 pm")
+
+
+def test_clock_jumps():
+    """A wall clock stepped forward or back is followed right away."""
+
+    frames = simulate(
+        datetime.datetime(2014, 3, 12, 9, 0),
+        datetime.datetime(2014, 3, 13, 0, 5),
+        jumps={
+            datetime.datetime(2014, 3, 12, 9, 10): datetime.timedelta(
+                hours=14,
+            ),
+            datetime.datetime(2014, 3, 12, 23, 20): datetime.timedelta(
+                minutes=-30,
+            ),
+        },
+    )
+    times = [frame.time for frame in frames]
+    assert times[9] == datetime.datetime(2014, 3, 12, 9, 9)
+    assert times[10] == datetime.datetime(2014, 3, 12, 23, 10)
+    assert times[20] == datetime.datetime(2014, 3, 12, 22, 50)
+    assert times.count(datetime.datetime(2014, 3, 12, 23, 15)) == 2
+    assert _today(frames[-1]) == 13
+
+
+def test_formats_and_layout():
+    """be_a_clock's other options reach the simulated clock."""
+
+    frames = simulate(
+        datetime.datetime(2014, 3, 12, 9, 0, 58),
+        datetime.datetime(2014, 3, 12, 9, 1, 2),
+        size=(80, 24),
+        time_format="%H:%M:%S",
+    )
+    assert [frame.lines[-1].strip() for frame in frames] == [
+        "09:00:58", "09:00:59", "09:01:00", "09:01:01", "09:01:02",
+    ]
+    assert "April 2014" in frames[0].lines[0]
+
+
+def test_several_systems():
+    """Several systems share a tick and a time line, rolling over together.
+    """
+
+    frames = simulate(
+        datetime.datetime(2016, 2, 28, 23, 59),
+        datetime.datetime(2016, 2, 29, 0, 1),
+        size=(80, 24),
+        systems=["gregorian", "discordian"],
+    )
+    assert len(frames) == 3
+    assert sum(line.count(ANSI.TODAY) for line in frames[0].lines) == 2
+    # St. Tib's Day highlights no Discordian day
+    assert sum(line.count(ANSI.TODAY) for line in frames[1].lines) == 1
+    assert [frame.lines[-1].strip() for frame in frames] == [
+        "11:59 pm", "12:00 am", "12:01 am",
+    ]
+    assert len(frames[2].output) < 10
@@ -0,0 +1,89 @@
+"""Tests for dateandtime's output sinks."""
+
+
+import io
+import os
+import datetime
+
+from mock import patch
+
+from dateandtime import sink
+from dateandtime.multicalendar import MultiCalendar
+from dateandtime.renderer import FrameRenderer
+
+
+def test_buffer_sink():
+    """Buffers keep everything until taken."""
+
+    buffered = sink.BufferSink()
+    buffered.write("one")
+    buffered.write("two")
+    assert buffered.getvalue() == "onetwo"
+    assert buffered.take() == "onetwo"
+    assert buffered.getvalue() == ""
+
+
+def test_fd_sink_single_write():
+    """A frame is written with a single os.write call."""
+
+    read_fd, write_fd = os.pipe()
+    try:
+        with patch.object(sink.os, "write", wraps=os.write) as patched_write:
+            sink.FdSink(write_fd).write("whole frame")
+        assert patched_write.call_count == 1
+        assert os.read(read_fd, 1024) == b"whole frame"
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+
+
+def test_fd_sink_partial_write():
+    """The remainder of a partial write is written after it."""
+
+    writes = []
+
+    def _short_write(fd, data):
+        writes.append(data)
+        return min(len(data), 3)
+
+    with patch.object(sink.os, "write", side_effect=_short_write):
+        sink.FdSink(99).write("abcdefg")
+    assert writes == [b"abcdefg", b"defg", b"g"]
+
+
+def test_stdout_sink_without_fd():
+    """Streams without a file descriptor are written to directly."""
+
+    stream = io.StringIO()
+    with patch.object(sink.sys, "stdout", stream):
+        stdout = sink.stdout_sink()
+    assert isinstance(stdout, sink.StreamSink)
+    stdout.write("frame")
+    assert stream.getvalue() == "frame"
+
+
+def test_calendar_as_string(capfd):
+    """The calendar can be rendered without printing anything."""
+
+    day = datetime.datetime(2014, 3, 12)
+    cal = MultiCalendar(date=day, now=day)
+    buffered = sink.BufferSink()
+    cal.print_calendar(buffered)
+    cal.print_time(day, buffered)
+    out, _ = capfd.readouterr()
+    assert out == ""
+    assert buffered.getvalue() == "{0}\r{1}".format(
+        cal.format_calendar(),
+        cal.time_line(day),
+    )
+
+
+def test_one_write_per_frame():
+    """The renderer hands each frame to its sink in one piece."""
+
+    recorded = sink.BufferSink()
+    renderer = FrameRenderer(sink=recorded)
+    day = datetime.datetime(2014, 3, 12)
+    cal = MultiCalendar(date=day, now=day)
+    renderer.render(cal.calendar_lines() + [cal.time_line(day)])
+    assert len(recorded.parts) == 1
@@ -0,0 +1,42 @@
+"""Tests for dateandtime's memory soak."""
+
+
+import datetime
+
+import pytest
+
+from dateandtime import soak
+
+
+def test_report_bound():
+    """A soak fails once any sample grew past the bound."""
+
+    report = soak.SoakReport(bound=1000)
+    day = datetime.datetime(2016, 1, 1)
+    report.samples = [(day, 5000), (day, 5900), (day, 5500)]
+    assert report.passed
+    assert report.growth == 500
+    report.samples.append((day, 6001))
+    assert not report.passed
+    assert report.format().startswith("FAILED after 0 frames")
+
+
+def test_short_soak():
+    """A few virtual days of soak draw every minute and stay flat."""
+
+    report = soak.soak(days=3, warmup=1, interval=1, top=3)
+    assert report.frames == 3 * 1440 + 1
+    assert len(report.samples) == 3
+    assert report.passed, report.format()
+    assert len(report.multicalendar_sites) <= 3
+    assert all(
+        "multicalendar.py" in str(stat)
+        for stat in report.multicalendar_sites
+    )
+
+
+def test_warmup_too_long():
+    """There has to be something left to soak after the warm up."""
+
+    with pytest.raises(SystemExit):
+        soak.soak(days=10, warmup=10)
@@ -0,0 +1,152 @@
+"""Tests for dateandtime's runtime instrumentation."""
+
+
+import io
+import json
+import datetime
+
+import pytest
+from mock import patch
+
+from dateandtime import stats
+from dateandtime.base import be_a_clock
+from dateandtime.scheduler import TickScheduler
+
+
+class _Stop(Exception):
+    """Raised to end an endless loop."""
+
+
+def test_histogram():
+    """Histograms track count, sum, extremes and buckets."""
+
+    histogram = stats.Histogram()
+    for value in (0, 0.25, 0.3, 3):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == pytest.approx(3.55)
+    assert snapshot["min"] == 0
+    assert snapshot["max"] == 3
+    assert snapshot["buckets"] == {"0": 1, "0.5": 2, "4.0": 1}
+
+
+def test_dump_is_json():
+    """Dumps are one line of JSON."""
+
+    recorded = stats.Stats()
+    recorded.incr("frames")
+    recorded.observe("frame_bytes", 12)
+    stream = io.StringIO()
+    recorded.dump(stream)
+    dumped = json.loads(stream.getvalue())
+    assert dumped["counters"] == {"frames": 1}
+    assert dumped["histograms"]["frame_bytes"]["max"] == 12
+
+
+def test_flush_to_file(tmpdir):
+    """Snapshots are written to the stats file."""
+
+    path = str(tmpdir.join("stats.json"))
+    recorded = stats.Stats(path)
+    recorded.incr("wakeups", 3)
+    recorded.flush()
+    with open(path) as stats_file:
+        assert json.load(stats_file)["counters"] == {"wakeups": 3}
+
+
+def test_signal_requests_a_flush(tmpdir, capfd):
+    """SIGUSR1 only flags a write, done by the next flush, not to stderr."""
+
+    path = str(tmpdir.join("stats.json"))
+    recorded = stats.Stats(path, periodic=False)
+    with patch.object(stats.signal, "signal") as patched_signal:
+        recorded.install()
+    recorded.flush()
+    assert not tmpdir.join("stats.json").exists()
+
+    handler = patched_signal.call_args[0][1]
+    handler(stats.signal.SIGUSR1, None)
+    assert not tmpdir.join("stats.json").exists()
+    recorded.flush()
+    with open(path) as stats_file:
+        assert json.load(stats_file)["counters"] == {}
+    assert not recorded.requested
+    assert capfd.readouterr() == ("", "")
+
+
+def test_default_path(tmpdir, monkeypatch):
+    """Without a PATH, stats go to this process' file in the cache."""
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmpdir))
+    assert stats.default_path() == str(tmpdir.join(
+        "dateandtime",
+        "stats-{0}.json".format(stats.os.getpid()),
+    ))
+
+
+def test_null_stats():
+    """Disabled stats accept everything and record nothing."""
+
+    stats.NULL_STATS.incr("frames")
+    stats.NULL_STATS.observe("frame_bytes", 1)
+    stats.NULL_STATS.flush()
+    assert not stats.NULL_STATS.enabled
+
+
+def test_clock_loop_is_recorded(capfd):
+    """A day change is recorded as a rollover, with wakeups and drift."""
+
+    clock = {"now": datetime.datetime(2014, 3, 12, 23, 57, 30), "mono": 0}
+
+    def _sleep(seconds):
+        if clock["now"].day == 13 and clock["now"].minute == 1:
+            raise _Stop()
+        clock["mono"] += seconds
+        clock["now"] += datetime.timedelta(seconds=seconds + 0.25)
+
+    scheduler = TickScheduler(
+        now=lambda: clock["now"],
+        sleep=_sleep,
+        clock=lambda: clock["mono"],
+        tolerance=1,
+    )
+    recorded = stats.Stats()
+    with pytest.raises(_Stop):
+        be_a_clock(scheduler=scheduler, stats=recorded)
+    capfd.readouterr()
+
+    assert recorded.counters["frames"] == 5
+    assert recorded.counters["rollovers"] == 1
+    assert recorded.counters["wakeups"] == 4
+    assert recorded.counters["clock_jumps"] == 0
+    drift = recorded.histograms["drift_seconds"]
+    assert drift.minimum == drift.maximum == 0.25
+
+
+def test_drift_per_second_tick(capfd):
+    """Ticking every second, drift is measured from the second's start."""
+
+    clock = {"now": datetime.datetime(2014, 3, 12, 9, 41, 30), "mono": 0}
+
+    def _sleep(seconds):
+        if clock["now"].second >= 40:
+            raise _Stop()
+        clock["mono"] += seconds
+        clock["now"] += datetime.timedelta(seconds=seconds + 0.25)
+
+    scheduler = TickScheduler(
+        now=lambda: clock["now"],
+        sleep=_sleep,
+        clock=lambda: clock["mono"],
+        tolerance=1,
+    )
+    recorded = stats.Stats()
+    with pytest.raises(_Stop):
+        be_a_clock(scheduler=scheduler, stats=recorded,
+                   time_format="%H:%M:%S")
+    capfd.readouterr()
+
+    assert recorded.counters["frames"] == 11
+    drift = recorded.histograms["drift_seconds"]
+    assert drift.minimum == drift.maximum == 0.25
@@ -0,0 +1,129 @@
+"""Tests for dateandtime's status bar output."""
+
+
+import json
+import datetime
+
+import pytest
+
+from dateandtime import statusbar
+from dateandtime.sink import BufferSink
+
+
+class Finished(Exception):
+    """Raised by FakeScheduler once it's out of times."""
+
+
+class FakeScheduler(object):
+    """Wakes up at each of the given times in turn."""
+
+    def __init__(self, times):
+        self.times = list(times)
+
+    def now(self):
+        return self.times.pop(0)
+
+    def wait_for_minute(self, now):
+        if not self.times:
+            raise Finished()
+        return self.times.pop(0)
+
+    wait_for_second = wait_for_minute
+
+
+def _run(protocol, times, **calendar):
+    """Returns the output of status_bar over times."""
+
+    sink = BufferSink()
+    with pytest.raises(Finished):
+        statusbar.status_bar(
+            protocol,
+            scheduler=FakeScheduler(times),
+            sink=sink,
+            **calendar
+        )
+    return sink.getvalue()
+
+
+def test_i3bar_protocol():
+    """A header, then an endless array of status lines."""
+
+    sink = BufferSink()
+    statusbar.status_bar(
+        "i3bar",
+        discordian=True,
+        scheduler=FakeScheduler([datetime.datetime(2014, 4, 20, 9, 41)]),
+        sink=sink,
+        test=True,
+    )
+    header, line = sink.getvalue().split("\n[\n")
+    assert json.loads(header) == {"version": 1}
+    assert line.endswith("],\n")
+    blocks = json.loads(line[:-2])
+    assert blocks[0]["full_text"] == "Discord 37, 3180 9:41 am"
+    assert blocks[0]["short_text"] == "9:41 am"
+
+
+def test_waybar_only_on_changes():
+    """Records are written on new minutes and days, not on every wake up."""
+
+    output = _run("waybar", [
+        datetime.datetime(2015, 12, 31, 23, 58, 30),
+        datetime.datetime(2015, 12, 31, 23, 59, 0),
+        datetime.datetime(2015, 12, 31, 23, 59, 0, 500),
+        datetime.datetime(2016, 1, 1, 0, 0, 1),
+    ], eve_game=True)
+    records = [json.loads(line) for line in output.splitlines()]
+    assert [record["text"] for record in records] == [
+        "11:58 pm", "11:59 pm", "12:00 am",
+    ]
+    assert records[1]["tooltip"] == "December 31, YC 117"
+    assert records[2]["tooltip"] == "January 1, YC 118"
+    assert records[2]["class"] == "eve_game"
+
+
+def test_time_format_with_seconds():
+    """A time format with seconds writes a record every second."""
+
+    output = _run("waybar", [
+        datetime.datetime(2015, 12, 31, 23, 59, 58),
+        datetime.datetime(2015, 12, 31, 23, 59, 59),
+        datetime.datetime(2015, 12, 31, 23, 59, 59, 500),
+        datetime.datetime(2016, 1, 1, 0, 0, 0),
+    ], time_format="%H:%M:%S")
+    assert [json.loads(line)["text"] for line in output.splitlines()] == [
+        "23:59:58", "23:59:59", "00:00:00",
+    ]
+
+
+def test_time_format_escaped():
+    """Quotes and backslashes in the time format still make valid JSON."""
+
+    output = _run("waybar", [
+        datetime.datetime(2014, 3, 12, 9, 41),
+    ], time_format='%H"%M\\')
+    assert json.loads(output)["text"] == '09"41\\'
+
+
+def test_template_is_prebuilt():
+    """A minute's record is the day's pieces joined by the time."""
+
+    template = statusbar.DayTemplate(
+        "waybar",
+        statusbar.get_system("discordian"),
+        datetime.date(2016, 2, 29),
+    )
+    assert len(template.parts) == 2
+    assert json.loads(template.line("4:20 pm")) == {
+        "text": "4:20 pm",
+        "alt": "discordian",
+        "class": "discordian",
+        "tooltip": "St. Tib's Day, 3182",
+    }
+
+
+def test_unknown_protocol():
+    """Only the known protocols are spoken."""
+
+    with pytest.raises(SystemExit):
+        statusbar.status_bar("lemonbar")
@@ -0,0 +1,115 @@
+"""Tests for dateandtime's calendar system registry."""
+
+
+import sys
+import datetime
+
+import pytest
+from mock import patch
+
+from ddate.base import DDate
+from dateandtime import systems
+from dateandtime.multicalendar import MultiCalendar
+
+
+class Decimal(systems.Gregorian):
+    """A made up system with ten day weeks."""
+
+    name = "decimal"
+    family = "decimal"
+    week_length = 10
+    weekday_abbrs = ["D{0}".format(day) for day in range(10)]
+
+    def layout(self, date):
+        return 0, 30, 30
+
+
+@pytest.fixture
+def decimal():
+    """Registers the made up system for the length of a test."""
+
+    systems.register("decimal", Decimal)
+    yield
+    systems._BACKENDS.pop("decimal")
+    systems._LOADED.pop("decimal", None)
+
+
+def test_builtins_are_lazy():
+    """Built in systems are only instantiated once, when first asked for."""
+
+    systems._LOADED.pop("eve_real", None)
+    first = systems.get_system("eve_real")
+    assert isinstance(first, systems.EveReal)
+    assert systems.get_system("eve_real") is first
+
+
+def test_discordian_backend():
+    """The discordian system comes from its own module."""
+
+    discordian = systems.get_system("discordian")
+    assert discordian.week_length == 5
+    assert discordian.width == 14
+    assert "dateandtime.discordian" in sys.modules
+    assert isinstance(discordian.coerce(datetime.date(2014, 4, 20)), DDate)
+
+
+def test_unknown_system():
+    """Unknown systems exit with a message."""
+
+    with patch.object(systems, "_entry_point", return_value=None):
+        with pytest.raises(SystemExit) as error:
+            systems.get_system("mayan")
+    assert error.value.args[0] == "Unknown calendar system: mayan"
+
+
+def test_entry_point_backend():
+    """Systems from other packages are found by their entry point."""
+
+    found = "dateandtime.systems:EveGame"
+    with patch.object(systems, "_entry_point", return_value=found):
+        system = systems.get_system("elsewhere")
+    systems._LOADED.pop("elsewhere")
+    assert isinstance(system, systems.EveGame)
+
+
+def test_system_names():
+    """The boolean flags map onto system names."""
+
+    assert systems.system_name() == "gregorian"
+    assert systems.system_name(discordian=True) == "discordian"
+    assert systems.system_name(eve_real=True) == "eve_real"
+    assert systems.system_name(eve_game=True) == "eve_game"
+
+
+def test_registered_system_renders(decimal):
+    """A registered system is drawn by the same engine as the built ins."""
+
+    day = datetime.date(2014, 3, 12)
+    cal = MultiCalendar(system="decimal", date=day, now=day)
+    lines = cal.calendar_lines()
+    assert cal.max_width == 29
+    assert lines[1] == " ".join(Decimal.weekday_abbrs)
+    assert lines[2].endswith(" 1  2  3  4  5  6  7  8  9 10")
+    assert len(lines) == 2 + 3 + 1
+
+
+def test_table_ddates():
+    """DDates filled in from the table match DDate's own."""
+
+    from dateandtime.discordian import to_ddate
+
+    for day in (
+            datetime.date(2014, 1, 5),     # an apostle holiday
+            datetime.date(2014, 2, 19),    # a seasonal holiday
+            datetime.date(2016, 2, 29),    # St. Tib's Day
+            datetime.date(2016, 12, 31),
+            datetime.date(1066, 10, 14),   # outside of the table
+            datetime.datetime(2015, 6, 1, 12, 30),
+    ):
+        expected = DDate(day)
+        ddate = to_ddate(day)
+        assert ddate.date is day
+        for attribute in ("year", "season", "day_of_season", "day_of_week",
+                          "holiday"):
+            assert getattr(ddate, attribute) == getattr(expected, attribute)
+        assert str(ddate) == str(expected)
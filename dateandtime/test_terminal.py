@@ -0,0 +1,53 @@
+"""Tests for dateandtime's terminal cursor control."""
+
+
+import io
+import os
+
+from mock import patch
+
+from dateandtime import terminal
+
+
+def test_fallback_sequences():
+    """Without a usable terminfo entry the standard sequences are used."""
+
+    with patch.dict(os.environ, {"TERM": "no-such-terminal-here"}):
+        read_fd, write_fd = os.pipe()
+        try:
+            assert terminal.cursor_sequences(write_fd) == (
+                terminal.HIDE_CURSOR,
+                terminal.SHOW_CURSOR,
+            )
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+
+
+def test_not_a_tty():
+    """Nothing is written when the stream isn't a terminal."""
+
+    stream = io.StringIO()
+    with terminal.HiddenCursor(stream):
+        stream.write("frame")
+    assert stream.getvalue() == "frame"
+
+
+def test_hidden_then_shown():
+    """The cursor is hidden inside and shown again after, even on error."""
+
+    master, slave = os.openpty()
+    stream = os.fdopen(slave, "w")
+    try:
+        with patch.object(terminal, "cursor_sequences",
+                          return_value=("<hide>", "<show>")):
+            try:
+                with terminal.HiddenCursor(stream):
+                    stream.write("frame")
+                    raise KeyboardInterrupt
+            except KeyboardInterrupt:
+                pass
+        assert os.read(master, 1024) == b"<hide>frame<show>"
+    finally:
+        stream.close()
+        os.close(master)
@@ -0,0 +1,99 @@
+"""Tests for dateandtime's world clock."""
+
+
+import datetime
+
+import pytest
+
+zoneinfo = pytest.importorskip("zoneinfo")
+
+from dateandtime import worldclock  # noqa: E402
+
+
+def _utc(*args):
+    """Returns integer UTC epoch seconds for a datetime's arguments."""
+
+    return int(datetime.datetime(
+        *args, tzinfo=datetime.timezone.utc
+    ).timestamp())
+
+
+def test_times_of_day_table():
+    """The table matches print_time's format."""
+
+    assert worldclock.TIMES_OF_DAY[0] == "12:00 am"
+    assert worldclock.TIMES_OF_DAY[61] == "1:01 am"
+    assert worldclock.TIMES_OF_DAY[720] == "12:00 pm"
+    assert worldclock.TIMES_OF_DAY[1439] == "11:59 pm"
+
+
+def test_transition_found_to_the_second():
+    """Berlin's 2014 spring forward happened at 01:00 UTC on March 30th."""
+
+    zone = worldclock.ZoneClock("Europe/Berlin")
+    zone.local_seconds(_utc(2014, 3, 12))
+    assert zone.offset == 3600
+    assert zone.valid_from == _utc(2013, 10, 27, 1)
+    assert zone.valid_until == _utc(2014, 3, 30, 1)
+
+
+def test_matches_zoneinfo():
+    """Every sampled instant matches zoneinfo, with few refreshes."""
+
+    names = ["Europe/Berlin", "America/St_Johns", "Australia/Lord_Howe",
+             "Asia/Kathmandu", "UTC", "America/Sao_Paulo"]
+    zones = [worldclock.ZoneClock(name) for name in names]
+    start = _utc(2013, 1, 1)
+    for seconds in range(start, start + 3 * 366 * 86400, 3607):
+        for zone in zones:
+            expected = datetime.datetime.fromtimestamp(seconds, zone.zone)
+            assert zone.time_of_day(seconds) == "{0}:{1:02d} {2}".format(
+                expected.hour % 12 or 12,
+                expected.minute,
+                "am" if expected.hour < 12 else "pm",
+            )
+    for zone in zones:
+        assert zone.refreshes <= 8
+
+
+def test_ticks_dont_touch_zoneinfo():
+    """Between transitions a tick never asks zoneinfo for an offset."""
+
+    clock = worldclock.WorldClock(["UTC", "Asia/Tokyo", "Europe/London"] * 17)
+    seconds = _utc(2014, 6, 1)
+    clock.lines(seconds)
+    for zone in clock.zones:
+        zone.zone = None  # any zoneinfo use would now give the wrong offset
+    lines = clock.lines(seconds + 3600)
+    assert len(lines) == 51
+    assert lines[1] == "Tokyo       10:00 am"
+
+
+def test_labels_fit_the_width():
+    """Long labels are truncated to leave room for the time."""
+
+    clock = worldclock.WorldClock(["America/Argentina/Buenos_Aires"], 14)
+    line = clock.lines(_utc(2014, 6, 1, 15, 5))[0]
+    assert line == "Bueno 12:05 pm"
+    assert len(line) == 14
+
+
+def test_time_format():
+    """Zone lines follow the time format, each zone on its own day."""
+
+    clock = worldclock.WorldClock(["Asia/Tokyo", "America/Denver"], 20,
+                                  "%a %H:%M:%S")
+    assert clock.lines(_utc(2014, 6, 1, 20, 5, 7)) == [
+        "Tokyo   Mon 05:05:07",
+        "Denver  Sun 14:05:07",
+    ]
+    assert worldclock.WorldClock(["UTC"], 14, "%H:%M").lines(
+        _utc(2014, 6, 1, 20, 5),
+    ) == ["UTC      20:05"]
+
+
+def test_unknown_zone():
+    """Unknown zones are refused."""
+
+    with pytest.raises(SystemExit):
+        worldclock.ZoneClock("Not/AZone")
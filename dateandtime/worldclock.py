@@ -0,0 +1,194 @@
+"""Time lines for several IANA timezones, from a single UTC reading.
+
+Each zone's current UTC offset is kept along with the span it's valid for,
+found once by probing zoneinfo around the current time. Until the next
+transition a tick is just integer arithmetic and a table lookup; zoneinfo
+is only consulted again once a transition has passed.
+
+Requires python 3.9 or newer, for zoneinfo.
+"""
+
+
+import datetime
+
+from dateandtime import formats
+
+
+# the time of day for every minute, as print_time formats it
+TIMES_OF_DAY = formats.time_format().table()
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+# how far ahead to look for a transition before just checking again later
+HORIZON = 400 * 86400
+
+# probe step when looking for a transition, shorter than any DST period
+STEP = 7 * 86400
+
+
+def get_zone(name):
+    """Returns the tzinfo for the IANA zone name, or None for local time.
+
+    Raises:
+        SystemExit if the zone is unknown or zoneinfo is unavailable
+    """
+
+    if not name:
+        return None
+
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    except ImportError:
+        raise SystemExit("Timezones require python 3.9 or newer")
+    except (KeyError, ValueError):
+        raise SystemExit("Unknown timezone: {0}".format(name))
+
+
+class ZoneClock(object):
+    """One zone's UTC offset, cached until its next transition."""
+
+    __slots__ = ("name", "zone", "label", "offset", "valid_from",
+                 "valid_until", "refreshes")
+
+    def __init__(self, name, label=None):
+        """Zone setup.
+
+        Args:
+            name: string IANA zone name
+            label: string to show for the zone, the name's last part if None
+        """
+
+        self.name = name
+        self.zone = get_zone(name)
+        self.label = label or name.split("/")[-1].replace("_", " ")
+        self.offset = 0
+        self.valid_from = 0
+        self.valid_until = -1
+        self.refreshes = 0
+
+    def utc_offset(self, seconds):
+        """Returns zoneinfo's UTC offset in integer seconds at UTC seconds."""
+
+        moment = datetime.datetime.fromtimestamp(seconds, self.zone)
+        return int(moment.utcoffset().total_seconds())
+
+    def refresh(self, seconds):
+        """Finds the offset at UTC seconds and the span it holds for."""
+
+        self.refreshes += 1
+        self.offset = self.utc_offset(seconds)
+        self.valid_from = self._transition(seconds, -STEP)
+        self.valid_until = self._transition(seconds, STEP)
+
+    def _transition(self, seconds, step):
+        """Returns the first second of a different offset in step's way.
+
+        Looking backwards, returns the first second of the current offset.
+        """
+
+        same = seconds
+        while abs(same - seconds) < HORIZON:
+            probe = same + step
+            if self.utc_offset(probe) != self.offset:
+                break
+            same = probe
+        else:
+            return same
+
+        # bisect between same and probe, down to the second
+        low, high = sorted((same, probe))
+        while high - low > 1:
+            middle = (low + high) // 2
+            if (self.utc_offset(middle) == self.offset) == (step > 0):
+                low = middle
+            else:
+                high = middle
+        return high
+
+    def local_seconds(self, seconds):
+        """Returns the local time in our zone as seconds since the epoch.
+
+        Args:
+            seconds: integer UTC seconds since the epoch
+        """
+
+        if not self.valid_from <= seconds < self.valid_until:
+            self.refresh(seconds)
+        return seconds + self.offset
+
+    def time_of_day(self, seconds):
+        """Returns our time of day at UTC seconds, like print_time's."""
+
+        return TIMES_OF_DAY[(self.local_seconds(seconds) // 60) % 1440]
+
+
+class WorldClock(object):
+    """Formats one time line per zone, all from the same UTC time."""
+
+    def __init__(self, zones, width=20, time_format=None):
+        """World clock setup.
+
+        Args:
+            zones: list of IANA zone names
+            width: integer width of each line
+            time_format: string format of the times, see formats
+        """
+
+        self.zones = [ZoneClock(name) for name in zones]
+        compiled = formats.time_format(time_format)
+        self.time_width = compiled.longest()
+        # a single table of times of day, unless they need a date or second
+        self.table = None
+        if not (compiled.dated or compiled.seconds):
+            self.table = compiled.table()
+        # each zone keeps its own day's table, zones can be on different days
+        self.time_formats = [
+            formats.TimeFormat(compiled.format) if compiled.dated else compiled
+            for _ in self.zones
+        ]
+        self.resize(width)
+
+    def resize(self, width):
+        """Fits the zone lines to width, the width of the calendar above.
+
+        Args:
+            width: integer width of each line
+        """
+
+        self.width = width
+        # labels truncated and padded ahead of time, leaving room for times
+        self.labels = [
+            zone.label[:width - self.time_width - 1].ljust(
+                width - self.time_width,
+            )
+            for zone in self.zones
+        ]
+
+    def lines(self, seconds):
+        """Returns a time line for each zone.
+
+        Args:
+            seconds: integer UTC seconds since the epoch
+
+        Returns:
+            list of strings, the zone's label and its time of day
+        """
+
+        if self.table is not None:
+            return [
+                label + self.table[
+                    (zone.local_seconds(seconds) // 60) % 1440
+                ].rjust(self.time_width)
+                for label, zone in zip(self.labels, self.zones)
+            ]
+        return [
+            label + time_line.line(EPOCH + datetime.timedelta(
+                seconds=zone.local_seconds(seconds),
+            )).rjust(self.time_width)
+            for label, zone, time_line in zip(
+                self.labels,
+                self.zones,
+                self.time_formats,
+            )
+        ]
@@ -42,7 +42,9 @@ setup(
         "please open a GitHub issue."
     ),
     download_url="https://github.com/a-tal/dateandtime",
+    python_requires=">=3.9",
     install_requires=["ddate>=0.0.4"],
+    extras_require={"bulk": ["numpy"]},
     tests_require=["pytest", "pytest-cov", "mock"],
     cmdclass={"test": PyTest},
     license="BSD",
@@ -53,5 +55,7 @@ setup(
         "License :: OSI Approved :: BSD License",
         "Operating System :: POSIX :: Linux",
         "Programming Language :: Python",
+        "Programming Language :: Python :: 3",
+        "Programming Language :: Python :: 3 :: Only",
     ],
 )